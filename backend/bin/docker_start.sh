@@ -13,6 +13,12 @@ uwsgi_port=${UWSGI_PORT:-8000}
 uwsgi_processes=${UWSGI_PROCESSES:-4}
 uwsgi_threads=${UWSGI_THREADS:-1}
 
+# Aggregate the Prometheus metrics of all uWSGI workers, start from a clean slate
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+# the directory may be a mounted volume, so empty it rather than removing it
+find "$PROMETHEUS_MULTIPROC_DIR" -mindepth 1 -delete
+
 until pg_isready; do
   >&2 echo "Waiting for database connection..."
   sleep 1
@@ -20,9 +26,14 @@ done
 
 >&2 echo "Database is up."
 
-# Apply database migrations
+# Apply database migrations. The API-only settings leave out apps, so the migrations
+# are always applied with the full settings.
 >&2 echo "Apply database migrations"
-python src/manage.py migrate
+migrate_settings=${DJANGO_SETTINGS_MODULE:-zac_lite.conf.docker}
+if [ "$migrate_settings" = "zac_lite.conf.api" ]; then
+  migrate_settings=zac_lite.conf.docker
+fi
+python src/manage.py migrate --settings="$migrate_settings"
 
 # Start server
 >&2 echo "Starting server"
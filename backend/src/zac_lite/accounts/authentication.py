@@ -0,0 +1,62 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from zac_lite.utils.metrics import CACHE_REQUESTS
+
+CACHE_ALIAS = "default"
+
+
+def get_cache_key(key: str) -> str:
+    # the token itself is a secret, so don't use it as readable cache key
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f"accounts:token:{digest}"
+
+
+def invalidate_token(key: str) -> None:
+    caches[CACHE_ALIAS].delete(get_cache_key(key))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication caching the token and its user for a short while.
+
+    Service-to-service clients call the API with the same token over and over, so
+    the lookup is cached for ``settings.TOKEN_AUTHENTICATION_CACHE_TIMEOUT``
+    seconds. Deleting the token or saving the user invalidates the cached lookup,
+    see :mod:`zac_lite.accounts.signals`.
+    """
+
+    def authenticate_credentials(self, key):
+        cache = caches[CACHE_ALIAS]
+        cache_key = get_cache_key(key)
+
+        token = cache.get(cache_key)
+        CACHE_REQUESTS.labels(
+            cache="token", result="miss" if token is None else "hit"
+        ).inc()
+
+        if token is None:
+            model = self.get_model()
+            try:
+                # keep the password hash out of the cache
+                token = (
+                    model.objects.select_related("user")
+                    .defer("user__password")
+                    .get(key=key)
+                )
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            cache.set(
+                cache_key, token, timeout=settings.TOKEN_AUTHENTICATION_CACHE_TIMEOUT
+            )
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        return (token.user, token)
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_token
+
+
+@receiver([post_save, post_delete], sender=Token)
+def invalidate_token_cache(sender, instance: Token, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_token_cache(sender, instance, created: bool, **kwargs):
+    if created:
+        return
+    # the user may have been deactivated
+    for key in Token.objects.filter(user=instance).values_list("key", flat=True):
+        invalidate_token(key)
@@ -0,0 +1,62 @@
+from django.core.cache import caches
+from django.test import RequestFactory, TestCase
+
+from rest_framework.exceptions import AuthenticationFailed
+
+from ..authentication import CachedTokenAuthentication
+from .factories import TokenFactory
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.addCleanup(caches["default"].clear)
+        self.token = TokenFactory.create()
+        self.request = RequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Token {self.token.key}"
+        )
+
+    def test_lookup_cached(self):
+        with self.assertNumQueries(1):
+            user, token = CachedTokenAuthentication().authenticate(self.request)
+
+        with self.assertNumQueries(0):
+            cached_user, cached_token = CachedTokenAuthentication().authenticate(
+                self.request
+            )
+
+        self.assertEqual(cached_user, self.token.user)
+        self.assertEqual(cached_token, self.token)
+        self.assertEqual(cached_token.key, self.token.key)
+
+    def test_password_not_cached(self):
+        CachedTokenAuthentication().authenticate(self.request)
+
+        _, token = CachedTokenAuthentication().authenticate(self.request)
+
+        self.assertIn("password", token.user.get_deferred_fields())
+
+    def test_invalid_token(self):
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION="Token invalid")
+
+        with self.assertRaises(AuthenticationFailed):
+            CachedTokenAuthentication().authenticate(request)
+
+    def test_token_deleted(self):
+        CachedTokenAuthentication().authenticate(self.request)
+
+        self.token.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            CachedTokenAuthentication().authenticate(self.request)
+
+    def test_user_deactivated(self):
+        CachedTokenAuthentication().authenticate(self.request)
+
+        user = self.token.user
+        user.is_active = False
+        user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            CachedTokenAuthentication().authenticate(self.request)
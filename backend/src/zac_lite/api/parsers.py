@@ -0,0 +1,36 @@
+from typing import Optional
+
+from django.conf import settings
+
+from djangorestframework_camel_case.parser import (
+    CamelCaseJSONParser as _CamelCaseJSONParser,
+)
+from djangorestframework_camel_case.util import underscoreize
+from rest_framework.exceptions import ParseError
+
+from zac_lite.utils import json
+
+
+class CamelCaseJSONParser(_CamelCaseJSONParser):
+    """
+    Parse the request body with the configured JSON backend.
+    """
+
+    # name of the JSON backend, defaults to settings.JSON_BACKEND
+    backend: Optional[str] = None
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        backend = json.get_backend(self.backend)
+        if backend.name == json.Backend.name:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            data = stream.read()
+            # the backends decode UTF-8 themselves
+            if encoding.lower().replace("-", "") != "utf8":
+                data = data.decode(encoding)
+            return underscoreize(backend.loads(data), **self.json_underscoreize)
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -0,0 +1,83 @@
+"""
+Render the API responses with the configured JSON backend, see
+:mod:`zac_lite.utils.json`.
+
+The stream renderers render one event at a time. Regular (error) responses are
+rendered as a single ``error`` event.
+"""
+import abc
+from typing import Optional
+
+from djangorestframework_camel_case.render import (
+    CamelCaseJSONRenderer as _CamelCaseJSONRenderer,
+)
+from djangorestframework_camel_case.settings import api_settings
+from djangorestframework_camel_case.util import camelize
+from rest_framework.renderers import BaseRenderer
+
+from zac_lite.utils import json
+
+
+def dump(data, backend: Optional[str] = None) -> bytes:
+    return json.get_backend(backend).dumps(
+        camelize(data, **api_settings.JSON_UNDERSCOREIZE)
+    )
+
+
+class CamelCaseJSONRenderer(_CamelCaseJSONRenderer):
+    # name of the JSON backend, defaults to settings.JSON_BACKEND
+    backend: Optional[str] = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        backend = json.get_backend(self.backend)
+        if (
+            data is None
+            or backend.name == json.Backend.name
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        content = dump(data, backend.name)
+        # like DRF, escape the line separators that are invalid in JavaScript
+        if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+            content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return content
+
+
+class StreamRenderer(BaseRenderer, metaclass=abc.ABCMeta):
+    charset = "utf-8"
+
+    @abc.abstractmethod
+    def render_event(self, event: str, data) -> bytes:
+        ...
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b""
+        return self.render_event("error", data)
+
+
+class NDJSONRenderer(StreamRenderer):
+    """
+    Render newline delimited JSON, an ``{"event": ..., "data": ...}`` object per line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render_event(self, event: str, data) -> bytes:
+        return dump({"event": event, "data": data}) + b"\n"
+
+
+class EventStreamRenderer(StreamRenderer):
+    """
+    Render server-sent events.
+    """
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+
+    def render_event(self, event: str, data) -> bytes:
+        return b"event: %s\ndata: %s\n\n" % (event.encode(self.charset), dump(data))
@@ -17,6 +17,7 @@ urlpatterns = [
         include(
             [
                 path("", include("zac_lite.user_tasks.urls")),
+                path("", include("zac_lite.notifications.urls")),
             ]
         ),
     ),
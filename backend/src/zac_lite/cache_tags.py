@@ -0,0 +1,48 @@
+"""
+Tag cache entries, so they can be invalidated by tag.
+
+The tags are the URLs of the ZGW resources an entry was built from. For every tag,
+an index of the tagged entries is kept in the ``default`` cache, see
+:mod:`zac_lite.utils.cache_index`. Every entry expires from the index with the entry
+itself.
+"""
+import hashlib
+from typing import Dict, Iterable, List
+
+from django.core.cache import caches
+
+from zac_lite.utils.cache_index import get_index
+
+INDEX_CACHE_ALIAS = "default"
+
+
+def get_tag_key(tag: str) -> str:
+    digest = hashlib.sha256(tag.encode()).hexdigest()
+    return f"cache-tags:{digest}"
+
+
+def tag(alias: str, cache_key: str, tags: Iterable[str], timeout: int) -> None:
+    """
+    Add the cache entry to the index of each tag.
+    """
+    member = f"{alias} {cache_key}"
+    get_index(INDEX_CACHE_ALIAS).add(
+        [(get_tag_key(tag), member) for tag in set(tags)], timeout
+    )
+
+
+def invalidate(tags: Iterable[str]) -> int:
+    """
+    Remove the cache entries with any of the tags.
+
+    Returns the number of removed entries.
+    """
+    indexes = get_index(INDEX_CACHE_ALIAS).pop(get_tag_key(tag) for tag in set(tags))
+    entries = {member for members in indexes.values() for member in members}
+    keys_per_alias: Dict[str, List[str]] = {}
+    for entry in entries:
+        alias, cache_key = entry.split(" ", 1)
+        keys_per_alias.setdefault(alias, []).append(cache_key)
+    for alias, cache_keys in keys_per_alias.items():
+        caches[alias].delete_many(cache_keys)
+    return len(entries)
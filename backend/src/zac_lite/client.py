@@ -1,6 +1,295 @@
+import logging
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.utils.text import slugify
+
+import requests
+from django_camunda.client import Camunda
+from django_camunda.models import CamundaConfig
+from django_camunda.utils import underscoreize
+from requests.adapters import HTTPAdapter
+from zds_client.client import Object
 from zgw_consumers.client import Client
 from zgw_consumers.nlx import NLXClientMixin
 
+from zac_lite import upstream_cache
+from zac_lite.nlx import Rewriter
+from zac_lite.utils import deadline, hedging, identity_map, json
+from zac_lite.utils.tracing import Span, span
+
+logger = logging.getLogger(__name__)
+
+# (schema URL, operation ID) -> names of the documented query parameters
+_query_params_cache: Dict[Tuple[str, str], FrozenSet[str]] = {}
+
+_camunda_session: Optional[requests.Session] = None
+_camunda_session_lock = threading.Lock()
+
+
+def get_query_params(schema: dict, operation_id: str) -> FrozenSet[str]:
+    """
+    Extract the names of the query parameters of an operation from the API schema.
+    """
+
+    def _resolve(param: dict) -> dict:
+        ref = param.get("$ref")
+        if not ref or not ref.startswith("#/"):
+            return param
+        resolved = schema
+        for bit in ref[2:].split("/"):
+            resolved = resolved.get(bit, {})
+        return resolved
+
+    for methods in schema["paths"].values():
+        path_params = methods.get("parameters", [])
+        for name, method in methods.items():
+            if name == "parameters" or method.get("operationId") != operation_id:
+                continue
+
+            params = [
+                _resolve(param) for param in path_params + method.get("parameters", [])
+            ]
+            return frozenset(
+                param["name"] for param in params if param.get("in") == "query"
+            )
+
+    return frozenset()
+
 
 class NLXClient(NLXClientMixin, Client):
-    pass
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rewriter = Rewriter()
+
+    @property
+    def service_name(self) -> str:
+        """
+        Name the upstream service after the title in its API schema.
+        """
+        return slugify(self.schema.get("info", {}).get("title", "")) or self.service
+
+    def fetch_schema(self) -> None:
+        with span("oas", self.base_url):
+            super().fetch_schema()
+
+    def request(
+        self, path: str, operation: str, method="GET", expected_status=200, **kwargs
+    ) -> Union[List[Object], Object]:
+        with span(self.service_name, operation) as _span:
+
+            def record_response(response, *args, **kwargs):
+                _span.status = response.status_code
+                _span.bytes = len(response.content)
+
+            kwargs["hooks"] = {"response": [record_response, json.decode_response]}
+            kwargs.setdefault("timeout", deadline.get_timeout())
+            try:
+                return super().request(
+                    path,
+                    operation,
+                    method=method,
+                    expected_status=expected_status,
+                    **kwargs,
+                )
+            except requests.Timeout:
+                deadline.check()
+                raise
+
+    def supports_query_param(self, operation_id: str, name: str) -> bool:
+        """
+        Check if the API schema documents the query parameter for the operation.
+
+        The result is cached per schema, as the schema itself is cached too.
+        """
+        key = (self.schema_url or self.base_url, operation_id)
+        if key not in _query_params_cache:
+            _query_params_cache[key] = get_query_params(self.schema, operation_id)
+        return name in _query_params_cache[key]
+
+    def get_fields_params(self, operation_id: str, fields: Iterable[str]) -> dict:
+        """
+        Build the query parameters to limit the response to the given fields.
+
+        Older API versions don't support field projection, in which case the full
+        resource is returned.
+        """
+        if not fields or not self.supports_query_param(operation_id, "fields"):
+            return {}
+        return {"fields": ",".join(fields)}
+
+    def list(
+        self,
+        resource: str,
+        query_params=None,
+        request_kwargs: Optional[dict] = None,
+        fields: Optional[Iterable[str]] = None,
+        **path_kwargs,
+    ) -> List[Object]:
+        operation_id = f"{resource}{self.operation_suffix_mapping['list']}"
+        query_params = {
+            **(query_params or {}),
+            **self.get_fields_params(operation_id, fields),
+        }
+        return super().list(
+            resource,
+            query_params=query_params or None,
+            request_kwargs=request_kwargs,
+            **path_kwargs,
+        )
+
+    def retrieve(
+        self,
+        resource: str,
+        url=None,
+        request_kwargs: Optional[dict] = None,
+        fields: Optional[Iterable[str]] = None,
+        hedge: bool = False,
+        **path_kwargs,
+    ) -> Object:
+        """
+        Retrieve a single resource, from the upstream cache if possible.
+
+        See :mod:`zac_lite.upstream_cache` for the resources that are cached. A
+        resource is retrieved at most once per request, see
+        :mod:`zac_lite.utils.identity_map`. With ``hedge``, a slow retrieval is sent
+        again, see :mod:`zac_lite.utils.hedging`.
+        """
+        operation_id = f"{resource}{self.operation_suffix_mapping['retrieve']}"
+        params = self.get_fields_params(operation_id, fields)
+        if params:
+            request_kwargs = {
+                **(request_kwargs or {}),
+                "params": {**(request_kwargs or {}).get("params", {}), **params},
+            }
+
+        if url is None:
+            return super().retrieve(
+                resource, url=url, request_kwargs=request_kwargs, **path_kwargs
+            )
+
+        params = (request_kwargs or {}).get("params")
+
+        def _retrieve() -> Object:
+            cacheable = upstream_cache.get_timeout(resource)
+            if cacheable:
+                data = upstream_cache.get_response(url, params)
+                if data is not None:
+                    return data
+
+            def _fetch() -> Object:
+                return super(NLXClient, self).retrieve(
+                    resource, url=url, request_kwargs=request_kwargs, **path_kwargs
+                )
+
+            data = hedging.call(self.service_name, _fetch) if hedge else _fetch()
+            if cacheable:
+                upstream_cache.set_response(self.base_url, resource, url, data, params)
+            return data
+
+        return identity_map.fetch(upstream_cache.get_cache_key(url, params), _retrieve)
+
+
+def get_camunda_session() -> requests.Session:
+    """
+    Return the session shared by the Camunda clients in this process.
+
+    The connections to Camunda are kept alive and reused, up to
+    ``settings.CAMUNDA_POOL_MAXSIZE`` connections. Cookies are not stored, as the
+    session is shared by all requests.
+    """
+    global _camunda_session
+    if _camunda_session is None:
+        with _camunda_session_lock:
+            if _camunda_session is None:
+                session = requests.Session()
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                adapter = HTTPAdapter(pool_maxsize=settings.CAMUNDA_POOL_MAXSIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _camunda_session = session
+    return _camunda_session
+
+
+class CamundaClient(Camunda):
+    """
+    Camunda client using the shared session.
+    """
+
+    def __init__(self, config: Optional[CamundaConfig] = None):
+        super().__init__(config=config)
+        self.session = get_camunda_session()
+
+    def request(self, path: str, method="GET", *args, **kwargs):
+        # :meth:`Camunda.request`, with the shared session instead of a new
+        # connection for every request
+        assert not path.startswith("/"), "Provide relative API paths"
+        url = urljoin(self.root_url, path)
+
+        do_underscoreize = kwargs.pop("underscoreize", True)
+
+        headers = kwargs.pop("headers", {})
+        headers.update(self.auth)
+        headers.update(self.get_extra_headers(headers))
+        kwargs["headers"] = headers
+        kwargs.setdefault("hooks", {"response": json.decode_response})
+        kwargs.setdefault("timeout", deadline.get_timeout())
+
+        if kwargs.get("json"):
+            self.preprocess_json(kwargs["json"])
+
+        _ref = self.before_request(method, url, *args, **kwargs)
+
+        try:
+            response = self.session.request(method, url, *args, **kwargs)
+        except requests.RequestException as exc:
+            # record the failed call, there is no response for after_request
+            _ref[1].finish()
+            if isinstance(exc, requests.Timeout):
+                deadline.check()
+            raise
+        response_data = None
+
+        try:
+            response.raise_for_status()
+            if response.content:
+                # json is the default Content-Type
+                content_type = response.headers.get("Content-Type", "application/json")
+                if content_type.startswith("application/json"):
+                    response_data = response.json()
+
+                    if isinstance(response_data, (dict, list)):
+                        self.postprocess_response_data(response_data)
+
+                    if do_underscoreize:
+                        response_data = underscoreize(response_data)
+                else:
+                    # binary content
+                    response_data = response.content
+
+            return response_data
+        except Exception:
+            try:
+                # see if we can grab any extra output
+                response_data = response.json()
+            except Exception:
+                pass
+            logger.exception("Error: %r", response_data)
+            raise
+        finally:
+            self.after_request(_ref, response, response_data)
+
+    def before_request(self, method: str, url: str, *args, **kwargs) -> Any:
+        operation = f"{method} {url[len(self.root_url):]}"
+        ref = super().before_request(method, url, *args, **kwargs)
+        return (ref, Span(service="camunda", operation=operation))
+
+    def after_request(self, ref: Any, response, response_data) -> None:
+        ref, _span = ref
+        _span.status = response.status_code
+        _span.bytes = len(response.content)
+        _span.finish()
+        super().after_request(ref, response, response_data)
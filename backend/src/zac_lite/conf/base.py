@@ -3,8 +3,6 @@ import os
 # Django-hijack (and Django-hijack-admin)
 from django.urls import reverse_lazy
 
-import sentry_sdk
-
 from .utils import config, get_sentry_integrations
 
 # Build paths inside the project, so further paths can be defined relative to
@@ -23,6 +21,8 @@ BASE_DIR = os.path.abspath(
 
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = config("SECRET_KEY")
+# Previous secret keys, still accepted to verify the execute task tokens
+SECRET_KEY_FALLBACKS = config("SECRET_KEY_FALLBACKS", default="", split=True)
 
 # NEVER run with DEBUG=True in production-like environments
 DEBUG = config("DEBUG", default=False)
@@ -86,6 +86,23 @@ CACHES = {
             "IGNORE_EXCEPTIONS": True,
         },
     },
+    "upstream": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": f"redis://{config('CACHE_UPSTREAM', 'localhost:6379/1')}",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+        },
+    },
+    # the request history of the task-data throttles
+    "throttling": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": f"redis://{config('CACHE_THROTTLING', 'localhost:6379/0')}",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+        },
+    },
 }
 
 
@@ -118,11 +135,13 @@ INSTALLED_APPS = [
     "drf_spectacular",
     # Project applications.
     "zac_lite.accounts",
+    "zac_lite.notifications",
     "zac_lite.user_tasks",
     "zac_lite.utils",
 ]
 
 MIDDLEWARE = [
+    "zac_lite.utils.middleware.EndpointMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     # 'django.middleware.locale.LocaleMiddleware',
@@ -284,6 +303,11 @@ LOGGING = {
             "level": "INFO",
             "propagate": True,
         },
+        "performance": {
+            "handlers": ["performance"] if not LOG_STDOUT else ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
@@ -339,6 +363,8 @@ FIXTURE_DIRS = (os.path.join(DJANGO_PROJECT_DIR, "fixtures"),)
 # Custom settings
 #
 PROJECT_NAME = "ZAC Lite"
+# Check that all packages have an __init__.py file on start-up
+CHECK_MISSING_INIT_FILES = True
 ENVIRONMENT = config("ENVIRONMENT", "")
 SHOW_ALERT = True
 
@@ -418,18 +444,34 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.TokenAuthentication",
     ),
-    "DEFAULT_RENDERER_CLASSES": (
-        "djangorestframework_camel_case.render.CamelCaseJSONRenderer",
-    ),
-    "DEFAULT_PARSER_CLASSES": (
-        "djangorestframework_camel_case.parser.CamelCaseJSONParser",
-    ),
+    "DEFAULT_RENDERER_CLASSES": ("zac_lite.api.renderers.CamelCaseJSONRenderer",),
+    "DEFAULT_PARSER_CLASSES": ("zac_lite.api.parsers.CamelCaseJSONParser",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     # "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
     "TEST_REQUEST_DEFAULT_FORMAT": "json",
     "DEFAULT_SCHEMA_CLASS": "zac_lite.api.schema.AutoSchema",
+    "DEFAULT_THROTTLE_RATES": {
+        "task-data-client": config("THROTTLE_RATE_TASK_DATA_CLIENT", "60/min"),
+        "task-data-task": config("THROTTLE_RATE_TASK_DATA_TASK", "30/min"),
+    },
+    # number of proxies in front of the application, used to determine the client IP
+    # address for throttling
+    "NUM_PROXIES": config("NUM_PROXIES", default=1 if IS_HTTPS else 0),
 }
 
+# The library to encode and decode JSON with: json, orjson or ujson. Used for the
+# API requests and responses and the upstream responses, see zac_lite.utils.json.
+JSON_BACKEND = config("JSON_BACKEND", default="json")
+
+# Number of seconds the upstream calls of a task-data request may take in total, see
+# zac_lite.utils.deadline. Keep it below the timeout of the load balancer.
+TASK_DATA_DEADLINE = config("TASK_DATA_DEADLINE", default=9.0)
+
+# Cache the API token lookups for this many seconds
+TOKEN_AUTHENTICATION_CACHE_TIMEOUT = config(
+    "TOKEN_AUTHENTICATION_CACHE_TIMEOUT", default=60
+)
+
 #
 # DRF-SPECTACULAR
 #
@@ -465,6 +507,76 @@ ZGW_CONSUMERS_TEST_SCHEMA_DIRS = [
     os.path.join(DJANGO_PROJECT_DIR, "tests", "schemas"),
 ]
 
+# Number of seconds to cache the resources retrieved from the ZGW APIs, per
+# resource. Resources that are not listed are not cached.
+UPSTREAM_CACHE_TIMEOUTS = {
+    "zaaktype": config("UPSTREAM_CACHE_TIMEOUT_CATALOGI", default=60 * 60),
+    "informatieobjecttype": config("UPSTREAM_CACHE_TIMEOUT_CATALOGI", default=60 * 60),
+    "zaak": config("UPSTREAM_CACHE_TIMEOUT_ZAKEN", default=60),
+    "enkelvoudiginformatieobject": config(
+        "UPSTREAM_CACHE_TIMEOUT_DOCUMENTEN", default=60
+    ),
+}
+
+# Number of seconds the retrieved ZGW resources are shared between concurrent
+# requests in a process, see zac_lite.utils.identity_map.
+UPSTREAM_MEMO_TIMEOUT = config("UPSTREAM_MEMO_TIMEOUT", default=2)
+
+# Number of worker threads fetching the upstream resources of a request in parallel,
+# see zac_lite.utils.concurrent. Defaults to the ThreadPoolExecutor default.
+PARALLEL_MAX_WORKERS = config(
+    "PARALLEL_MAX_WORKERS", default=min(32, (os.cpu_count() or 1) + 4)
+)
+
+# The networks that may scrape the Prometheus metrics at /metrics, e.g. the
+# Prometheus server. The metrics are not exposed to other clients.
+METRICS_ALLOWED_NETWORKS = config(
+    "METRICS_ALLOWED_NETWORKS", default="127.0.0.1/32,::1/128", split=True
+)
+
+# Duplicate the document retrievals that are slower than the 95th percentile of
+# their service, see zac_lite.utils.hedging. HEDGE_BUDGET is the maximum fraction of
+# extra calls.
+HEDGE_REQUESTS = config("HEDGE_REQUESTS", default=False)
+HEDGE_BUDGET = config("HEDGE_BUDGET", default=0.05)
+# The primary and duplicate calls run in a thread pool of the process
+HEDGE_MAX_WORKERS = config(
+    "HEDGE_MAX_WORKERS",
+    default=2 * PARALLEL_MAX_WORKERS * config("UWSGI_THREADS", default=1),
+)
+
+# The Notificaties API channels to subscribe to, see the subscribe_notifications
+# management command.
+NOTIFICATIONS_KANALEN = config(
+    "NOTIFICATIONS_KANALEN", default="zaken,documenten,catalogi", split=True
+)
+
+#
+# DJANGO-SOLO
+#
+# The configuration singletons read once per process, see zac_lite.utils.solo.
+SOLO_LOCAL_CACHE_MODELS = [
+    "django_camunda.CamundaConfig",
+    "django_auth_adfs_db.ADFSConfig",
+    "zgw_consumers.NLXConfig",
+]
+# Number of seconds after which the processes check if a singleton was changed. Set
+# to 0 to read the singletons from the database every time.
+SOLO_LOCAL_CACHE_TIMEOUT = config("SOLO_LOCAL_CACHE_TIMEOUT", default=10)
+
+#
+# DJANGO-CAMUNDA
+#
+CAMUNDA_CLIENT_CLASS = "zac_lite.client.CamundaClient"
+
+# Number of connections to Camunda kept open per process, see
+# zac_lite.client.get_camunda_session. Defaults to the number of threads that can
+# call Camunda concurrently: the worker threads of every uWSGI thread.
+CAMUNDA_POOL_MAXSIZE = config(
+    "CAMUNDA_POOL_MAXSIZE",
+    default=PARALLEL_MAX_WORKERS * config("UWSGI_THREADS", default=1),
+)
+
 #
 # SENTRY - error monitoring
 #
@@ -472,6 +584,8 @@ SENTRY_DSN = config("SENTRY_DSN", None)
 RELEASE = config("VERSION_TAG", "VERSION_TAG not set")
 
 if SENTRY_DSN:
+    import sentry_sdk
+
     SENTRY_CONFIG = {
         "dsn": SENTRY_DSN,
         "release": RELEASE,
@@ -13,9 +13,14 @@ CACHES = {
     # https://github.com/jazzband/django-axes/blob/master/docs/configuration.rst#cache-problems
     "axes": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
     "oas": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "upstream": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "throttling": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
     "sessions": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
 }
 
+# the test database is rolled back, but the process cache is not
+SOLO_LOCAL_CACHE_TIMEOUT = 0
+
 LOGGING = None  # Quiet is nice
 logging.disable(logging.CRITICAL)
 
@@ -67,6 +67,8 @@ CACHES = {
     "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
     "axes": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
     "sessions": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "upstream": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "throttling": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
 }
 
 #
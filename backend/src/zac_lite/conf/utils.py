@@ -1,5 +1,4 @@
 from decouple import Csv, config as _config, undefined
-from sentry_sdk.integrations import DidNotEnable, django, redis
 
 
 def config(option: str, default=undefined, *args, **kwargs):
@@ -24,7 +23,11 @@ def config(option: str, default=undefined, *args, **kwargs):
 def get_sentry_integrations() -> list:
     """
     Determine which Sentry SDK integrations to enable.
+
+    The integrations are only imported if Sentry is enabled.
     """
+    from sentry_sdk.integrations import DidNotEnable, django, redis
+
     default = [
         django.DjangoIntegration(),
         redis.RedisIntegration(),
@@ -0,0 +1,103 @@
+"""
+Rewrite the URLs between their canonical and NLX outway form.
+
+A drop-in replacement of :class:`zgw_consumers.nlx.Rewriter`. The prefixes are
+compiled into a lookup table once per direction, instead of trying every service
+for every string, and the data is walked iteratively. Without NLX services, nothing
+is walked at all.
+"""
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+
+from zgw_consumers.models import Service
+
+Rewrites = Tuple[Tuple[str, str], ...]
+
+
+class Matcher:
+    """
+    Replace the longest matching prefix of a string.
+
+    The prefixes are bucketed by their first characters, so most strings are
+    rejected with a single dict lookup.
+    """
+
+    def __init__(self, rewrites: Rewrites):
+        self.length = min(len(prefix) for prefix, _ in rewrites)
+        self.buckets: Dict[str, List[Tuple[str, str]]] = {}
+        # the longest prefixes are tried first
+        for prefix, replacement in sorted(
+            rewrites, key=lambda rewrite: len(rewrite[0]), reverse=True
+        ):
+            self.buckets.setdefault(prefix[: self.length], []).append(
+                (prefix, replacement)
+            )
+
+    def __call__(self, value: str) -> Optional[str]:
+        candidates = self.buckets.get(value[: self.length])
+        if candidates is None:
+            return None
+        for prefix, replacement in candidates:
+            if value.startswith(prefix):
+                return replacement + value[len(prefix) :]
+        return None
+
+
+@lru_cache(maxsize=32)
+def get_matcher(rewrites: Rewrites) -> Optional[Matcher]:
+    return Matcher(rewrites) if rewrites else None
+
+
+def rewrite(data: Union[list, dict], matcher: Optional[Matcher]) -> None:
+    """
+    Rewrite the URLs in the (nested) lists and dicts in place.
+    """
+    if matcher is None:
+        return
+
+    # the bucket lookup is inlined, as most strings are not rewritten
+    buckets, length = matcher.buckets, matcher.length
+    stack = [data]
+    while stack:
+        container = stack.pop()
+        items = (
+            container.items() if isinstance(container, dict) else enumerate(container)
+        )
+        for key, value in items:
+            if isinstance(value, str):
+                if value[:length] in buckets:
+                    rewritten = matcher(value)
+                    if rewritten is not None:
+                        container[key] = rewritten
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+
+
+class Rewriter:
+    def __init__(self, rewrites: Optional[Rewrites] = None):
+        self._rewrites = tuple(rewrites) if rewrites is not None else None
+
+    @property
+    def rewrites(self) -> Rewrites:
+        # looked up on first use, like the lazy queryset of zgw-consumers
+        if self._rewrites is None:
+            self._rewrites = tuple(
+                Service.objects.exclude(nlx="").values_list("api_root", "nlx")
+            )
+        return self._rewrites
+
+    @property
+    def reverse_rewrites(self) -> Rewrites:
+        return tuple((to_value, from_value) for from_value, to_value in self.rewrites)
+
+    def forwards(self, data: Union[list, dict]) -> None:
+        """
+        Rewrite URLs from from_value to to_value.
+        """
+        rewrite(data, get_matcher(self.rewrites))
+
+    def backwards(self, data: Union[list, dict]) -> None:
+        """
+        Rewrite URLs from to_value to from_value.
+        """
+        rewrite(data, get_matcher(self.reverse_rewrites))
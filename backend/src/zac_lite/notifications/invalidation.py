@@ -0,0 +1,40 @@
+"""
+Invalidate the cached data of the resources a notification is about.
+"""
+import logging
+from typing import Any, Dict, List
+
+from zac_lite import cache_tags, upstream_cache
+from zac_lite.utils.metrics import NOTIFICATIONS_RECEIVED
+
+logger = logging.getLogger(__name__)
+
+
+def get_tags(notification: Dict[str, Any]) -> List[str]:
+    """
+    Map the notification to the tags of the affected cache entries.
+
+    Changes to related resources are notified with the resource they belong to as
+    main object - e.g. a new zaakinformatieobject with its zaak - so both the main
+    object and the resource itself are affected.
+    """
+    tags = [notification["hoofd_object"]]
+    if notification["resource_url"] != notification["hoofd_object"]:
+        tags.append(notification["resource_url"])
+    return tags
+
+
+def invalidate(notification: Dict[str, Any]) -> None:
+    NOTIFICATIONS_RECEIVED.labels(kanaal=notification["kanaal"]).inc()
+
+    tags = get_tags(notification)
+    removed_contexts = cache_tags.invalidate(tags)
+    removed_responses = upstream_cache.invalidate_urls(tags)
+    logger.debug(
+        "Notification %s %s %s: removed %d context(s) and %d response(s)",
+        notification["kanaal"],
+        notification["actie"],
+        notification["resource_url"],
+        removed_contexts,
+        removed_responses,
+    )
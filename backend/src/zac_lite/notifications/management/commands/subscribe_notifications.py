@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from rest_framework.authtoken.models import Token
+from zgw_consumers.constants import APITypes
+from zgw_consumers.models import Service
+
+
+class Command(BaseCommand):
+    help = (
+        "Subscribe to the configured channels of the Notificaties API, to invalidate "
+        "the cached data on changes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "callback_url",
+            help="The public URL of the notifications callback endpoint.",
+        )
+        parser.add_argument(
+            "username",
+            help="The user whose API token the Notificaties API authenticates with.",
+        )
+
+    def handle(self, *args, **options):
+        service = Service.objects.filter(api_type=APITypes.nrc).first()
+        if service is None:
+            raise CommandError("No Notificaties API service is configured.")
+
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['username']} does not exist.")
+        token, _ = Token.objects.get_or_create(user=user)
+
+        client = service.build_client()
+        subscription = client.create(
+            "abonnement",
+            {
+                "callbackUrl": options["callback_url"],
+                "auth": f"Token {token.key}",
+                "kanalen": [
+                    {"naam": kanaal, "filters": {}}
+                    for kanaal in settings.NOTIFICATIONS_KANALEN
+                ],
+            },
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Subscription created: {subscription['url']}")
+        )
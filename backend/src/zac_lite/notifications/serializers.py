@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import serializers
+
+
+class NotificationSerializer(serializers.Serializer):
+    """
+    A notification as sent by the Notificaties API to the subscribers.
+    """
+
+    kanaal = serializers.ChoiceField(
+        label=_("channel"),
+        choices=(),
+        help_text=_("The channel the notification was published on."),
+    )
+    hoofd_object = serializers.URLField(
+        label=_("main object"),
+        help_text=_("URL of the main resource, e.g. the zaak of a status."),
+    )
+    resource = serializers.CharField(
+        label=_("resource"),
+        help_text=_("The type of resource that changed, e.g. 'status'."),
+    )
+    resource_url = serializers.URLField(
+        label=_("resource URL"),
+        help_text=_("URL of the resource that changed."),
+    )
+    actie = serializers.CharField(
+        label=_("action"),
+        help_text=_("The action on the resource, e.g. 'create' or 'destroy'."),
+    )
+    aanmaakdatum = serializers.DateTimeField(
+        label=_("created"),
+        help_text=_("The moment the notification was created."),
+    )
+    kenmerken = serializers.DictField(
+        label=_("attributes"),
+        child=serializers.CharField(allow_blank=True),
+        required=False,
+        help_text=_("Attributes of the main object the subscriptions filter on."),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["kanaal"].choices = settings.NOTIFICATIONS_KANALEN
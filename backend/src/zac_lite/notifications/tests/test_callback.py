@@ -0,0 +1,212 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+import requests_mock
+from rest_framework import status
+from rest_framework.test import APITestCase
+from zds_client.oas import schema_fetcher
+from zgw_consumers.constants import APITypes
+from zgw_consumers.models import Service
+from zgw_consumers.test import generate_oas_component, mock_service_oas_get
+
+from zac_lite import cache_tags, upstream_cache
+from zac_lite.accounts.tests.factories import UserFactory
+from zac_lite.client import NLXClient
+from zac_lite.user_tasks.tests.test_task_data_endpoint import (
+    DRC_BASE,
+    IOT_1,
+    IOT_2,
+    OPENZAAK_BASE,
+    ZAAK as ZAAK_DATA,
+    ZAAKTYPE as ZAAKTYPE_DATA,
+    get_zio,
+)
+from zac_lite.user_tasks.zaak_documents import get_zaak_documents_context
+from zac_lite.utils import identity_map
+
+from ..invalidation import get_tags
+from .utils import StandInNotificaties
+
+ZAKEN_ROOT = "https://openzaak.example.com/zaken/api/v1/"
+ZAAK = f"{ZAKEN_ROOT}zaken/a6a8c4fd"
+OTHER_ZAAK = f"{ZAKEN_ROOT}zaken/7d4ae8a0"
+ZIO = f"{ZAKEN_ROOT}zaakinformatieobjecten/e1d2"
+ZAAKTYPE = "https://openzaak.example.com/catalogi/api/v1/zaaktypen/3c4e"
+CATALOGUS = "https://openzaak.example.com/catalogi/api/v1/catalogussen/1b6f"
+
+
+@override_settings(UPSTREAM_CACHE_TIMEOUTS={"zaak": 60, "zaaktype": 3600})
+class NotificationCallbackTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.addCleanup(caches["default"].clear)
+        self.addCleanup(caches["upstream"].clear)
+        user = UserFactory.create(with_token=True)
+        self.notificaties = StandInNotificaties(user.auth_token.key, self.client)
+
+        self.cache = caches["default"]
+        self.cache.set("context:1", "zaak", 60)
+        cache_tags.tag("default", "context:1", [ZAAK, ZAAKTYPE], 60)
+        self.cache.set("context:2", "other zaak", 60)
+        cache_tags.tag("default", "context:2", [OTHER_ZAAK, ZAAKTYPE], 60)
+
+    def test_authentication_required(self):
+        response = self.client.post(reverse("notifications-callback"), {})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unknown_kanaal(self):
+        response = self.notificaties.notify("besluiten", ZAAK, "besluit")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.cache.get("context:1"), "zaak")
+
+    def test_zaak_notification(self):
+        upstream_cache.set_response(ZAKEN_ROOT, "zaak", ZAAK, {})
+        upstream_cache.set_response(ZAKEN_ROOT, "zaak", OTHER_ZAAK, {})
+
+        response = self.notificaties.notify(
+            "zaken", ZAAK, "zaakinformatieobject", ZIO, actie="create"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertIsNone(self.cache.get("context:1"))
+        self.assertEqual(self.cache.get("context:2"), "other zaak")
+        self.assertIsNone(upstream_cache.get_response(ZAAK))
+        self.assertEqual(upstream_cache.get_response(OTHER_ZAAK), {})
+
+    def test_exact_urls_invalidated(self):
+        # same prefix, other zaak
+        similar_zaak = f"{ZAAK}0"
+        upstream_cache.set_response(ZAKEN_ROOT, "zaak", ZAAK, {})
+        upstream_cache.set_response(ZAKEN_ROOT, "zaak", ZAAK, {}, {"fields": "url"})
+        upstream_cache.set_response(ZAKEN_ROOT, "zaak", similar_zaak, {})
+
+        response = self.notificaties.notify("zaken", ZAAK, "zaak", actie="update")
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertIsNone(upstream_cache.get_response(ZAAK))
+        self.assertIsNone(upstream_cache.get_response(ZAAK, {"fields": "url"}))
+        self.assertEqual(upstream_cache.get_response(similar_zaak), {})
+        self.assertEqual(
+            upstream_cache.get_usage(),
+            [upstream_cache.Usage(api_root=ZAKEN_ROOT, resource="zaak", entries=1)],
+        )
+
+    def test_catalogi_notification(self):
+        response = self.notificaties.notify("catalogi", CATALOGUS, "zaaktype", ZAAKTYPE)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertIsNone(self.cache.get("context:1"))
+        self.assertIsNone(self.cache.get("context:2"))
+
+    def test_get_tags(self):
+        self.assertEqual(
+            get_tags({"hoofd_object": ZAAK, "resource_url": ZIO}), [ZAAK, ZIO]
+        )
+        self.assertEqual(get_tags({"hoofd_object": ZAAK, "resource_url": ZAAK}), [ZAAK])
+
+
+class SubscribeNotificationsTests(APITestCase):
+    def test_subscribe(self):
+        Service.objects.create(
+            label="Notificaties API",
+            api_root="https://notificaties.example.com/api/v1/",
+            api_type=APITypes.nrc,
+        )
+        user = UserFactory.create(username="notificaties")
+
+        with patch.object(Service, "build_client") as m_build_client:
+            m_client = m_build_client.return_value
+            m_client.create.return_value = {
+                "url": "https://notificaties.example.com/api/v1/abonnement/1"
+            }
+            call_command(
+                "subscribe_notifications",
+                "https://zac-lite.example.com/api/v1/notifications/callback",
+                "notificaties",
+                stdout=StringIO(),
+            )
+
+        m_client.create.assert_called_once_with(
+            "abonnement",
+            {
+                "callbackUrl": "https://zac-lite.example.com/api/v1/notifications/callback",
+                "auth": f"Token {user.auth_token.key}",
+                "kanalen": [
+                    {"naam": "zaken", "filters": {}},
+                    {"naam": "documenten", "filters": {}},
+                    {"naam": "catalogi", "filters": {}},
+                ],
+            },
+        )
+
+
+@override_settings(UPSTREAM_CACHE_TIMEOUTS={"zaak": 60})
+@patch.object(
+    NLXClient,
+    "supports_query_param",
+    side_effect=lambda operation_id, name: name == "expand",
+)
+class ExpandedZaakInvalidationTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        Service.objects.create(
+            label="Zaken API",
+            api_root=f"{OPENZAAK_BASE}/zaken/api/v1/",
+            api_type=APITypes.zrc,
+        )
+        self.addCleanup(schema_fetcher.cache.clear)
+        self.addCleanup(caches["default"].clear)
+        self.addCleanup(caches["upstream"].clear)
+        self.addCleanup(identity_map.clear)
+        user = UserFactory.create(with_token=True)
+        self.notificaties = StandInNotificaties(user.auth_token.key, self.client)
+
+    def get_expanded_zaak(self, document: dict) -> dict:
+        zio = get_zio(ZAAK_DATA["url"], document["url"])
+        return {
+            **ZAAK_DATA,
+            "_expand": {
+                "zaaktype": {
+                    **ZAAKTYPE_DATA,
+                    "_expand": {"informatieobjecttypen": [IOT_1, IOT_2]},
+                },
+                "zaakinformatieobjecten": [
+                    {**zio, "_expand": {"informatieobject": document}}
+                ],
+            },
+        }
+
+    def test_document_notification(self, m_supports):
+        document = generate_oas_component(
+            "drc",
+            "schemas/EnkelvoudigInformatieObject",
+            url=f"{DRC_BASE}/enkelvoudiginformatieobjecten/79dc383d",
+            titel="Concept",
+            informatieobjecttype=IOT_1["url"],
+        )
+        variables = {"zaakUrl": ZAAK_DATA["url"], "toelichtingen": ""}
+
+        with requests_mock.Mocker() as m:
+            mock_service_oas_get(m, f"{OPENZAAK_BASE}/zaken/api/v1/", "zrc")
+            m.get(ZAAK_DATA["url"], json=self.get_expanded_zaak(document))
+            first = get_zaak_documents_context(None, variables)
+
+            updated = {**document, "titel": "Definitief"}
+            m.get(ZAAK_DATA["url"], json=self.get_expanded_zaak(updated))
+            response = self.notificaties.notify(
+                "documenten", document["url"], "enkelvoudiginformatieobject"
+            )
+            second = get_zaak_documents_context(None, variables)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(first.documents[0].titel, "Concept")
+        self.assertEqual(second.documents[0].titel, "Definitief")
@@ -0,0 +1,39 @@
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+
+
+class StandInNotificaties:
+    """
+    Post notifications to the callback endpoint like the Notificaties API does.
+    """
+
+    def __init__(self, token: str, client: APIClient = None):
+        self.token = token
+        self.client = client or APIClient()
+
+    def notify(
+        self,
+        kanaal: str,
+        hoofd_object: str,
+        resource: str,
+        resource_url: str = "",
+        actie: str = "update",
+        **kenmerken,
+    ):
+        data = {
+            "kanaal": kanaal,
+            "hoofdObject": hoofd_object,
+            "resource": resource,
+            "resourceUrl": resource_url or hoofd_object,
+            "actie": actie,
+            "aanmaakdatum": timezone.now().isoformat(),
+            "kenmerken": kenmerken,
+        }
+        return self.client.post(
+            reverse("notifications-callback"),
+            data,
+            format="json",
+            HTTP_AUTHORIZATION=f"Token {self.token}",
+        )
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from .views import NotificationCallbackView
+
+urlpatterns = [
+    path(
+        "notifications/callback",
+        NotificationCallbackView.as_view(),
+        name="notifications-callback",
+    ),
+]
@@ -0,0 +1,38 @@
+from django.utils.translation import gettext_lazy as _
+
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from zac_lite.accounts.authentication import CachedTokenAuthentication
+from zac_lite.api.serializers import ErrorSerializer
+
+from .invalidation import invalidate
+from .serializers import NotificationSerializer
+
+
+class NotificationCallbackView(APIView):
+    """
+    Receive the notifications of the Notificaties API.
+
+    The cached data of the notified resources - the task contexts and the upstream
+    API responses - is removed, so changes are visible immediately. Subscribe to the
+    `zaken`, `documenten` and `catalogi` channels with the API token of a user as
+    authorization header.
+    """
+
+    schema_summary = _("Receive notification")
+    authentication_classes = (CachedTokenAuthentication,)
+    serializer_class = NotificationSerializer
+
+    @extend_schema(
+        request=NotificationSerializer,
+        responses={204: None, 400: None, 401: ErrorSerializer, 403: ErrorSerializer},
+    )
+    def post(self, request: Request) -> Response:
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        invalidate(serializer.validated_data)
+        return Response(status=status.HTTP_204_NO_CONTENT)
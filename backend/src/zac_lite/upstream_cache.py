@@ -0,0 +1,201 @@
+"""
+Cache the resources retrieved from the ZGW APIs.
+
+The responses are cached per URL and query parameters in the ``upstream`` cache, for
+the number of seconds configured per resource in
+``settings.UPSTREAM_CACHE_TIMEOUTS``. Resources without timeout are not cached.
+
+Next to the entries, the cached URLs are indexed per API root and resource, and the
+cache keys per URL, see :mod:`zac_lite.utils.cache_index`. The indexes make it
+possible to report the cache usage and to invalidate entries selectively, instead of
+clearing the whole cache and sending every request to the upstream APIs at once.
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from zac_lite.utils import identity_map
+from zac_lite.utils.cache_index import get_index
+from zac_lite.utils.metrics import CACHE_REQUESTS
+
+CACHE_ALIAS = "upstream"
+
+# the indexes, members "<resource> <API root>"
+INDEXES_KEY = "upstream:indexes"
+
+
+@dataclass
+class Usage:
+    api_root: str
+    resource: str
+    entries: int
+
+
+def get_timeout(resource: str) -> int:
+    return settings.UPSTREAM_CACHE_TIMEOUTS.get(resource, 0)
+
+
+def get_cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    query = "&".join(f"{key}={value}" for key, value in sorted((params or {}).items()))
+    digest = hashlib.sha256(f"{url}?{query}".encode()).hexdigest()
+    return f"upstream:response:{digest}"
+
+
+def get_index_key(resource: str, api_root: str) -> str:
+    """
+    Return the key of the index of the URLs of a resource, members
+    ``"<cache key> <URL>"``.
+    """
+    return f"upstream:index:{resource}:{api_root}"
+
+
+def get_url_index_key(url: str) -> str:
+    """
+    Return the key of the index of the entries of or including a URL, members
+    ``"<cache key> <resource> <API root> <URL of the entry>"``.
+    """
+    digest = hashlib.sha256(url.encode()).hexdigest()
+    return f"upstream:url:{digest}"
+
+
+def get_response(url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+    data = caches[CACHE_ALIAS].get(get_cache_key(url, params))
+    CACHE_REQUESTS.labels(
+        cache="upstream", result="miss" if data is None else "hit"
+    ).inc()
+    return data
+
+
+def get_embedded_urls(data: Any) -> Set[str]:
+    """
+    Return the URLs of the resources included in an ``expand`` response.
+    """
+    urls = set()
+    if isinstance(data, list):
+        for item in data:
+            urls |= get_embedded_urls(item)
+    elif isinstance(data, dict):
+        for included in (data.get("_expand") or {}).values():
+            for item in included if isinstance(included, list) else [included]:
+                if isinstance(item, dict) and item.get("url"):
+                    urls.add(item["url"])
+                urls |= get_embedded_urls(item)
+    return urls
+
+
+def set_response(
+    api_root: str,
+    resource: str,
+    url: str,
+    data: Any,
+    params: Optional[Dict[str, Any]] = None,
+) -> None:
+    timeout = get_timeout(resource)
+    if not timeout:
+        return
+
+    cache_key = get_cache_key(url, params)
+    caches[CACHE_ALIAS].set(cache_key, data, timeout=timeout)
+    get_index(CACHE_ALIAS).add(
+        [
+            (INDEXES_KEY, f"{resource} {api_root}"),
+            (get_index_key(resource, api_root), f"{cache_key} {url}"),
+            # the entry is invalidated with the resources it includes
+            *[
+                (
+                    get_url_index_key(entry_url),
+                    f"{cache_key} {resource} {api_root} {url}",
+                )
+                for entry_url in {url, *get_embedded_urls(data)}
+            ],
+        ],
+        timeout,
+    )
+
+
+def _get_indexes() -> List[Tuple[str, str]]:
+    """
+    Return the ``(resource, API root)`` of the indexes.
+    """
+    members = get_index(CACHE_ALIAS).members(INDEXES_KEY)
+    return sorted(tuple(member.split(" ", 1)) for member in members)
+
+
+def _get_entries(resource: str, api_root: str) -> List[Tuple[str, str]]:
+    """
+    Return the ``(cache key, URL)`` of the indexed entries.
+    """
+    members = get_index(CACHE_ALIAS).members(get_index_key(resource, api_root))
+    return [tuple(member.split(" ", 1)) for member in members]
+
+
+def get_usage() -> List[Usage]:
+    """
+    Count the cached entries per API root and resource.
+    """
+    cache = caches[CACHE_ALIAS]
+    usage = []
+    for resource, api_root in _get_indexes():
+        # leave out the entries that were evicted
+        entries = len(
+            cache.get_many([key for key, _ in _get_entries(resource, api_root)])
+        )
+        if entries:
+            usage.append(Usage(api_root=api_root, resource=resource, entries=entries))
+    return sorted(usage, key=lambda usage: (usage.api_root, usage.resource))
+
+
+def invalidate(prefix: str = "", resources: Optional[Iterable[str]] = None) -> int:
+    """
+    Remove the cached entries with a URL starting with the prefix and/or of the
+    given resources.
+
+    Without prefix and resources, all entries are removed. Returns the number of
+    removed entries.
+    """
+    resources = set(resources) if resources else None
+    cache = caches[CACHE_ALIAS]
+    index = get_index(CACHE_ALIAS)
+    removed = 0
+    for resource, api_root in _get_indexes():
+        if resources is not None and resource not in resources:
+            continue
+        if prefix and not (api_root.startswith(prefix) or prefix.startswith(api_root)):
+            continue
+
+        matches = [
+            (key, url)
+            for key, url in _get_entries(resource, api_root)
+            if url.startswith(prefix)
+        ]
+        keys = [key for key, _ in matches]
+        cache.delete_many(keys)
+        identity_map.forget(keys)
+        index.remove(
+            get_index_key(resource, api_root), [f"{key} {url}" for key, url in matches]
+        )
+        removed += len(matches)
+    return removed
+
+
+def invalidate_urls(urls: Iterable[str]) -> int:
+    """
+    Remove the cached entries of the URLs, with any query parameters, and the
+    entries including the URLs through ``expand``.
+
+    Returns the number of removed entries.
+    """
+    index = get_index(CACHE_ALIAS)
+    keys = set()
+    for members in index.pop(get_url_index_key(url) for url in urls).values():
+        for member in members:
+            key, resource, api_root, url = member.split(" ", 3)
+            keys.add(key)
+            index.remove(get_index_key(resource, api_root), [f"{key} {url}"])
+    keys = list(keys)
+    caches[CACHE_ALIAS].delete_many(keys)
+    identity_map.forget(keys)
+    return len(keys)
@@ -7,6 +7,8 @@ from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import include, path
 from django.views.generic.base import TemplateView
 
+from zac_lite.utils.views import metrics
+
 handler500 = "zac_lite.utils.views.server_error"
 admin.site.site_header = "zac_lite admin"
 admin.site.site_title = "zac_lite admin"
@@ -37,6 +39,7 @@ urlpatterns = [
     ),
     path("adfs/", include("django_auth_adfs.urls")),
     path("api/", include("zac_lite.api.urls")),
+    path("metrics", metrics, name="metrics"),
     # Simply show the master template.
     path("", TemplateView.as_view(template_name="master.html")),
 ]
@@ -0,0 +1,13 @@
+"""
+URLs of the API-only settings, see :mod:`zac_lite.conf.api`.
+"""
+from django.urls import include, path
+
+from zac_lite.utils.views import metrics
+
+handler500 = "zac_lite.utils.views.server_error"
+
+urlpatterns = [
+    path("api/", include("zac_lite.api.urls")),
+    path("metrics", metrics, name="metrics"),
+]
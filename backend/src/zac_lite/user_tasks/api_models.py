@@ -0,0 +1,50 @@
+"""
+Datamodels for the subset of ZGW resources used in the task contexts.
+
+These mirror :mod:`zgw_consumers.api_models` but only declare the attributes that are
+actually rendered. The declared attributes double as the field projection requested
+from the upstream API, see :func:`get_fields`.
+"""
+from dataclasses import dataclass, fields
+from typing import Tuple
+
+from djangorestframework_camel_case.util import camelize_re, underscore_to_camel
+from zgw_consumers.api_models.base import ZGWModel
+
+
+def get_fields(model: type) -> Tuple[str, ...]:
+    """
+    Return the (camelCased) upstream API field names of the model.
+    """
+    return tuple(
+        camelize_re.sub(underscore_to_camel, field.name) for field in fields(model)
+    )
+
+
+@dataclass
+class ZaakType(ZGWModel):
+    url: str
+    catalogus: str
+    omschrijving: str
+    informatieobjecttypen: list
+
+
+@dataclass
+class Zaak(ZGWModel):
+    url: str
+    identificatie: str
+    zaaktype: str
+
+
+@dataclass
+class Document(ZGWModel):
+    url: str
+    titel: str
+    bestandsomvang: int
+    informatieobjecttype: str
+
+
+@dataclass
+class InformatieObjectType(ZGWModel):
+    url: str
+    omschrijving: str
@@ -0,0 +1,224 @@
+"""
+Micro-benchmarks of the code running for every user-link and task-data request.
+
+The benchmarks do not make any network calls. Every benchmark is a callable without
+arguments, timed with :mod:`timeit`. The payload benchmarks process a realistic
+response and take much longer per call, so they are called less often.
+"""
+import json as stdlib_json
+import random
+import timeit
+import uuid
+from datetime import date
+from typing import Callable, Dict, List, Tuple
+
+from django.test import RequestFactory, override_settings
+from django.utils.crypto import salted_hmac
+from django.utils.encoding import force_bytes, force_str
+from django.utils.http import (
+    int_to_base36,
+    urlsafe_base64_decode,
+    urlsafe_base64_encode,
+)
+
+from django_camunda.camunda_models import Task, factory
+from django_camunda.utils import underscoreize
+from zgw_consumers.api_models.base import factory as zgw_factory
+from zgw_consumers.nlx import Rewriter as ReferenceRewriter
+from zgw_consumers.test import generate_oas_component
+
+from zac_lite.api.renderers import CamelCaseJSONRenderer
+from zac_lite.nlx import Rewriter
+from zac_lite.utils import json
+
+from ..api_models import Document, InformatieObjectType, Zaak, ZaakType, get_fields
+from ..data import UserTaskData, UserTaskLink
+from ..serializers import UserTaskConfigurationSerializer
+from ..tokens import token_generator
+from ..zaak_documents import ZaakDocumentsContext
+from .upstreams import StandInUpstreams
+
+
+def make_reference_token(task: Task, timestamp: int) -> str:
+    """
+    Generate the token with :func:`django.utils.crypto.salted_hmac`, the original
+    implementation of the token generator.
+    """
+    hash_string = salted_hmac(
+        token_generator.key_salt,
+        token_generator._make_hash_value(task, timestamp),
+        secret=token_generator.secret,
+    ).hexdigest()[::2]
+    return "%s-%s" % (int_to_base36(timestamp), hash_string)
+
+
+# payload benchmarks are called this many times less often
+PAYLOAD_DIVISOR = 100
+
+NLX_REWRITES = tuple(
+    (f"https://{host}.example.com/{api}/api/v1/", f"http://outway:8080/{host}-{api}/")
+    for host in ("openzaak", "gemeente")
+    for api in ("zaken", "catalogi", "documenten", "besluiten", "notificaties")
+)
+
+
+def get_zaakinformatieobjecten(count: int = 1000) -> list:
+    """
+    Return a list of zaakinformatieobjecten, with the URLs in NLX outway form.
+    """
+    zaak = "http://outway:8080/openzaak-zaken/zaken/1"
+    return [
+        {
+            "url": f"http://outway:8080/openzaak-zaken/zaakinformatieobjecten/{i}",
+            "uuid": str(uuid.UUID(int=i)),
+            "informatieobject": (
+                f"http://outway:8080/openzaak-documenten/enkelvoudiginformatieobjecten/{i}"
+            ),
+            "zaak": zaak,
+            "aardRelatieWeergave": "Hoort bij, omgekeerd: kent",
+            "titel": f"Document {i}",
+            "beschrijving": "",
+            "registratiedatum": "2021-01-01T12:00:00Z",
+        }
+        for i in range(count)
+    ]
+
+
+def get_task_data_payload(documents: int = 300) -> Tuple[List[bytes], dict]:
+    """
+    Return the upstream responses of the documents and the task-data response data.
+    """
+
+    # generating a component is slow, so every model is generated once
+    def generate(api_type: str, component: str, model: type, **kwargs) -> dict:
+        data = generate_oas_component(api_type, f"schemas/{component}", **kwargs)
+        # the fields requested from the upstream API
+        return {field: data[field] for field in get_fields(model)}
+
+    document_type = generate("ztc", "InformatieObjectType", InformatieObjectType)
+    document_types = [
+        {**document_type, "url": f"https://ztc.example.com/informatieobjecttypen/{i}"}
+        for i in range(20)
+    ]
+    zaaktype = generate(
+        "ztc",
+        "ZaakType",
+        ZaakType,
+        informatieobjecttypen=[iot["url"] for iot in document_types],
+    )
+    zaak = zgw_factory(Zaak, generate("zrc", "Zaak", Zaak, zaaktype=zaaktype["url"]))
+    zaak.zaaktype = zgw_factory(ZaakType, zaaktype)
+    document = generate("drc", "EnkelvoudigInformatieObject", Document)
+    document_data = [
+        {
+            **document,
+            "url": f"https://drc.example.com/enkelvoudiginformatieobjecten/{i}",
+            "titel": f"Bijlage {i} - {document['titel']}",
+            "bestandsomvang": random.randint(1, 10_000_000),
+            "informatieobjecttype": random.choice(document_types)["url"],
+        }
+        for i in range(documents)
+    ]
+
+    context = ZaakDocumentsContext(
+        zaak=zaak,
+        documents=zgw_factory(Document, document_data),
+        document_types=zgw_factory(InformatieObjectType, document_types),
+        toelichtingen="Benchmark",
+    )
+    task = factory(
+        Task, underscoreize(StandInUpstreams().get_task_data(str(uuid.uuid4())))
+    )
+    data = UserTaskConfigurationSerializer(UserTaskData(task=task, context=context))
+    responses = [
+        stdlib_json.dumps(document).encode("utf-8") for document in document_data
+    ]
+    return responses, data.data
+
+
+def get_payload_benchmarks() -> Dict[str, Callable[[], object]]:
+    reference_rewriter = ReferenceRewriter.__new__(ReferenceRewriter)
+    reference_rewriter.rewrites = list(NLX_REWRITES)
+    rewriter = Rewriter(NLX_REWRITES)
+    data = get_zaakinformatieobjecten()
+
+    # rewrite back and forth, so every call gets the data in the same form
+    def round_trip(rewriter) -> Callable[[], None]:
+        def benchmark():
+            rewriter.backwards(data)
+            rewriter.forwards(data)
+
+        return benchmark
+
+    responses, task_data = get_task_data_payload()
+
+    # decode the upstream responses and render the response, per JSON backend
+    def task_data_request(backend: json.Backend) -> Callable[[], bytes]:
+        renderer = CamelCaseJSONRenderer()
+        renderer.backend = backend.name
+
+        def benchmark():
+            for response in responses:
+                backend.loads(response)
+            return renderer.render(task_data)
+
+        return benchmark
+
+    return {
+        "nlx rewrite (zgw-consumers)": round_trip(reference_rewriter),
+        "nlx rewrite (compiled)": round_trip(rewriter),
+        **{
+            f"task-data JSON, 300 documents ({backend.name})": task_data_request(
+                backend
+            )
+            for backend in json.get_available_backends()
+        },
+    }
+
+
+def get_benchmarks() -> Dict[str, Callable[[], object]]:
+    task_id = str(uuid.uuid4())
+    task = factory(Task, underscoreize(StandInUpstreams().get_task_data(task_id)))
+    token = token_generator.make_token(task)
+    timestamp = token_generator._num_days(date.today())
+    legacy_token = make_reference_token(task, timestamp)
+    tidb64 = urlsafe_base64_encode(force_bytes(task_id))
+    link = UserTaskLink(request=RequestFactory().post("/api/v1/user-link"), task=task)
+
+    return {
+        "make_token": lambda: token_generator.make_token(task),
+        "make_token (hmac)": lambda: token_generator._make_token_with_timestamp(
+            task, timestamp
+        ),
+        "make_token (salted_hmac)": lambda: make_reference_token(task, timestamp),
+        "check_token": lambda: token_generator.check_token(task, token),
+        "check_token (no key ID)": lambda: token_generator.check_token(
+            task, legacy_token
+        ),
+        "decode tidb64": lambda: force_str(urlsafe_base64_decode(tidb64)),
+        "UserTaskLink.url": lambda: link.url,
+    }
+
+
+def time(benchmark: Callable[[], object], number: int, repeat: int) -> float:
+    return min(timeit.repeat(benchmark, number=number, repeat=repeat)) / number * 1e6
+
+
+def run(number: int = 10000, repeat: int = 5) -> Dict[str, float]:
+    """
+    Return the best duration per call of every benchmark, in microseconds.
+    """
+    # the request factory uses "testserver" as host
+    with override_settings(ALLOWED_HOSTS=["testserver"]):
+        results = {
+            name: time(benchmark, number, repeat)
+            for name, benchmark in get_benchmarks().items()
+        }
+    payload_number = max(number // PAYLOAD_DIVISOR, 1)
+    results.update(
+        {
+            name: time(benchmark, payload_number, repeat)
+            for name, benchmark in get_payload_benchmarks().items()
+        }
+    )
+    return results
@@ -0,0 +1,225 @@
+"""
+Drive concurrent requests against the API endpoints and summarize the latencies.
+"""
+import json
+import math
+import queue
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from django_camunda.camunda_models import Task, factory
+from django_camunda.utils import underscoreize
+from zds_client.oas import schema_fetcher
+
+from zac_lite.utils import identity_map
+from zac_lite.utils.concurrent import parallel
+
+from .. import catalogi
+from ..throttling import SlidingWindowThrottle
+from ..tokens import token_generator
+from .upstreams import StandInUpstreams
+
+WARMUP = 1
+
+
+@dataclass
+class Result:
+    requests: int
+    errors: int
+    throughput: float  # requests per second
+    p50: float  # in milliseconds
+    p95: float
+    p99: float
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of the (unsorted) values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+@contextmanager
+def local_caches():
+    """
+    Replace the configured caches by local memory caches.
+
+    The benchmark neither reads cached data of the environment, like a shared
+    Redis, nor fills those caches with stand-in data.
+    """
+    local = {
+        alias: {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": f"benchmark-{alias}",
+            "OPTIONS": {"MAX_ENTRIES": 1000000},
+        }
+        for alias in settings.CACHES
+    }
+    with override_settings(CACHES=local):
+        yield
+
+
+def clear_caches() -> None:
+    """
+    Clear the caches and the in-memory copies of the upstream data.
+    """
+    for alias in settings.CACHES:
+        caches[alias].clear()
+    schema_fetcher.cache.clear()
+    identity_map.clear()
+    catalogi.clear_memory()
+
+
+@contextmanager
+def raised_throttle_rates():
+    """
+    Raise the throttle rates, so the load from a single client is not rejected.
+
+    The throttles are still applied, so their cost is measured.
+    """
+    rates = SlidingWindowThrottle.THROTTLE_RATES
+    SlidingWindowThrottle.THROTTLE_RATES = {scope: "1000000/min" for scope in rates}
+    try:
+        yield
+    finally:
+        SlidingWindowThrottle.THROTTLE_RATES = rates
+
+
+def run_load(
+    make_request: Callable[[Client], int],
+    requests: int,
+    concurrency: int,
+    warmup: int = WARMUP,
+) -> Result:
+    """
+    Execute ``make_request`` ``requests`` times with ``concurrency`` workers.
+
+    ``make_request`` receives a test client (one per call) and returns the response
+    status code. The ``warmup`` requests are made up front and not measured, so
+    one-off costs like fetching the API schemas do not skew the percentiles.
+    """
+    for _ in range(warmup):
+        make_request(Client())
+
+    def _timed(_) -> tuple:
+        start = time.perf_counter()
+        status = make_request(Client())
+        return (time.perf_counter() - start) * 1000, status
+
+    start = time.perf_counter()
+    with parallel(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(_timed, range(requests)))
+    duration = time.perf_counter() - start
+
+    latencies = [latency for latency, _ in outcomes]
+    return Result(
+        requests=requests,
+        errors=sum(1 for _, status in outcomes if status >= 400),
+        throughput=requests / duration if duration else 0.0,
+        p50=percentile(latencies, 50),
+        p95=percentile(latencies, 95),
+        p99=percentile(latencies, 99),
+    )
+
+
+def get_endpoints(
+    upstreams: StandInUpstreams, token: str, requests: int
+) -> Dict[str, Callable]:
+    """
+    Build the request callables per benchmark name.
+
+    Every task-data request is made for a new task, so the context itself is never
+    served from the cache. The warm requests all concern the same zaak, whose
+    upstream responses are cached after the warmup. The cold requests each concern
+    a new zaak with its own documents, only the API schemas and the zaaktype with
+    its informatieobjecttypen are shared with the other requests.
+    """
+    cold_tasks = queue.SimpleQueue()
+    for _ in range(requests + WARMUP):
+        cold_tasks.put(upstreams.add_task(upstreams.add_zaak()))
+
+    def task_data(client: Client, task_id: Optional[str] = None) -> int:
+        task_id = task_id or str(uuid.uuid4())
+        task = factory(Task, underscoreize(upstreams.get_task_data(task_id)))
+        endpoint = reverse(
+            "task-data-detail",
+            kwargs={
+                "tidb64": urlsafe_base64_encode(force_bytes(task_id)),
+                "token": token_generator.make_token(task),
+            },
+        )
+        return client.get(endpoint).status_code
+
+    def cold_task_data(client: Client) -> int:
+        return task_data(client, task_id=cold_tasks.get_nowait())
+
+    def user_link(client: Client) -> int:
+        response = client.post(
+            reverse("user-link-create"),
+            {"taskId": str(uuid.uuid4())},
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Token {token}",
+        )
+        return response.status_code
+
+    return {
+        "task-data-detail (cold)": cold_task_data,
+        "task-data-detail (warm)": task_data,
+        "user-link-create": user_link,
+    }
+
+
+def compare(
+    results: Dict[str, Result], baseline: Dict[str, dict], tolerance: float
+) -> List[str]:
+    """
+    Return the regressions of the results compared to the baseline.
+
+    A latency percentile regresses if it exceeds the baseline by more than the
+    tolerance (as fraction), the throughput if it drops by more than the tolerance.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        reference = baseline[name]
+        for metric in ("p50", "p95", "p99"):
+            if getattr(result, metric) > reference[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name} {metric}: {getattr(result, metric):.1f}ms > "
+                    f"{reference[metric]:.1f}ms"
+                )
+        if result.throughput < reference["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name} throughput: {result.throughput:.1f}/s < "
+                f"{reference['throughput']:.1f}/s"
+            )
+    return regressions
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    with open(path, "r") as infile:
+        return json.load(infile)["results"]
+
+
+def save_baseline(path: str, results: Dict[str, Result], config: dict) -> None:
+    data = {
+        "config": config,
+        "results": {name: asdict(result) for name, result in results.items()},
+    }
+    with open(path, "w") as outfile:
+        json.dump(data, outfile, indent=2)
@@ -0,0 +1,274 @@
+"""
+Local stand-in for the Camunda, Zaken, Catalogi and Documenten APIs.
+
+All the APIs are served by one threaded HTTP server on the loopback interface, which
+handles every request in its own thread. The response bodies are generated once from
+the OAS schemas in ``settings.ZGW_CONSUMERS_TEST_SCHEMA_DIRS`` and every response is
+delayed with the configured latency and jitter. Additional zaken are copies of the
+generated zaak and its documents under new URLs, so they share the zaaktype.
+"""
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from django_camunda.utils import serialize_variable
+from zgw_consumers.test import generate_oas_component, read_schema
+
+FORM_KEY = "zac-lite:zaak-documents"
+
+API_ROOTS = {
+    "zrc": "zaken/api/v1/",
+    "ztc": "catalogi/api/v1/",
+    "drc": "documenten/api/v1/",
+}
+CAMUNDA_ROOT = "camunda/"
+
+TASK_PATTERN = re.compile(r"^/camunda/engine-rest/task/(?P<id>[^/]+)$")
+VARIABLE_PATTERN = re.compile(
+    r"^/camunda/engine-rest/task/(?P<id>[^/]+)/variables/(?P<name>[^/]+)$"
+)
+# the zaak specific resources, which are copied for every zaak
+ZAAK_RESOURCE_PATTERN = re.compile(
+    r"(?P<resource>zaken|zaakinformatieobjecten|enkelvoudiginformatieobjecten)/"
+    r"(?P<uuid>[0-9a-f-]{36})"
+)
+
+
+class StandInUpstreams:
+    """
+    Serve the upstream APIs for the lifetime of the context manager.
+
+    :param latency: mean response delay, in seconds
+    :param jitter: maximum deviation from the mean delay, in seconds
+    :param documents: number of documents related to the zaak
+    :param document_types: number of informatieobjecttypen of the zaaktype
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        documents: int = 10,
+        document_types: int = 5,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.documents = documents
+        self.document_types = document_types
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.routes: Dict[str, Tuple[str, bytes]] = {}
+        self.zaak_url = ""
+        # zaak URL -> zaakinformatieobjecten
+        self.zios: Dict[str, bytes] = {}
+        # task ID -> zaak URL, for tasks of another zaak than the generated one
+        self.task_zaken: Dict[str, str] = {}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/"
+
+    def get_api_root(self, api_type: str) -> str:
+        return f"{self.base_url}{API_ROOTS[api_type]}"
+
+    @property
+    def camunda_root(self) -> str:
+        return f"{self.base_url}{CAMUNDA_ROOT}"
+
+    def __enter__(self) -> "StandInUpstreams":
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._get_handler_class())
+        self.server.daemon_threads = True
+        self._generate_routes()
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def add_zaak(self) -> str:
+        """
+        Serve a copy of the generated zaak and its documents and return its URL.
+
+        The copy and its documents have new URLs, so none of their responses are
+        cached when the copy is fetched for the first time.
+        """
+        ids = {}
+
+        def replace(match) -> str:
+            new_id = ids.setdefault(match.group("uuid"), str(uuid.uuid4()))
+            return f"{match.group('resource')}/{new_id}"
+
+        data = json.loads(ZAAK_RESOURCE_PATTERN.sub(replace, self._zaak_template))
+        for resource in [data["zaak"], *data["documents"]]:
+            self._add_route(resource["url"], resource)
+        self.zios[data["zaak"]["url"]] = json.dumps(data["zios"]).encode("utf-8")
+        return data["zaak"]["url"]
+
+    def add_task(self, zaak_url: str) -> str:
+        """
+        Return the ID of a new task of the zaak.
+        """
+        task_id = str(uuid.uuid4())
+        self.task_zaken[task_id] = zaak_url
+        return task_id
+
+    def get_task_data(self, task_id: str) -> dict:
+        return {
+            "id": task_id,
+            "name": "Benchmark task",
+            "assignee": None,
+            "created": "2021-01-01T12:00:00.000+0100",
+            "due": None,
+            "followUp": None,
+            "delegationState": None,
+            "description": None,
+            "executionId": str(uuid.UUID(int=1)),
+            "owner": None,
+            "parentTaskId": None,
+            "priority": 50,
+            "processDefinitionId": "benchmark:1:1",
+            # a process instance per task, so no context is shared between tasks
+            "processInstanceId": str(uuid.uuid5(uuid.NAMESPACE_URL, task_id)),
+            "caseDefinitionId": None,
+            "caseInstanceId": None,
+            "caseExecutionId": None,
+            "taskDefinitionKey": "benchmark",
+            "suspended": False,
+            "formKey": FORM_KEY,
+            "tenantId": None,
+        }
+
+    def delay(self) -> None:
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _url(self, api_type: str, resource: str) -> str:
+        return f"{self.get_api_root(api_type)}{resource}/{uuid.uuid4()}"
+
+    def _add_route(self, url: str, body, content_type="application/json") -> None:
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        self.routes[urlsplit(url).path] = (content_type, body)
+
+    def _generate_routes(self) -> None:
+        for api_type in API_ROOTS:
+            self._add_route(
+                f"{self.get_api_root(api_type)}schema/openapi.yaml",
+                read_schema(api_type),
+                content_type="application/vnd.oai.openapi",
+            )
+
+        iots = [
+            generate_oas_component(
+                "ztc",
+                "schemas/InformatieObjectType",
+                url=self._url("ztc", "informatieobjecttypen"),
+            )
+            for _ in range(self.document_types)
+        ]
+        catalogus = self._url("ztc", "catalogussen")
+        zaaktype = generate_oas_component(
+            "ztc",
+            "schemas/ZaakType",
+            url=self._url("ztc", "zaaktypen"),
+            catalogus=catalogus,
+            informatieobjecttypen=[iot["url"] for iot in iots],
+        )
+        zaak = generate_oas_component(
+            "zrc",
+            "schemas/Zaak",
+            url=self._url("zrc", "zaken"),
+            zaaktype=zaaktype["url"],
+        )
+        documents = [
+            generate_oas_component(
+                "drc",
+                "schemas/EnkelvoudigInformatieObject",
+                url=self._url("drc", "enkelvoudiginformatieobjecten"),
+                informatieobjecttype=random.choice(iots)["url"],
+            )
+            for _ in range(self.documents)
+        ]
+        zios = [
+            generate_oas_component(
+                "zrc",
+                "schemas/ZaakInformatieObject",
+                url=self._url("zrc", "zaakinformatieobjecten"),
+                zaak=zaak["url"],
+                informatieobject=document["url"],
+            )
+            for document in documents
+        ]
+
+        for resource in [zaaktype, *iots]:
+            self._add_route(resource["url"], resource)
+        self._add_route(
+            f"{self.get_api_root('ztc')}informatieobjecttypen",
+            {"count": len(iots), "next": None, "previous": None, "results": iots},
+        )
+        self._zaak_template = json.dumps(
+            {"zaak": zaak, "documents": documents, "zios": zios}
+        )
+        self.zaak_url = self.add_zaak()
+        self._variables = {
+            "toelichtingen": serialize_variable("Benchmark"),
+        }
+
+    def _route(self, url: str) -> Optional[Tuple[str, bytes]]:
+        path = urlsplit(url).path
+        match = VARIABLE_PATTERN.match(path)
+        if match:
+            if match.group("name") == "zaakUrl":
+                zaak_url = self.task_zaken.get(match.group("id"), self.zaak_url)
+                variable = serialize_variable(zaak_url)
+            else:
+                variable = self._variables.get(match.group("name"))
+            if variable is None:
+                return None
+            return ("application/json", json.dumps(variable).encode("utf-8"))
+
+        if path == f"/{API_ROOTS['zrc']}zaakinformatieobjecten":
+            zaak_url = parse_qs(urlsplit(url).query).get("zaak", [self.zaak_url])[0]
+            zios = self.zios.get(zaak_url)
+            return ("application/json", zios) if zios is not None else None
+
+        match = TASK_PATTERN.match(path)
+        if match:
+            task_data = self.get_task_data(match.group("id"))
+            return ("application/json", json.dumps(task_data).encode("utf-8"))
+
+        return self.routes.get(path)
+
+    def _get_handler_class(self) -> type:
+        upstreams = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                upstreams.delay()
+                route = upstreams._route(self.path)
+                if route is None:
+                    self.send_error(404)
+                    return
+
+                content_type, body = route
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,104 @@
+"""
+Resolve informatieobjecttypen from an index of their catalogus.
+
+Zaaktypen can have dozens of informatieobjecttypen. Instead of retrieving them one by
+one, all informatieobjecttypen of the catalogus are listed once and indexed by URL.
+The index is cached in the ``upstream`` cache for the informatieobjecttype timeout
+and in memory for ``MEMORY_TIMEOUT`` seconds. The cached index is tagged with the
+catalogus and informatieobjecttype URLs, so notifications invalidate it.
+"""
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional, Tuple
+
+from django.core.cache import caches
+
+from zgw_consumers.service import get_paginated_results
+
+from zac_lite import cache_tags, upstream_cache
+from zac_lite.utils.metrics import CACHE_REQUESTS
+
+from .api_models import InformatieObjectType, get_fields
+
+MEMORY_TIMEOUT = 60
+
+# informatieobjecttype URL -> informatieobjecttype
+CatalogusIndex = Dict[str, Dict[str, Any]]
+
+# catalogus URL -> (expiry timestamp, index)
+_indexes: Dict[str, Tuple[float, CatalogusIndex]] = {}
+_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+
+
+def get_cache_key(catalogus: str) -> str:
+    return f"user_tasks:catalogus-index:{catalogus}"
+
+
+def fetch_index(catalogi_client, catalogus: str) -> CatalogusIndex:
+    document_types = get_paginated_results(
+        catalogi_client,
+        "informatieobjecttype",
+        query_params={"catalogus": catalogus, "status": "alles"},
+        fields=get_fields(InformatieObjectType),
+    )
+    return {document_type["url"]: document_type for document_type in document_types}
+
+
+def get_index(catalogi_client, catalogus: str) -> Optional[CatalogusIndex]:
+    """
+    Return the index of the informatieobjecttypen of the catalogus.
+
+    Returns ``None`` if informatieobjecttypen are not cached, as listing a large
+    catalogus for every request is slower than retrieving the few types needed.
+    """
+    timeout = upstream_cache.get_timeout("informatieobjecttype")
+    if not timeout:
+        return None
+
+    expires, index = _indexes.get(catalogus, (0, None))
+    if expires > time.time():
+        return index
+
+    # only one thread lists the catalogus, the others wait for the result
+    with _locks[catalogus]:
+        expires, index = _indexes.get(catalogus, (0, None))
+        if expires > time.time():
+            return index
+
+        cache = caches[upstream_cache.CACHE_ALIAS]
+        cache_key = get_cache_key(catalogus)
+        index = cache.get(cache_key)
+        CACHE_REQUESTS.labels(
+            cache="catalogus", result="miss" if index is None else "hit"
+        ).inc()
+        if index is None:
+            index = fetch_index(catalogi_client, catalogus)
+            cache.set(cache_key, index, timeout=timeout)
+            cache_tags.tag(
+                upstream_cache.CACHE_ALIAS, cache_key, [catalogus, *index], timeout
+            )
+
+        _indexes[catalogus] = (time.time() + min(MEMORY_TIMEOUT, timeout), index)
+        return index
+
+
+def get_document_type(
+    catalogi_client, catalogus: Optional[str], url: str
+) -> Dict[str, Any]:
+    """
+    Look up the informatieobjecttype in the catalogus index.
+
+    Falls back to retrieving the informatieobjecttype if it is not in the index, e.g.
+    when it was added to the catalogus after the index was built.
+    """
+    index = get_index(catalogi_client, catalogus) if catalogus else None
+    if index and url in index:
+        return index[url]
+    return catalogi_client.retrieve(
+        "informatieobjecttype", url=url, fields=get_fields(InformatieObjectType)
+    )
+
+
+def clear_memory() -> None:
+    _indexes.clear()
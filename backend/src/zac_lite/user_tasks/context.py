@@ -1,15 +1,158 @@
+"""
+Registry and engine to build the task context for a Camunda user task form.
+
+Context handlers are registered for a form key with the process variables they need,
+the upstream services they depend on and how long their result may be cached. The
+handler itself is referenced by dotted path and only imported on first use.
+
+Handlers can also be registered with a stream callable, building the same context
+but yielding its parts as soon as they are retrieved.
+
+Built contexts are cached per process instance (or per task outside a process
+instance) and variable values, so a context is built again as soon as the process
+variables change. Consecutive tasks of a process instance mostly need the same
+context, so a follow-up task is served the context built for its predecessor.
+
+Cached contexts are tagged with the URLs of the resources they were built from, so
+they can be invalidated when a notification about one of these resources arrives.
+"""
+import hashlib
+import json
 import logging
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from django.core.cache import caches
+from django.utils.module_loading import import_string
 
+import elasticapm
+from django_camunda.api import get_task_variable
 from django_camunda.camunda_models import Task
+from zgw_consumers.constants import APITypes
 
-from .zaak_documents import ZaakDocumentsContext, get_zaak_documents_context
+from zac_lite import cache_tags
+from zac_lite.utils.concurrent import parallel
+from zac_lite.utils.metrics import CACHE_REQUESTS
 
 logger = logging.getLogger(__name__)
 
-FORM_KEY_MAP = {
-    "zac-lite:zaak-documents": get_zaak_documents_context,
-}
+CACHE_ALIAS = "default"
+
+
+@dataclass
+class ContextHandler:
+    form_key: str
+    handler_path: str
+    variables: Tuple[str, ...] = ()
+    services: Tuple[str, ...] = ()
+    cache_timeout: int = 60
+    tags_path: str = ""
+    stream_path: str = ""
+    serializer_path: str = ""
+    _handler: Optional[Callable] = field(default=None, init=False, repr=False)
+    _stream: Optional[Callable] = field(default=None, init=False, repr=False)
+    _get_tags: Optional[Callable] = field(default=None, init=False, repr=False)
+    _serializer: Optional[type] = field(default=None, init=False, repr=False)
+
+    @property
+    def handler(self) -> Callable[[Task, Dict[str, Any]], Any]:
+        if self._handler is None:
+            self._handler = import_string(self.handler_path)
+        return self._handler
+
+    @property
+    def stream(self) -> Optional[Callable[[Task, Dict[str, Any]], Iterator]]:
+        if self._stream is None and self.stream_path:
+            self._stream = import_string(self.stream_path)
+        return self._stream
+
+    @property
+    def get_tags(self) -> Optional[Callable[[Any], Iterable[str]]]:
+        if self._get_tags is None and self.tags_path:
+            self._get_tags = import_string(self.tags_path)
+        return self._get_tags
+
+    @property
+    def serializer(self) -> Optional[type]:
+        if self._serializer is None and self.serializer_path:
+            self._serializer = import_string(self.serializer_path)
+        return self._serializer
+
+    def serialize(self, context: Any, serializer_context: Dict[str, Any]) -> Any:
+        """
+        Serialize the built context, contexts without serializer are returned as is.
+        """
+        if context is None or self.serializer is None:
+            return context
+        return self.serializer(instance=context, context=serializer_context).data
+
+    def get_cache_key(self, task: Task, variables: Dict[str, Any]) -> str:
+        """
+        Return the cache key shared by the tasks of the process instance, as long as
+        the variable values are the same.
+        """
+        scope = (
+            f"process:{task.process_instance_id}"
+            if task.process_instance_id
+            else f"task:{task.id}"
+        )
+        serialized = json.dumps(variables, sort_keys=True, default=str)
+        digest = hashlib.sha256(serialized.encode()).hexdigest()
+        return f"user_tasks:context:{self.form_key}:{scope}:{digest}"
+
+
+class Registry:
+    def __init__(self):
+        self._handlers: Dict[str, ContextHandler] = {}
+
+    def __contains__(self, form_key: str) -> bool:
+        return form_key in self._handlers
+
+    def __getitem__(self, form_key: str) -> ContextHandler:
+        return self._handlers[form_key]
+
+    def get(self, form_key: str) -> Optional[ContextHandler]:
+        return self._handlers.get(form_key)
+
+    def register(self, form_key: str, handler_path: str, **kwargs) -> ContextHandler:
+        """
+        Register the context handler for the given form key.
+
+        :param form_key: the Camunda user task form key
+        :param handler_path: dotted path to the callable building the context. It is
+          called with the task and the fetched process variables.
+        :param variables: names of the process variables to fetch for the handler
+        :param services: the ZGW API types the handler retrieves data from
+        :param cache_timeout: number of seconds to cache the built context, ``0``
+          disables the caching
+        :param tags_path: dotted path to the callable returning the cache tags (the
+          URLs of the resources used) of a built context
+        :param stream_path: dotted path to the generator function building the
+          context in parts. It yields ``(part, data)`` tuples and returns the
+          complete context.
+        :param serializer_path: dotted path to the serializer class of the context.
+          Without serializer, the context must be JSON serializable as is.
+        """
+        assert form_key not in self, f"Form key {form_key} is already registered"
+        context_handler = ContextHandler(
+            form_key=form_key, handler_path=handler_path, **kwargs
+        )
+        self._handlers[form_key] = context_handler
+        return context_handler
+
+
+registry = Registry()
+register = registry.register
+
+register(
+    "zac-lite:zaak-documents",
+    "zac_lite.user_tasks.zaak_documents.get_zaak_documents_context",
+    variables=("zaakUrl", "toelichtingen"),
+    services=(APITypes.zrc, APITypes.ztc, APITypes.drc),
+    tags_path="zac_lite.user_tasks.zaak_documents.get_cache_tags",
+    stream_path="zac_lite.user_tasks.zaak_documents.stream_zaak_documents_context",
+    serializer_path="zac_lite.user_tasks.serializers.ZaakDocumentsContextSerializer",
+)
 
 
 class EmptyContext:
@@ -17,10 +160,83 @@ class EmptyContext:
         return None
 
 
-def get_context(task: Task) -> Optional[ZaakDocumentsContext]:
-    getter = FORM_KEY_MAP.get(task.form_key)
-    if getter is None:
+def get_variables(task: Task, names: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Fetch the process variables for the task concurrently.
+    """
+    with parallel() as executor:
+        values = executor.map(lambda name: get_task_variable(task.id, name), names)
+    return dict(zip(names, values))
+
+
+def get_cached_context(
+    context_handler: ContextHandler, cache_key: str
+) -> Optional[Any]:
+    if not context_handler.cache_timeout:
+        return None
+    context = caches[CACHE_ALIAS].get(cache_key)
+    CACHE_REQUESTS.labels(
+        cache="context", result="miss" if context is None else "hit"
+    ).inc()
+    return context
+
+
+def cache_context(
+    context_handler: ContextHandler, cache_key: str, context: Any
+) -> None:
+    if not context_handler.cache_timeout:
+        return
+    caches[CACHE_ALIAS].set(cache_key, context, context_handler.cache_timeout)
+    if context_handler.get_tags:
+        cache_tags.tag(
+            CACHE_ALIAS,
+            cache_key,
+            context_handler.get_tags(context),
+            context_handler.cache_timeout,
+        )
+
+
+def get_context(task: Task) -> Optional[Any]:
+    context_handler = registry.get(task.form_key)
+    if context_handler is None:
         logger.warning("No context handler for form key %s", task.form_key)
         return None
 
-    return getter(task)
+    with elasticapm.capture_span(
+        f"context {task.form_key}",
+        span_type="app",
+        labels={"services": ",".join(context_handler.services)},
+    ):
+        variables = get_variables(task, context_handler.variables)
+        cache_key = context_handler.get_cache_key(task, variables)
+        context = get_cached_context(context_handler, cache_key)
+        if context is not None:
+            return context
+
+        context = context_handler.handler(task, variables)
+
+    cache_context(context_handler, cache_key, context)
+    return context
+
+
+def stream_context(task: Task) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield the parts of the task context as ``(part, data)`` tuples.
+
+    Cached contexts, and contexts of handlers without stream callable, are yielded
+    in one ``context`` part.
+    """
+    context_handler = registry.get(task.form_key)
+    if context_handler is None or context_handler.stream is None:
+        yield "context", get_context(task)
+        return
+
+    variables = get_variables(task, context_handler.variables)
+    cache_key = context_handler.get_cache_key(task, variables)
+    context = get_cached_context(context_handler, cache_key)
+    if context is not None:
+        yield "context", context
+        return
+
+    context = yield from context_handler.stream(task, variables)
+    cache_context(context_handler, cache_key, context)
@@ -0,0 +1,174 @@
+import json
+import os
+import platform
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.test.runner import DiscoverRunner
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from django_camunda.models import CamundaConfig
+from rest_framework.authtoken.models import Token
+from zgw_consumers.constants import APITypes, AuthTypes
+from zgw_consumers.models import Service
+
+from zac_lite.accounts.models import User
+
+from ...benchmark.runner import (
+    clear_caches,
+    compare,
+    get_endpoints,
+    load_baseline,
+    local_caches,
+    raised_throttle_rates,
+    run_load,
+    save_baseline,
+)
+from ...benchmark.upstreams import StandInUpstreams
+
+DEFAULT_BASELINE = os.path.join(settings.BASE_DIR, "benchmarks", "baseline.json")
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the task-data and user-link endpoints against local stand-ins "
+        "of the upstream APIs. Runs on a throwaway test database, with local "
+        "memory caches."
+    )
+    # the checks may query the regular database, which is not used at all
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.02,
+            help="Mean upstream response delay in seconds",
+        )
+        parser.add_argument(
+            "--jitter",
+            type=float,
+            default=0.005,
+            help="Maximum deviation of the upstream delay in seconds",
+        )
+        parser.add_argument(
+            "--documents", type=int, default=10, help="Number of zaak documents"
+        )
+        parser.add_argument(
+            "--document-types",
+            type=int,
+            default=5,
+            help="Number of informatieobjecttypen of the zaaktype",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per endpoint"
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=10, help="Concurrent clients"
+        )
+        parser.add_argument(
+            "--baseline",
+            default=DEFAULT_BASELINE,
+            help="Path of the baseline file to compare with (or save to)",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Store the results as new baseline instead of comparing",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Allowed deviation from the baseline, as fraction",
+        )
+
+    def handle(self, **options):
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        old_config = runner.setup_databases()
+        try:
+            with local_caches():
+                results = self.run_benchmark(options)
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name}: {result.throughput:.1f} req/s, p50 {result.p50:.1f}ms, "
+                f"p95 {result.p95:.1f}ms, p99 {result.p99:.1f}ms, "
+                f"{result.errors} error(s)"
+            )
+
+        if any(result.errors for result in results.values()):
+            raise CommandError("Some requests failed, the results are not valid.")
+
+        baseline_path = options["baseline"]
+        if options["save_baseline"]:
+            os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+            config = {
+                key: options[key]
+                for key in (
+                    "latency",
+                    "jitter",
+                    "documents",
+                    "document_types",
+                    "requests",
+                    "concurrency",
+                )
+            }
+            # baselines are only comparable on the same hardware
+            config.update(machine=platform.platform(), cpus=os.cpu_count())
+            save_baseline(baseline_path, results, config)
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {baseline_path}"))
+            return
+
+        if not os.path.exists(baseline_path):
+            self.stdout.write(
+                self.style.WARNING(f"No baseline found at {baseline_path}")
+            )
+            return
+
+        regressions = compare(
+            results, load_baseline(baseline_path), options["tolerance"]
+        )
+        if regressions:
+            raise CommandError(
+                "Performance regressions detected:\n" + "\n".join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS("No regressions compared to the baseline"))
+
+    def run_benchmark(self, options) -> dict:
+        with StandInUpstreams(
+            latency=options["latency"],
+            jitter=options["jitter"],
+            documents=options["documents"],
+            document_types=options["document_types"],
+        ) as upstreams:
+            for api_type in (APITypes.zrc, APITypes.ztc, APITypes.drc):
+                Service.objects.create(
+                    label=f"Benchmark {api_type}",
+                    api_type=api_type,
+                    api_root=upstreams.get_api_root(api_type),
+                    auth_type=AuthTypes.no_auth,
+                )
+            config = CamundaConfig.get_solo()
+            config.root_url = upstreams.camunda_root
+            config.rest_api_path = "engine-rest/"
+            config.save()
+
+            user = User.objects.create(username="benchmark")
+            token = Token.objects.create(user=user)
+
+            endpoints = get_endpoints(upstreams, token.key, options["requests"])
+            results = {}
+            with raised_throttle_rates():
+                for name, make_request in endpoints.items():
+                    clear_caches()
+                    results[name] = run_load(
+                        make_request,
+                        requests=options["requests"],
+                        concurrency=options["concurrency"],
+                    )
+            return results
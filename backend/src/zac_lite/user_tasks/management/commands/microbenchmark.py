@@ -0,0 +1,24 @@
+from django.core.management import BaseCommand
+
+from ...benchmark.micro import run
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the token generation and verification, the task ID decoding and the "
+        "user-link URL building."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--number", type=int, default=10000, help="Calls per measurement"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Measurements per benchmark"
+        )
+
+    def handle(self, **options):
+        results = run(number=options["number"], repeat=options["repeat"])
+        width = max(len(name) for name in results)
+        for name, duration in results.items():
+            self.stdout.write(f"{name:<{width}}  {duration:8.2f} µs")
@@ -0,0 +1,84 @@
+from django.core.management import BaseCommand, CommandError
+
+from zac_lite import upstream_cache
+
+from ...zaak_documents import get_zaak_documents_context
+
+
+class Command(BaseCommand):
+    help = (
+        "Manage the cached responses of the ZGW APIs: list the usage, invalidate "
+        "selectively or pre-warm the cache for zaken."
+    )
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest="action")
+        subparsers.required = True
+
+        subparsers.add_parser("list", help="List the cached entries per resource")
+
+        invalidate = subparsers.add_parser(
+            "invalidate", help="Remove cached entries, keeping the others"
+        )
+        invalidate.add_argument(
+            "--prefix", default="", help="Only remove URLs starting with the prefix"
+        )
+        invalidate.add_argument(
+            "--resource",
+            action="append",
+            dest="resources",
+            help="Only remove entries of the resource, e.g. 'zaaktype'. Repeatable.",
+        )
+        invalidate.add_argument("--all", action="store_true", help="Remove all entries")
+
+        warm = subparsers.add_parser(
+            "warm", help="Cache the zaken with their zaaktype and documents"
+        )
+        warm.add_argument("zaak_urls", nargs="*", metavar="zaak-url")
+        warm.add_argument(
+            "--file", help="File with a zaak URL per line, '-' reads from stdin"
+        )
+
+    def handle(self, **options):
+        getattr(self, f"handle_{options['action']}")(**options)
+
+    def handle_list(self, **options):
+        for usage in upstream_cache.get_usage():
+            self.stdout.write(f"{usage.entries:6d}  {usage.resource}  {usage.api_root}")
+
+    def handle_invalidate(self, prefix: str, resources, **options):
+        if not (prefix or resources or options["all"]):
+            raise CommandError("Pass --prefix and/or --resource, or --all.")
+        removed = upstream_cache.invalidate(prefix=prefix, resources=resources)
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} cached entries"))
+
+    def handle_warm(self, zaak_urls, **options):
+        zaak_urls = list(zaak_urls)
+        if options["file"]:
+            try:
+                infile = (
+                    self.stdin if options["file"] == "-" else open(options["file"], "r")
+                )
+                with infile:
+                    zaak_urls += [line.strip() for line in infile if line.strip()]
+            except (OSError, UnicodeDecodeError) as exc:
+                raise CommandError(f"Could not read {options['file']}: {exc}")
+
+        failed = 0
+        for zaak_url in zaak_urls:
+            try:
+                # the task is not used to build the context
+                context = get_zaak_documents_context(
+                    None, {"zaakUrl": zaak_url, "toelichtingen": ""}
+                )
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"{zaak_url}: failed, {exc!r}")
+                continue
+            self.stdout.write(
+                f"{zaak_url}: {len(context.documents)} document(s), "
+                f"{len(context.document_types)} document type(s)"
+            )
+
+        if failed:
+            raise CommandError(f"{failed} of {len(zaak_urls)} zaken were not cached.")
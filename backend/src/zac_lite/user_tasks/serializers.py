@@ -6,12 +6,12 @@ from django.utils.translation import gettext_lazy as _
 
 from django_camunda.api import get_task
 from django_camunda.camunda_models import Task
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
-from zgw_consumers.api_models.catalogi import InformatieObjectType, ZaakType
-from zgw_consumers.api_models.documenten import Document
-from zgw_consumers.api_models.zaken import Zaak
 from zgw_consumers.drf.serializers import APIModelSerializer
 
+from .api_models import Document, InformatieObjectType, Zaak, ZaakType
+from .context import registry
 from .data import UserTaskData
 from .zaak_documents import ZaakDocumentsContext
 
@@ -117,6 +117,28 @@ class ZaakDocumentsContextSerializer(APIModelSerializer):
         fields = ("zaak", "documents", "document_types", "toelichtingen")
 
 
+class ZaakPartSerializer(serializers.Serializer):
+    zaak = ZaakSerializer()
+    toelichtingen = serializers.CharField()
+
+
+@extend_schema_field(ZaakDocumentsContextSerializer(allow_null=True))
+class TaskContextField(serializers.Field):
+    """
+    Serialize the task context with the serializer of its context handler.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.update(source="*", read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, task_data: UserTaskData):
+        context_handler = registry.get(task_data.task.form_key)
+        if context_handler is None:
+            return None
+        return context_handler.serialize(task_data.context, self.context)
+
+
 class UserTaskConfigurationSerializer(APIModelSerializer):
     form = serializers.CharField(
         label=_("Form to render"),
@@ -124,13 +146,12 @@ class UserTaskConfigurationSerializer(APIModelSerializer):
         help_text=_("The form key of the form to render."),
     )
     task = TaskSerializer(label=_("User task summary"))
-    context = ZaakDocumentsContextSerializer(
+    context = TaskContextField(
         label=_("User task context"),
         help_text=_(
             "The task context shape depends on the `form` property. The value will be "
             "`null` if the backend does not 'know' the user task `formKey`."
         ),
-        allow_null=True,
     )
 
     class Meta:
@@ -140,3 +161,41 @@ class UserTaskConfigurationSerializer(APIModelSerializer):
             "task",
             "context",
         )
+
+
+class TaskDataEventSerializer(serializers.Serializer):
+    event = serializers.ChoiceField(
+        label=_("Event"),
+        choices=(
+            "task",
+            "zaak",
+            "document",
+            "documentType",
+            "context",
+            "error",
+            "end",
+        ),
+        help_text=_(
+            "The part of the task data in the event. The `task` event contains the "
+            "`form` and `task` properties. It is followed by either a `context` event "
+            "with the complete context, or the `zaak` event, followed by a `document` "
+            "or `documentType` event for every document and document type in order of "
+            "retrieval. The stream ends with an `end` or `error` event."
+        ),
+    )
+    data = serializers.JSONField(
+        label=_("Event data"),
+        help_text=_(
+            "The data of the part, in the shape of the corresponding property of the "
+            "task data."
+        ),
+    )
+
+
+# serializer of the data per streamed context part, the complete ``context`` is
+# serialized by its context handler
+PART_SERIALIZERS = {
+    "zaak": ZaakPartSerializer,
+    "document": DocumentSerializer,
+    "documentType": DocumentTypeSerializer,
+}
@@ -0,0 +1,104 @@
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+
+import requests
+
+from ..benchmark.runner import Result, compare, local_caches, percentile
+from ..benchmark.upstreams import StandInUpstreams
+
+
+class StandInUpstreamsTests(SimpleTestCase):
+    def test_serves_zaak_and_task_variables(self):
+        with StandInUpstreams(documents=3, document_types=2) as upstreams:
+            zaak = requests.get(upstreams.zaak_url).json()
+            zios = requests.get(
+                f"{upstreams.get_api_root('zrc')}zaakinformatieobjecten",
+                params={"zaak": upstreams.zaak_url},
+            ).json()
+            zaaktype = requests.get(zaak["zaaktype"]).json()
+            variable = requests.get(
+                f"{upstreams.camunda_root}engine-rest/task/abc/variables/zaakUrl"
+            ).json()
+            missing = requests.get(f"{upstreams.base_url}unknown")
+
+        self.assertEqual(len(zios), 3)
+        self.assertEqual(len(zaaktype["informatieobjecttypen"]), 2)
+        self.assertEqual(variable["value"], upstreams.zaak_url)
+        self.assertEqual(missing.status_code, 404)
+
+    def test_add_zaak(self):
+        with StandInUpstreams(documents=2) as upstreams:
+            zaak_url = upstreams.add_zaak()
+            task_id = upstreams.add_task(zaak_url)
+            zaak = requests.get(zaak_url).json()
+            zios = requests.get(
+                f"{upstreams.get_api_root('zrc')}zaakinformatieobjecten",
+                params={"zaak": zaak_url},
+            ).json()
+            original_zios = requests.get(
+                f"{upstreams.get_api_root('zrc')}zaakinformatieobjecten",
+                params={"zaak": upstreams.zaak_url},
+            ).json()
+            document = requests.get(zios[0]["informatieobject"])
+            variable = requests.get(
+                f"{upstreams.camunda_root}engine-rest/task/{task_id}/variables/zaakUrl"
+            ).json()
+
+        self.assertNotEqual(zaak_url, upstreams.zaak_url)
+        self.assertEqual(zaak["url"], zaak_url)
+        self.assertEqual({zio["zaak"] for zio in zios}, {zaak_url})
+        self.assertFalse(
+            {zio["informatieobject"] for zio in zios}
+            & {zio["informatieobject"] for zio in original_zios}
+        )
+        self.assertEqual(document.status_code, 200)
+        self.assertEqual(variable["value"], zaak_url)
+
+    def test_local_caches(self):
+        with local_caches():
+            caches["upstream"].set("key", "value")
+
+            self.assertIsInstance(caches["upstream"], LocMemCache)
+
+        self.assertIsNone(caches["upstream"].get("key"))
+
+
+class BaselineTests(SimpleTestCase):
+    baseline = {
+        "task-data-detail": {
+            "requests": 100,
+            "errors": 0,
+            "throughput": 100.0,
+            "p50": 10.0,
+            "p95": 20.0,
+            "p99": 30.0,
+        }
+    }
+
+    def test_percentile(self):
+        values = [float(value) for value in range(100, 0, -1)]
+
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_within_tolerance(self):
+        result = Result(
+            requests=100, errors=0, throughput=85.0, p50=11.0, p95=23.0, p99=35.0
+        )
+
+        regressions = compare({"task-data-detail": result}, self.baseline, 0.2)
+
+        self.assertEqual(regressions, [])
+
+    def test_regressions(self):
+        result = Result(
+            requests=100, errors=0, throughput=50.0, p50=10.0, p95=20.0, p99=40.0
+        )
+
+        regressions = compare({"task-data-detail": result}, self.baseline, 0.2)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("task-data-detail p99"))
+        self.assertTrue(regressions[1].startswith("task-data-detail throughput"))
@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+from django.conf import settings
+from django.test import TestCase
+
+import requests_mock
+from django_camunda.api import get_task_variable
+from django_camunda.client import get_client
+from django_camunda.models import CamundaConfig
+from django_camunda.utils import serialize_variable
+
+from zac_lite.client import CamundaClient, get_camunda_session
+
+CAMUNDA_ROOT = "https://camunda.example.com/"
+CAMUNDA_BASE = f"{CAMUNDA_ROOT}engine-rest"
+
+
+class CamundaClientTests(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        config = CamundaConfig.get_solo()
+        config.root_url = CAMUNDA_ROOT
+        config.rest_api_path = "engine-rest/"
+        config.save()
+
+    def test_shared_session(self):
+        client = get_client()
+        session = get_camunda_session()
+
+        self.assertIsInstance(client, CamundaClient)
+        self.assertIs(client.session, session)
+        self.assertIs(get_client().session, session)
+        adapter = session.get_adapter(CAMUNDA_BASE)
+        self.assertEqual(adapter._pool_maxsize, settings.CAMUNDA_POOL_MAXSIZE)
+
+    def test_requests_use_session(self):
+        session = get_camunda_session()
+
+        with requests_mock.Mocker() as m, patch.object(
+            session, "request", wraps=session.request
+        ) as m_request:
+            m.get(
+                f"{CAMUNDA_BASE}/task/1/variables/zaakUrl?deserializeValues=false",
+                json=serialize_variable("https://zaken.example.com/zaken/1"),
+            )
+
+            value = get_task_variable("1", "zaakUrl")
+
+        self.assertEqual(value, "https://zaken.example.com/zaken/1")
+        m_request.assert_called_once()
+
+    def test_missing_variable(self):
+        with requests_mock.Mocker() as m:
+            m.get(
+                f"{CAMUNDA_BASE}/task/1/variables/zaakUrl?deserializeValues=false",
+                status_code=404,
+                json={"type": "InvalidRequestException"},
+            )
+
+            value = get_task_variable("1", "zaakUrl", default="")
+
+        self.assertEqual(value, "")
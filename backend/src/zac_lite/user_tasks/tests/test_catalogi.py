@@ -0,0 +1,85 @@
+from unittest.mock import MagicMock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from zac_lite import cache_tags
+
+from ..catalogi import clear_memory, get_cache_key, get_document_type
+from .test_task_data_endpoint import CATALOGUS, IOT_1, IOT_2, OPENZAAK_BASE
+
+IOT_LIST = f"{OPENZAAK_BASE}/catalogi/api/v1/informatieobjecttypen"
+
+
+def get_client():
+    client = MagicMock()
+    client.list.side_effect = [
+        {"next": f"{IOT_LIST}?catalogus={CATALOGUS}&page=2", "results": [IOT_1]},
+        {"next": None, "results": [IOT_2]},
+    ]
+    return client
+
+
+@override_settings(UPSTREAM_CACHE_TIMEOUTS={"informatieobjecttype": 3600})
+class CatalogusIndexTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.addCleanup(caches["default"].clear)
+        self.addCleanup(caches["upstream"].clear)
+        self.addCleanup(clear_memory)
+
+    def test_document_types_from_index(self):
+        client = get_client()
+
+        iot_1 = get_document_type(client, CATALOGUS, IOT_1["url"])
+        iot_2 = get_document_type(client, CATALOGUS, IOT_2["url"])
+
+        self.assertEqual(iot_1, IOT_1)
+        self.assertEqual(iot_2, IOT_2)
+        # both pages listed once, nothing retrieved
+        self.assertEqual(client.list.call_count, 2)
+        self.assertEqual(
+            client.list.call_args_list[0][1]["query_params"]["catalogus"], CATALOGUS
+        )
+        client.retrieve.assert_not_called()
+
+    def test_index_shared_through_cache(self):
+        get_document_type(get_client(), CATALOGUS, IOT_1["url"])
+        clear_memory()
+        client = get_client()
+
+        iot_2 = get_document_type(client, CATALOGUS, IOT_2["url"])
+
+        self.assertEqual(iot_2, IOT_2)
+        client.list.assert_not_called()
+
+    def test_unknown_document_type_retrieved(self):
+        client = get_client()
+        url = f"{IOT_LIST}/7a0a5b2c"
+        client.retrieve.return_value = {"url": url, "omschrijving": "Nieuw"}
+
+        document_type = get_document_type(client, CATALOGUS, url)
+
+        self.assertEqual(document_type["omschrijving"], "Nieuw")
+        client.retrieve.assert_called_once()
+
+    @override_settings(UPSTREAM_CACHE_TIMEOUTS={})
+    def test_not_cached_no_index(self):
+        client = get_client()
+        client.retrieve.return_value = IOT_1
+
+        get_document_type(client, CATALOGUS, IOT_1["url"])
+
+        client.list.assert_not_called()
+        client.retrieve.assert_called_once()
+
+    def test_index_invalidated_by_tag(self):
+        get_document_type(get_client(), CATALOGUS, IOT_1["url"])
+        # a shorter lived entry with the same tag doesn't shorten the index entry
+        cache_tags.tag("default", "context", [IOT_1["url"]], 60)
+
+        removed = cache_tags.invalidate([IOT_1["url"]])
+
+        self.assertEqual(removed, 2)
+        self.assertIsNone(caches["upstream"].get(get_cache_key(CATALOGUS)))
@@ -0,0 +1,205 @@
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import SimpleTestCase
+
+from django_camunda.camunda_models import Task, factory
+from django_camunda.utils import underscoreize
+from rest_framework import serializers
+
+from zac_lite import cache_tags
+
+from ..context import Registry, get_context, registry
+from .test_task_data_endpoint import TASK_DATA
+
+CALLS = []
+
+
+def dummy_handler(task, variables):
+    CALLS.append((task.id, variables))
+    return {"variables": variables}
+
+
+def dummy_tags(context):
+    return ["https://openzaak.example.com/zaken/api/v1/zaken/a6a8c4fd"]
+
+
+class DummySerializer(serializers.Serializer):
+    foo = serializers.CharField(source="variables.foo")
+
+
+class ContextRegistryTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+
+        CALLS.clear()
+        self.addCleanup(caches["default"].clear)
+        self.addCleanup(caches["upstream"].clear)
+
+        patcher = patch("zac_lite.user_tasks.context.registry", new=Registry())
+        self.registry = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.task = factory(Task, underscoreize({**TASK_DATA, "formKey": "dummy"}))
+
+    def test_zaak_documents_registered(self):
+        context_handler = registry["zac-lite:zaak-documents"]
+
+        self.assertEqual(context_handler.variables, ("zaakUrl", "toelichtingen"))
+
+    def test_unknown_form_key(self):
+        self.assertIsNone(get_context(self.task))
+
+    def test_handler_imported_lazily(self):
+        context_handler = self.registry.register(
+            "dummy", "zac_lite.user_tasks.tests.test_context_registry.dummy_handler"
+        )
+        self.assertIsNone(context_handler._handler)
+
+        with patch(
+            "zac_lite.user_tasks.context.get_task_variable", return_value="value"
+        ):
+            get_context(self.task)
+
+        self.assertIs(context_handler._handler, dummy_handler)
+
+    def test_variables_fetched(self):
+        self.registry.register(
+            "dummy",
+            "zac_lite.user_tasks.tests.test_context_registry.dummy_handler",
+            variables=("foo", "bar"),
+        )
+
+        with patch(
+            "zac_lite.user_tasks.context.get_task_variable",
+            side_effect=lambda task_id, name: name.upper(),
+        ):
+            context = get_context(self.task)
+
+        self.assertEqual(context, {"variables": {"foo": "FOO", "bar": "BAR"}})
+
+    def test_context_cached(self):
+        self.registry.register(
+            "dummy",
+            "zac_lite.user_tasks.tests.test_context_registry.dummy_handler",
+            cache_timeout=60,
+        )
+
+        for _ in range(2):
+            get_context(self.task)
+
+        self.assertEqual(len(CALLS), 1)
+
+    def test_context_caching_disabled(self):
+        self.registry.register(
+            "dummy",
+            "zac_lite.user_tasks.tests.test_context_registry.dummy_handler",
+            cache_timeout=0,
+        )
+
+        for _ in range(2):
+            get_context(self.task)
+
+        self.assertEqual(len(CALLS), 2)
+
+    def test_cached_context_tagged(self):
+        self.registry.register(
+            "dummy",
+            "zac_lite.user_tasks.tests.test_context_registry.dummy_handler",
+            tags_path="zac_lite.user_tasks.tests.test_context_registry.dummy_tags",
+        )
+        get_context(self.task)
+
+        removed = cache_tags.invalidate(
+            ["https://openzaak.example.com/zaken/api/v1/zaken/a6a8c4fd"]
+        )
+        get_context(self.task)
+
+        self.assertEqual(removed, 1)
+        self.assertEqual(len(CALLS), 2)
+
+    def test_context_shared_in_process_instance(self):
+        self.registry.register(
+            "dummy",
+            "zac_lite.user_tasks.tests.test_context_registry.dummy_handler",
+            variables=("zaakUrl",),
+        )
+        next_task = factory(
+            Task,
+            underscoreize(
+                {
+                    **TASK_DATA,
+                    "id": "bd4e5a4c-2d6a-4d39-9e9e-c60b2cb6f2a4",
+                    "formKey": "dummy",
+                }
+            ),
+        )
+
+        with patch(
+            "zac_lite.user_tasks.context.get_task_variable", return_value="zaak-1"
+        ):
+            get_context(self.task)
+            context = get_context(next_task)
+
+        self.assertEqual(len(CALLS), 1)
+        self.assertEqual(context, {"variables": {"zaakUrl": "zaak-1"}})
+
+    def test_process_context_invalidated_by_variable_change(self):
+        self.registry.register(
+            "dummy",
+            "zac_lite.user_tasks.tests.test_context_registry.dummy_handler",
+            variables=("zaakUrl",),
+        )
+        next_task = factory(
+            Task,
+            underscoreize(
+                {
+                    **TASK_DATA,
+                    "id": "bd4e5a4c-2d6a-4d39-9e9e-c60b2cb6f2a4",
+                    "formKey": "dummy",
+                }
+            ),
+        )
+
+        with patch(
+            "zac_lite.user_tasks.context.get_task_variable", return_value="zaak-1"
+        ):
+            get_context(self.task)
+        with patch(
+            "zac_lite.user_tasks.context.get_task_variable", return_value="zaak-2"
+        ):
+            context = get_context(next_task)
+
+        self.assertEqual(len(CALLS), 2)
+        self.assertEqual(context, {"variables": {"zaakUrl": "zaak-2"}})
+
+    def test_context_built_again_for_changed_variables(self):
+        self.registry.register(
+            "dummy",
+            "zac_lite.user_tasks.tests.test_context_registry.dummy_handler",
+            variables=("toelichtingen",),
+        )
+
+        for value in ("first", "first", "changed"):
+            with patch(
+                "zac_lite.user_tasks.context.get_task_variable", return_value=value
+            ):
+                context = get_context(self.task)
+
+        self.assertEqual(len(CALLS), 2)
+        self.assertEqual(context, {"variables": {"toelichtingen": "changed"}})
+
+    def test_context_serialized_by_handler(self):
+        context_handler = self.registry.register(
+            "dummy",
+            "zac_lite.user_tasks.tests.test_context_registry.dummy_handler",
+            serializer_path=f"{__name__}.DummySerializer",
+        )
+        plain_handler = self.registry.register(
+            "plain", "zac_lite.user_tasks.tests.test_context_registry.dummy_handler"
+        )
+        context = {"variables": {"foo": "FOO"}}
+
+        self.assertEqual(context_handler.serialize(context, {}), {"foo": "FOO"})
+        self.assertEqual(plain_handler.serialize(context, {}), context)
+        self.assertIsNone(context_handler.serialize(None, {}))
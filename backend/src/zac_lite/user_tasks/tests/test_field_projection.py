@@ -0,0 +1,171 @@
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import SimpleTestCase
+
+import requests_mock
+from django_camunda.camunda_models import Task, factory
+from django_camunda.utils import serialize_variable, underscoreize
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from zds_client.oas import schema_fetcher
+from zgw_consumers.constants import APITypes
+from zgw_consumers.models import Service
+from zgw_consumers.test import generate_oas_component, mock_service_oas_get
+
+from zac_lite.client import NLXClient, get_query_params
+from zac_lite.utils import identity_map
+
+from ..catalogi import clear_memory
+from .test_task_data_endpoint import (
+    CAMUNDA_BASE,
+    DRC_BASE,
+    IOT_1,
+    IOT_2,
+    OPENZAAK_BASE,
+    TASK_DATA,
+    ZAAK,
+    ZAAKTYPE,
+    get_endpoint,
+    get_zio,
+    mock_catalogus,
+)
+
+SCHEMA = {
+    "paths": {
+        "/zaken/{uuid}": {
+            "parameters": [{"$ref": "#/components/parameters/uuid"}],
+            "get": {
+                "operationId": "zaak_read",
+                "parameters": [
+                    {"name": "Accept-Crs", "in": "header"},
+                    {"$ref": "#/components/parameters/fields"},
+                ],
+            },
+        },
+        "/zaakinformatieobjecten": {
+            "get": {
+                "operationId": "zaakinformatieobject_list",
+                "parameters": [{"name": "zaak", "in": "query"}],
+            },
+        },
+    },
+    "components": {
+        "parameters": {
+            "uuid": {"name": "uuid", "in": "path"},
+            "fields": {"name": "fields", "in": "query"},
+        },
+    },
+}
+
+
+class QueryParamsTests(SimpleTestCase):
+    def test_get_query_params(self):
+        self.assertEqual(get_query_params(SCHEMA, "zaak_read"), {"fields"})
+        self.assertEqual(
+            get_query_params(SCHEMA, "zaakinformatieobject_list"), {"zaak"}
+        )
+        self.assertEqual(get_query_params(SCHEMA, "zaak_list"), set())
+
+
+class FieldProjectionTests(APITransactionTestCase):
+    def setUp(self):
+        super().setUp()
+
+        Service.objects.create(
+            label="Zaken API",
+            api_root=f"{OPENZAAK_BASE}/zaken/api/v1/",
+            api_type=APITypes.zrc,
+        )
+        Service.objects.create(
+            label="Catalogi API",
+            api_root=f"{OPENZAAK_BASE}/catalogi/api/v1/",
+            api_type=APITypes.ztc,
+        )
+        Service.objects.create(
+            label="Documenten API",
+            api_root=DRC_BASE,
+            api_type=APITypes.drc,
+        )
+
+        # the OAS schemas are fetched again in other test cases
+        self.addCleanup(schema_fetcher.cache.clear)
+        self.addCleanup(caches["default"].clear)
+        self.addCleanup(caches["upstream"].clear)
+        self.addCleanup(identity_map.clear)
+        self.addCleanup(clear_memory)
+
+    @patch.object(
+        NLXClient,
+        "supports_query_param",
+        side_effect=lambda operation_id, name: name == "fields",
+    )
+    def test_fields_passed_upstream(self, m_supports):
+        task_data = {**TASK_DATA, "formKey": "zac-lite:zaak-documents"}
+        task = factory(Task, underscoreize(task_data))
+        doc = generate_oas_component(
+            "drc",
+            "schemas/EnkelvoudigInformatieObject",
+            url=f"{DRC_BASE}/enkelvoudiginformatieobjecten/79dc383d",
+            titel="Eerste verdieping",
+            bestandsomvang=4096,
+            informatieobjecttype=IOT_1["url"],
+        )
+        zio = get_zio(ZAAK["url"], doc["url"])
+        projected_doc = {
+            key: doc[key]
+            for key in ("url", "titel", "bestandsomvang", "informatieobjecttype")
+        }
+
+        with requests_mock.Mocker() as m:
+            mock_service_oas_get(m, f"{OPENZAAK_BASE}/zaken/api/v1/", "zrc")
+            mock_service_oas_get(m, f"{OPENZAAK_BASE}/catalogi/api/v1/", "ztc")
+            mock_service_oas_get(m, f"{DRC_BASE}/", "drc")
+            m.get(f"{CAMUNDA_BASE}/task/{task.id}", json=task_data)
+            m.get(
+                f"{CAMUNDA_BASE}/task/{task.id}/variables/zaakUrl?deserializeValues=false",
+                json=serialize_variable(ZAAK["url"]),
+            )
+            m.get(
+                f"{CAMUNDA_BASE}/task/{task.id}/variables/toelichtingen?deserializeValues=false",
+                json=serialize_variable(""),
+            )
+            m.get(ZAAK["url"], json=ZAAK)
+            m.get(ZAAKTYPE["url"], json=ZAAKTYPE)
+            m.get(
+                f"{OPENZAAK_BASE}/zaken/api/v1/zaakinformatieobjecten",
+                json=[{"url": zio["url"], "informatieobject": doc["url"]}],
+            )
+            m.get(doc["url"], json=projected_doc)
+            m.get(IOT_1["url"], json=IOT_1)
+            m.get(IOT_2["url"], json=IOT_2)
+            mock_catalogus(m)
+
+            response = self.client.get(get_endpoint(task))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["context"]["documents"],
+            [
+                {
+                    "url": doc["url"],
+                    "title": "Eerste verdieping",
+                    "size": 4096,
+                    "documentType": IOT_1["url"],
+                }
+            ],
+        )
+        fields_params = {
+            request.url.split("?")[0]: request.qs.get("fields")
+            for request in m.request_history
+            if request.qs.get("fields")
+        }
+        self.assertEqual(
+            fields_params[doc["url"]],
+            ["url,titel,bestandsomvang,informatieobjecttype"],
+        )
+        self.assertEqual(fields_params[ZAAK["url"]], ["url,identificatie,zaaktype"])
+        self.assertEqual(
+            fields_params[f"{OPENZAAK_BASE}/zaken/api/v1/zaakinformatieobjecten"],
+            ["url,informatieobject"],
+        )
@@ -0,0 +1,100 @@
+import copy
+
+from django.test import SimpleTestCase, TestCase
+
+from zgw_consumers.constants import APITypes
+from zgw_consumers.models import Service
+from zgw_consumers.nlx import Rewriter as ReferenceRewriter
+
+from zac_lite.nlx import Rewriter
+
+REWRITES = (
+    ("https://openzaak.example.com/zaken/api/v1/", "http://outway:8080/zrc/"),
+    ("https://drc.example.com/api/v1/", "http://outway:8080/drc/"),
+)
+
+DATA = {
+    "url": "http://outway:8080/zrc/zaken/1",
+    "count": 2,
+    "results": [
+        "http://outway:8080/drc/enkelvoudiginformatieobjecten/1",
+        {"informatieobject": "http://outway:8080/drc/enkelvoudiginformatieobjecten/2"},
+        ["http://outway:8080/zrc/statussen/1", None, 3],
+    ],
+    "toelichting": "Zie http://outway:8080/zrc/zaken/1",
+    "empty": {},
+}
+
+
+class RewriterTests(SimpleTestCase):
+    def test_same_result_as_zgw_consumers(self):
+        reference = ReferenceRewriter.__new__(ReferenceRewriter)
+        reference.rewrites = list(REWRITES)
+        rewriter = Rewriter(REWRITES)
+
+        for direction in ("backwards", "forwards"):
+            with self.subTest(direction=direction):
+                expected = copy.deepcopy(DATA)
+                getattr(reference, direction)(expected)
+                data = copy.deepcopy(DATA)
+
+                getattr(rewriter, direction)(data)
+
+                self.assertEqual(data, expected)
+
+    def test_backwards(self):
+        data = copy.deepcopy(DATA)
+
+        Rewriter(REWRITES).backwards(data)
+
+        self.assertEqual(
+            data["url"], "https://openzaak.example.com/zaken/api/v1/zaken/1"
+        )
+        self.assertEqual(
+            data["results"][1]["informatieobject"],
+            "https://drc.example.com/api/v1/enkelvoudiginformatieobjecten/2",
+        )
+        # only prefixes are rewritten
+        self.assertEqual(data["toelichting"], DATA["toelichting"])
+
+    def test_longest_prefix(self):
+        rewriter = Rewriter(
+            (
+                ("https://openzaak.example.com/", "http://outway:8080/openzaak/"),
+                ("https://openzaak.example.com/zaken/", "http://outway:8080/zrc/"),
+            )
+        )
+        paths = ["https://openzaak.example.com/zaken/api/v1/zaken/1"]
+
+        rewriter.forwards(paths)
+
+        self.assertEqual(paths, ["http://outway:8080/zrc/api/v1/zaken/1"])
+
+    def test_no_rewrites(self):
+        data = copy.deepcopy(DATA)
+
+        Rewriter(()).backwards(data)
+
+        self.assertEqual(data, DATA)
+
+
+class NLXClientRewriterTests(TestCase):
+    def test_rewrites_from_services(self):
+        service = Service.objects.create(
+            label="Zaken API",
+            api_type=APITypes.zrc,
+            api_root="https://openzaak.example.com/zaken/api/v1/",
+            nlx="http://outway:8080/zrc/",
+        )
+        client = service.build_client()
+
+        self.assertIsInstance(client.rewriter, Rewriter)
+        self.assertEqual(
+            client.rewriter.rewrites,
+            (
+                (
+                    "https://openzaak.example.com/zaken/api/v1/",
+                    "http://outway:8080/zrc/",
+                ),
+            ),
+        )
@@ -1,18 +1,28 @@
+import time
 import uuid
+from unittest.mock import patch
 
+from django.core.cache import caches
+from django.test import override_settings
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 
+import requests
 import requests_mock
 from django_camunda.camunda_models import Task, factory
 from django_camunda.utils import serialize_variable, underscoreize
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase, APITransactionTestCase
+from zds_client.oas import schema_fetcher
 from zgw_consumers.constants import APITypes
 from zgw_consumers.models import Service
 from zgw_consumers.test import generate_oas_component, mock_service_oas_get
 
+from zac_lite.client import NLXClient
+from zac_lite.utils import identity_map
+
+from ..catalogi import clear_memory
 from ..tokens import token_generator
 
 # Taken from https://docs.camunda.org/manual/7.13/reference/rest/task/get/
@@ -100,11 +110,31 @@ class GetTaskDataTests(APITestCase):
             f"{CAMUNDA_BASE}/task/598347ee-62fc-46a2-913a-6e0788bc1b8c",
         )
 
+    @override_settings(TASK_DATA_DEADLINE=0.05)
+    def test_deadline_exceeded_504(self):
+        task = factory(Task, underscoreize(TASK_DATA))
+
+        def timeout(request, context):
+            time.sleep(0.1)
+            raise requests.ReadTimeout()
+
+        with requests_mock.Mocker() as m:
+            m.get(f"{CAMUNDA_BASE}/task/{task.id}", json=timeout)
+            response = self.client.get(get_endpoint(task))
+
+        self.assertEqual(response.status_code, status.HTTP_504_GATEWAY_TIMEOUT)
+        self.assertEqual(
+            response.json()["detail"], "The upstream services did not respond in time."
+        )
+
+
+CATALOGUS = f"{OPENZAAK_BASE}/catalogi/api/v1/catalogussen/e13e72de"
 
 ZAAKTYPE = generate_oas_component(
     "ztc",
     "schemas/ZaakType",
     url=f"{OPENZAAK_BASE}/catalogi/api/v1/zaaktypen/ef82832d-ef1b-47d8-a830-2295ed02bdc8",
+    catalogus=CATALOGUS,
     omschrijving="Vastleggen rapportage NEN 2580",
     informatieobjecttypen=[
         f"{OPENZAAK_BASE}/catalogi/api/v1/informatieobjecttypen/1a1d4fb2",
@@ -135,6 +165,13 @@ ZAAK = generate_oas_component(
 )
 
 
+def mock_catalogus(m):
+    m.get(
+        f"{OPENZAAK_BASE}/catalogi/api/v1/informatieobjecttypen?catalogus={CATALOGUS}",
+        json={"count": 2, "next": None, "previous": None, "results": [IOT_1, IOT_2]},
+    )
+
+
 def get_zio(zaak: str, io: str):
     _uuid = uuid.uuid4()
     return generate_oas_component(
@@ -152,9 +189,8 @@ class ZaakDocumentsFormKeyTests(APITransactionTestCase):
     Test the endpoint behaviour specifically for the zac-lite:zaak-documents form key.
     """
 
-    @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUp(self):
+        super().setUp()
 
         Service.objects.create(
             label="Zaken API",
@@ -172,6 +208,13 @@ class ZaakDocumentsFormKeyTests(APITransactionTestCase):
             api_type=APITypes.drc,
         )
 
+        # make sure every test fetches the OAS schemas
+        self.addCleanup(schema_fetcher.cache.clear)
+        self.addCleanup(caches["default"].clear)
+        self.addCleanup(caches["upstream"].clear)
+        self.addCleanup(identity_map.clear)
+        self.addCleanup(clear_memory)
+
     def test_valid_response(self):
         task_data = {**TASK_DATA, "formKey": "zac-lite:zaak-documents"}
         task = factory(Task, underscoreize(task_data))
@@ -220,6 +263,7 @@ class ZaakDocumentsFormKeyTests(APITransactionTestCase):
             m.get(doc_2["url"], json=doc_2)
             m.get(IOT_1["url"], json=IOT_1)
             m.get(IOT_2["url"], json=IOT_2)
+            mock_catalogus(m)
 
             response = self.client.get(endpoint)
 
@@ -275,8 +319,171 @@ class ZaakDocumentsFormKeyTests(APITransactionTestCase):
         # * fetch zaaktype from Open Zaak (+1)
         # * fetch zaak-documents from Open Zaak (+1)
         # * fetch 2 documents from Documenten API (+2)
-        # * fetch zaaktype-informatieobjecttypen from Open Zaak (+2)
+        # * fetch the informatieobjecttypen of the catalogus from Open Zaak (+1)
         self.assertEqual(
             len(m.request_history),
-            3 + 10,
+            3 + 9,
+        )
+
+    def test_server_timing(self):
+        task_data = {**TASK_DATA, "formKey": "zac-lite:zaak-documents"}
+        task = factory(Task, underscoreize(task_data))
+        doc = generate_oas_component(
+            "drc",
+            "schemas/EnkelvoudigInformatieObject",
+            url=f"{DRC_BASE}/enkelvoudiginformatieobjecten/79dc383d",
+            informatieobjecttype=IOT_1["url"],
+        )
+        endpoint = get_endpoint(task)
+
+        with requests_mock.Mocker() as m:
+            mock_service_oas_get(m, f"{OPENZAAK_BASE}/zaken/api/v1/", "zrc")
+            mock_service_oas_get(m, f"{OPENZAAK_BASE}/catalogi/api/v1/", "ztc")
+            mock_service_oas_get(m, f"{DRC_BASE}/", "drc")
+            m.get(f"{CAMUNDA_BASE}/task/{task.id}", json=task_data)
+            m.get(
+                f"{CAMUNDA_BASE}/task/{task.id}/variables/zaakUrl?deserializeValues=false",
+                json=serialize_variable(ZAAK["url"]),
+            )
+            m.get(
+                f"{CAMUNDA_BASE}/task/{task.id}/variables/toelichtingen?deserializeValues=false",
+                json=serialize_variable(""),
+            )
+            m.get(ZAAK["url"], json=ZAAK)
+            m.get(ZAAKTYPE["url"], json=ZAAKTYPE)
+            m.get(
+                f"{OPENZAAK_BASE}/zaken/api/v1/zaakinformatieobjecten?zaak={ZAAK['url']}",
+                json=[get_zio(ZAAK["url"], doc["url"])],
+            )
+            m.get(doc["url"], json=doc)
+            m.get(IOT_1["url"], json=IOT_1)
+            m.get(IOT_2["url"], json=IOT_2)
+            mock_catalogus(m)
+
+            response = self.client.get(endpoint)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metrics = {
+            metric.split(";")[0]: metric
+            for metric in response["Server-Timing"].split(", ")
+        }
+        self.assertEqual(
+            set(metrics),
+            {"camunda", "oas", "zaken-api", "catalogi-api", "documenten-api", "total"},
+        )
+        self.assertIn('desc="3 call(s)"', metrics["camunda"])
+        self.assertIn('desc="3 call(s)"', metrics["oas"])
+        self.assertIn('desc="2 call(s)"', metrics["zaken-api"])
+        self.assertIn('desc="2 call(s)"', metrics["catalogi-api"])
+        self.assertIn('desc="1 call(s)"', metrics["documenten-api"])
+
+    @patch.object(
+        NLXClient,
+        "supports_query_param",
+        side_effect=lambda operation_id, name: name == "expand",
+    )
+    def test_valid_response_expanded_zaak(self, m_supports):
+        task_data = {**TASK_DATA, "formKey": "zac-lite:zaak-documents"}
+        task = factory(Task, underscoreize(task_data))
+        doc = generate_oas_component(
+            "drc",
+            "schemas/EnkelvoudigInformatieObject",
+            url=f"{DRC_BASE}/enkelvoudiginformatieobjecten/79dc383d",
+            titel="Eerste verdieping",
+            bestandsomvang=4096,
+            informatieobjecttype=IOT_1["url"],
+        )
+        zio = get_zio(ZAAK["url"], doc["url"])
+        expanded_zaak = {
+            **ZAAK,
+            "_expand": {
+                "zaaktype": {
+                    **ZAAKTYPE,
+                    "_expand": {"informatieobjecttypen": [IOT_2, IOT_1]},
+                },
+                "zaakinformatieobjecten": [
+                    {**zio, "_expand": {"informatieobject": doc}}
+                ],
+            },
+        }
+        endpoint = get_endpoint(task)
+
+        with requests_mock.Mocker() as m:
+            mock_service_oas_get(m, f"{OPENZAAK_BASE}/zaken/api/v1/", "zrc")
+            m.get(f"{CAMUNDA_BASE}/task/{task.id}", json=task_data)
+            m.get(
+                f"{CAMUNDA_BASE}/task/{task.id}/variables/zaakUrl?deserializeValues=false",
+                json=serialize_variable(ZAAK["url"]),
+            )
+            m.get(
+                f"{CAMUNDA_BASE}/task/{task.id}/variables/toelichtingen?deserializeValues=false",
+                json=serialize_variable("Voorbeeld toelichting."),
+            )
+            m.get(ZAAK["url"], json=expanded_zaak)
+
+            response = self.client.get(endpoint)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        context = response.json()["context"]
+        self.assertEqual(
+            context["zaak"]["zaaktype"],
+            {"omschrijving": "Vastleggen rapportage NEN 2580"},
+        )
+        self.assertEqual([d["url"] for d in context["documents"]], [doc["url"]])
+        # ordered like zaaktype.informatieobjecttypen
+        self.assertEqual(
+            [dt["url"] for dt in context["documentTypes"]], [IOT_1["url"], IOT_2["url"]]
+        )
+        self.assertEqual(
+            m.last_request.qs["expand"],
+            [
+                "zaaktype,zaaktype.informatieobjecttypen,zaakinformatieobjecten,"
+                "zaakinformatieobjecten.informatieobject"
+            ],
+        )
+        # expected network calls:
+        # * fetch task from Camunda API (+1)
+        # * fetch zaakUrl & toelichtingen variables from Camunda API (+2)
+        # * OAS get (zrc)
+        # * fetch expanded zaak from Open Zaak (+1)
+        self.assertEqual(len(m.request_history), 1 + 4)
+
+    @patch.object(
+        NLXClient,
+        "supports_query_param",
+        side_effect=lambda operation_id, name: name == "expand",
+    )
+    def test_valid_response_partially_expanded_zaaktype(self, m_supports):
+        task_data = {**TASK_DATA, "formKey": "zac-lite:zaak-documents"}
+        task = factory(Task, underscoreize(task_data))
+        expanded_zaak = {
+            **ZAAK,
+            "_expand": {
+                "zaaktype": {**ZAAKTYPE, "_expand": {"informatieobjecttypen": [IOT_2]}},
+                "zaakinformatieobjecten": [],
+            },
+        }
+        endpoint = get_endpoint(task)
+
+        with requests_mock.Mocker() as m:
+            mock_service_oas_get(m, f"{OPENZAAK_BASE}/zaken/api/v1/", "zrc")
+            mock_service_oas_get(m, f"{OPENZAAK_BASE}/catalogi/api/v1/", "ztc")
+            m.get(f"{CAMUNDA_BASE}/task/{task.id}", json=task_data)
+            m.get(
+                f"{CAMUNDA_BASE}/task/{task.id}/variables/zaakUrl?deserializeValues=false",
+                json=serialize_variable(ZAAK["url"]),
+            )
+            m.get(
+                f"{CAMUNDA_BASE}/task/{task.id}/variables/toelichtingen?deserializeValues=false",
+                json=serialize_variable("Voorbeeld toelichting."),
+            )
+            m.get(ZAAK["url"], json=expanded_zaak)
+            mock_catalogus(m)
+
+            response = self.client.get(endpoint)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [dt["url"] for dt in response.json()["context"]["documentTypes"]],
+            [IOT_1["url"], IOT_2["url"]],
         )
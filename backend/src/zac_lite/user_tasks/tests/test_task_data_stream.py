@@ -0,0 +1,252 @@
+import json
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+import requests_mock
+from django_camunda.camunda_models import Task, factory
+from django_camunda.utils import serialize_variable, underscoreize
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITransactionTestCase
+from zds_client.oas import schema_fetcher
+from zgw_consumers.constants import APITypes
+from zgw_consumers.models import Service
+from zgw_consumers.test import generate_oas_component, mock_service_oas_get
+
+from zac_lite.utils import identity_map
+from zac_lite.utils.tracing import Trace
+
+from ..catalogi import clear_memory
+from ..tokens import token_generator
+from .test_task_data_endpoint import (
+    CAMUNDA_BASE,
+    DRC_BASE,
+    IOT_1,
+    IOT_2,
+    OPENZAAK_BASE,
+    TASK_DATA,
+    ZAAK,
+    ZAAKTYPE,
+    get_zio,
+    mock_catalogus,
+)
+
+TASK = factory(Task, underscoreize({**TASK_DATA, "formKey": "zac-lite:zaak-documents"}))
+
+DOCUMENT = generate_oas_component(
+    "drc",
+    "schemas/EnkelvoudigInformatieObject",
+    url=f"{DRC_BASE}/enkelvoudiginformatieobjecten/79dc383d",
+    titel="Eerste verdieping",
+    bestandsomvang=4096,
+    informatieobjecttype=IOT_1["url"],
+)
+
+
+def get_stream_endpoint(task: Task, token: str = ""):
+    tidb64 = urlsafe_base64_encode(force_bytes(task.id))
+    token = token or token_generator.make_token(task)
+    return reverse("task-data-stream", kwargs={"tidb64": tidb64, "token": token})
+
+
+def read_ndjson(response) -> list:
+    content = b"".join(response.streaming_content).decode("utf-8")
+    return [json.loads(line) for line in content.splitlines()]
+
+
+class TaskDataStreamTests(APITransactionTestCase):
+    def setUp(self):
+        super().setUp()
+
+        Service.objects.create(
+            label="Zaken API",
+            api_root=f"{OPENZAAK_BASE}/zaken/api/v1/",
+            api_type=APITypes.zrc,
+        )
+        Service.objects.create(
+            label="Catalogi API",
+            api_root=f"{OPENZAAK_BASE}/catalogi/api/v1/",
+            api_type=APITypes.ztc,
+        )
+        Service.objects.create(
+            label="Documenten API",
+            api_root=DRC_BASE,
+            api_type=APITypes.drc,
+        )
+
+        self.addCleanup(schema_fetcher.cache.clear)
+        self.addCleanup(caches["default"].clear)
+        self.addCleanup(caches["upstream"].clear)
+        self.addCleanup(identity_map.clear)
+        self.addCleanup(clear_memory)
+
+    def _mock_upstreams(self, m, zios=None):
+        mock_service_oas_get(m, f"{OPENZAAK_BASE}/zaken/api/v1/", "zrc")
+        mock_service_oas_get(m, f"{OPENZAAK_BASE}/catalogi/api/v1/", "ztc")
+        mock_service_oas_get(m, f"{DRC_BASE}/", "drc")
+        m.get(
+            f"{CAMUNDA_BASE}/task/{TASK.id}",
+            json={**TASK_DATA, "formKey": "zac-lite:zaak-documents"},
+        )
+        m.get(
+            f"{CAMUNDA_BASE}/task/{TASK.id}/variables/zaakUrl?deserializeValues=false",
+            json=serialize_variable(ZAAK["url"]),
+        )
+        m.get(
+            f"{CAMUNDA_BASE}/task/{TASK.id}/variables/toelichtingen?deserializeValues=false",
+            json=serialize_variable("Voorbeeld toelichting."),
+        )
+        m.get(ZAAK["url"], json=ZAAK)
+        m.get(ZAAKTYPE["url"], json=ZAAKTYPE)
+        m.get(
+            f"{OPENZAAK_BASE}/zaken/api/v1/zaakinformatieobjecten?zaak={ZAAK['url']}",
+            json=zios or [get_zio(ZAAK["url"], DOCUMENT["url"])],
+        )
+        m.get(DOCUMENT["url"], json=DOCUMENT)
+        m.get(IOT_1["url"], json=IOT_1)
+        m.get(IOT_2["url"], json=IOT_2)
+        mock_catalogus(m)
+
+    def test_stream_parts(self):
+        with requests_mock.Mocker() as m:
+            self._mock_upstreams(m)
+
+            response = self.client.get(get_stream_endpoint(TASK))
+            events = read_ndjson(response)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            events[0],
+            {
+                "event": "task",
+                "data": {
+                    "form": "zac-lite:zaak-documents",
+                    "task": {
+                        "id": str(TASK.id),
+                        "name": "aName",
+                        "assignee": "anAssignee",
+                        "created": "2013-01-23T11:42:42Z",
+                    },
+                },
+            },
+        )
+        self.assertEqual(
+            events[1],
+            {
+                "event": "zaak",
+                "data": {
+                    "zaak": {
+                        "identificatie": "ZAAK-2021-0000000001",
+                        "zaaktype": {"omschrijving": "Vastleggen rapportage NEN 2580"},
+                    },
+                    "toelichtingen": "Voorbeeld toelichting.",
+                },
+            },
+        )
+        parts = sorted((event["event"], event["data"]["url"]) for event in events[2:-1])
+        self.assertEqual(
+            parts,
+            [
+                ("document", DOCUMENT["url"]),
+                ("documentType", IOT_1["url"]),
+                ("documentType", IOT_2["url"]),
+            ],
+        )
+        self.assertEqual(events[-1], {"event": "end", "data": {}})
+
+    def test_document_retrieved_once(self):
+        zios = [
+            get_zio(ZAAK["url"], DOCUMENT["url"]),
+            get_zio(ZAAK["url"], DOCUMENT["url"]),
+        ]
+
+        with requests_mock.Mocker() as m:
+            self._mock_upstreams(m, zios=zios)
+
+            events = read_ndjson(self.client.get(get_stream_endpoint(TASK)))
+
+        document_events = [event for event in events if event["event"] == "document"]
+        self.assertEqual(len(document_events), 1)
+        document_requests = [
+            request
+            for request in m.request_history
+            if request.url.startswith(DOCUMENT["url"])
+        ]
+        self.assertEqual(len(document_requests), 1)
+
+    def test_cached_context_in_one_event(self):
+        with requests_mock.Mocker() as m:
+            self._mock_upstreams(m)
+
+            read_ndjson(self.client.get(get_stream_endpoint(TASK)))
+            events = read_ndjson(self.client.get(get_stream_endpoint(TASK)))
+
+        self.assertEqual(
+            [event["event"] for event in events], ["task", "context", "end"]
+        )
+        context = events[1]["data"]
+        self.assertEqual(context["toelichtingen"], "Voorbeeld toelichting.")
+        self.assertEqual(len(context["documents"]), 1)
+        self.assertEqual(len(context["documentTypes"]), 2)
+
+    def test_stream_traced(self):
+        with requests_mock.Mocker() as m, patch.object(
+            Trace, "log", autospec=True
+        ) as m_log:
+            self._mock_upstreams(m)
+
+            response = self.client.get(get_stream_endpoint(TASK))
+            self.assertEqual(m_log.call_count, 1)  # the dispatch, before the stream
+            read_ndjson(response)
+
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(m_log.call_count, 2)
+        stream_trace = m_log.call_args[0][0]
+        self.assertTrue(stream_trace.name.endswith(" stream"))
+        services = {span.service for span in stream_trace.spans}
+        self.assertTrue({"zaken-api", "documenten-api"} <= services)
+        self.assertGreater(stream_trace.duration, 0)
+
+    def test_server_sent_events(self):
+        with requests_mock.Mocker() as m:
+            self._mock_upstreams(m)
+
+            response = self.client.get(
+                get_stream_endpoint(TASK), HTTP_ACCEPT="text/event-stream"
+            )
+            content = b"".join(response.streaming_content).decode("utf-8")
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertTrue(content.startswith("event: task\ndata: {"))
+        self.assertTrue(content.endswith("event: end\ndata: {}\n\n"))
+
+    def test_upstream_error_in_stream(self):
+        with requests_mock.Mocker() as m:
+            self._mock_upstreams(m)
+            m.get(ZAAKTYPE["url"], status_code=500)
+
+            response = self.client.get(get_stream_endpoint(TASK))
+            events = read_ndjson(response)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(events[0]["event"], "task")
+        self.assertEqual(
+            events[-1],
+            {
+                "event": "error",
+                "data": {"detail": "The task context could not be retrieved."},
+            },
+        )
+
+    def test_invalid_token(self):
+        with requests_mock.Mocker() as m:
+            self._mock_upstreams(m)
+
+            response = self.client.get(get_stream_endpoint(TASK, token="bad-token"))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(json.loads(response.content)["event"], "error")
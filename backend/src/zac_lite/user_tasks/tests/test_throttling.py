@@ -0,0 +1,86 @@
+import uuid
+from unittest.mock import patch
+
+from django.core.cache import caches
+
+import requests_mock
+from django_camunda.camunda_models import Task, factory
+from django_camunda.utils import underscoreize
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from zac_lite.utils.metrics import THROTTLED_REQUESTS
+
+from ..throttling import SlidingWindowThrottle
+from .test_task_data_endpoint import CAMUNDA_BASE, TASK_DATA, get_endpoint
+
+RATES = {"task-data-client": "3/min", "task-data-task": "2/min"}
+
+
+@patch.object(SlidingWindowThrottle, "THROTTLE_RATES", RATES)
+class TaskDataThrottlingTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.addCleanup(caches["throttling"].clear)
+
+        self.task = factory(Task, underscoreize(TASK_DATA))
+
+    def _get_rejections(self, scope: str) -> float:
+        return THROTTLED_REQUESTS.labels(scope=scope)._value.get()
+
+    def test_throttled_per_task(self):
+        rejections = self._get_rejections("task-data-task")
+        endpoint = get_endpoint(self.task)
+
+        with requests_mock.Mocker() as m:
+            m.get(f"{CAMUNDA_BASE}/task/{self.task.id}", status_code=404)
+            responses = [self.client.get(endpoint) for _ in range(3)]
+
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [
+                status.HTTP_404_NOT_FOUND,
+                status.HTTP_404_NOT_FOUND,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+            ],
+        )
+        self.assertIn("Retry-After", responses[2])
+        # the rejected request did not reach Camunda
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(self._get_rejections("task-data-task"), rejections + 1)
+
+    def test_throttled_per_client(self):
+        rejections = self._get_rejections("task-data-client")
+        tasks = [
+            factory(Task, underscoreize({**TASK_DATA, "id": str(uuid.uuid4())}))
+            for _ in range(4)
+        ]
+
+        with requests_mock.Mocker() as m:
+            m.get(requests_mock.ANY, status_code=404)
+            responses = [self.client.get(get_endpoint(task)) for task in tasks]
+            other_client = self.client.get(
+                get_endpoint(tasks[0]), REMOTE_ADDR="10.0.0.2"
+            )
+
+        self.assertEqual(responses[-1].status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(other_client.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(m.call_count, 4)
+        self.assertEqual(self._get_rejections("task-data-client"), rejections + 1)
+
+    def test_invalid_tokens_do_not_throttle_valid_link(self):
+        endpoint = get_endpoint(self.task)
+        invalid_endpoint = reverse(
+            "task-data-detail",
+            kwargs={"tidb64": endpoint.split("/")[-2], "token": "invalid"},
+        )
+
+        with requests_mock.Mocker() as m:
+            m.get(f"{CAMUNDA_BASE}/task/{self.task.id}", status_code=404)
+            rejected = [self.client.get(invalid_endpoint) for _ in range(3)]
+            response = self.client.get(endpoint, REMOTE_ADDR="10.0.0.2")
+
+        self.assertEqual(rejected[-1].status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
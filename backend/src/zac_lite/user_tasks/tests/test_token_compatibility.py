@@ -0,0 +1,53 @@
+from datetime import date
+
+from django.test import SimpleTestCase, override_settings
+
+from django_camunda.camunda_models import Task, factory
+
+from ..benchmark.micro import get_benchmarks, make_reference_token
+from ..tokens import get_key_id, token_generator
+from .test_token_invalidation import TASK_DATA
+
+
+@override_settings(SECRET_KEY="dummy", SECRET_KEY_FALLBACKS=[])
+class TokenCompatibilityTests(SimpleTestCase):
+    def test_tokens_match_salted_hmac_implementation(self):
+        variations = [
+            {},
+            {"assignee": None, "due": None},
+            {"suspended": True, "owner": "änOwnér"},
+        ]
+        for variation in variations:
+            task = factory(Task, {**TASK_DATA, **variation})
+            for timestamp in (0, 7300, 12345):
+                with self.subTest(variation=variation, timestamp=timestamp):
+                    token = token_generator._make_token_with_timestamp(
+                        task, timestamp, legacy=True
+                    )
+
+                    self.assertEqual(token, make_reference_token(task, timestamp))
+
+    def test_key_id_token(self):
+        task = factory(Task, TASK_DATA)
+
+        token = token_generator._make_token_with_timestamp(task, 7300)
+
+        ts_b36, key_id, hash_string = token.split("-")
+        self.assertEqual(key_id, get_key_id(token_generator.key_salt, "dummy"))
+        self.assertEqual(f"{ts_b36}-{hash_string}", make_reference_token(task, 7300))
+
+    @override_settings(SECRET_KEY="new-secret", SECRET_KEY_FALLBACKS=["dummy"])
+    def test_legacy_tokens_remain_valid(self):
+        task = factory(Task, TASK_DATA)
+        timestamp = token_generator._num_days(date.today())
+        with self.settings(SECRET_KEY="dummy"):
+            token = make_reference_token(task, timestamp)
+
+        self.assertTrue(token_generator.check_token(task, token))
+
+
+class MicroBenchmarkTests(SimpleTestCase):
+    def test_benchmarks_run(self):
+        for name, benchmark in get_benchmarks().items():
+            with self.subTest(benchmark=name):
+                benchmark()
@@ -1,4 +1,5 @@
 from datetime import date, timedelta
+from unittest.mock import patch
 
 from django.test import SimpleTestCase, override_settings
 from django.utils.http import base36_to_int, int_to_base36
@@ -64,8 +65,8 @@ class TokenInvalidationTests(SimpleTestCase):
 
         with freeze_time(timedelta(days=8)):
             ts_b36 = int_to_base36((date.today() - date(2001, 1, 1)).days - 1)
-            _, hash_token = token.split("-")
-            valid = token_generator.check_token(task, f"{ts_b36}-{hash_token}")
+            _, key_id, hash_token = token.split("-")
+            valid = token_generator.check_token(task, f"{ts_b36}-{key_id}-{hash_token}")
 
         self.assertFalse(valid)
 
@@ -102,3 +103,41 @@ class TokenInvalidationTests(SimpleTestCase):
         valid = token_generator.check_token(task, "$$$-blegh")
 
         self.assertFalse(valid)
+
+    def test_secret_rotation(self):
+        task = factory(Task, TASK_DATA)
+        with self.settings(SECRET_KEY="old-secret"):
+            token = token_generator.make_token(task)
+
+        with self.subTest("fallback"):
+            with self.settings(
+                SECRET_KEY="new-secret", SECRET_KEY_FALLBACKS=["old-secret"]
+            ):
+                self.assertTrue(token_generator.check_token(task, token))
+
+        with self.subTest("fallback removed"):
+            with self.settings(SECRET_KEY="new-secret", SECRET_KEY_FALLBACKS=[]):
+                self.assertFalse(token_generator.check_token(task, token))
+
+    def test_new_tokens_use_current_secret(self):
+        task = factory(Task, TASK_DATA)
+        with self.settings(SECRET_KEY="new-secret", SECRET_KEY_FALLBACKS=["old"]):
+            token = token_generator.make_token(task)
+
+        with self.settings(SECRET_KEY="new-secret", SECRET_KEY_FALLBACKS=[]):
+            self.assertTrue(token_generator.check_token(task, token))
+
+    def test_unknown_key_id(self):
+        task = factory(Task, TASK_DATA)
+        with self.settings(SECRET_KEY="old-secret"):
+            token = token_generator.make_token(task)
+
+        with self.settings(SECRET_KEY="new-secret", SECRET_KEY_FALLBACKS=[]):
+            with patch.object(
+                token_generator, "_make_token_with_timestamp"
+            ) as mock_make_token:
+                valid = token_generator.check_token(task, token)
+
+        self.assertFalse(valid)
+        # the key ID is not in the key ring, so no hash was computed
+        mock_make_token.assert_not_called()
@@ -0,0 +1,212 @@
+from io import StringIO
+
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+import requests_mock
+from zds_client.oas import schema_fetcher
+from zgw_consumers.constants import APITypes
+from zgw_consumers.models import Service
+from zgw_consumers.test import mock_service_oas_get
+
+from zac_lite import upstream_cache
+from zac_lite.accounts.tests.factories import UserFactory
+from zac_lite.utils import identity_map
+
+from ..benchmark.upstreams import StandInUpstreams
+from .test_task_data_endpoint import OPENZAAK_BASE, ZAAK, ZAAKTYPE
+
+ZAKEN_ROOT = f"{OPENZAAK_BASE}/zaken/api/v1/"
+CATALOGI_ROOT = f"{OPENZAAK_BASE}/catalogi/api/v1/"
+
+
+@override_settings(UPSTREAM_CACHE_TIMEOUTS={"zaak": 60, "zaaktype": 3600})
+class UpstreamCacheTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.addCleanup(caches["upstream"].clear)
+
+    def test_resources_without_timeout_not_cached(self):
+        url = f"{ZAKEN_ROOT}statussen/1"
+        upstream_cache.set_response(ZAKEN_ROOT, "status", url, {"url": url})
+
+        self.assertIsNone(upstream_cache.get_response(url))
+        self.assertEqual(upstream_cache.get_usage(), [])
+
+    def test_cached_per_params(self):
+        upstream_cache.set_response(
+            ZAKEN_ROOT, "zaak", ZAAK["url"], ZAAK, params={"fields": "url"}
+        )
+
+        self.assertEqual(
+            upstream_cache.get_response(ZAAK["url"], {"fields": "url"}), ZAAK
+        )
+        self.assertIsNone(upstream_cache.get_response(ZAAK["url"]))
+
+    def test_usage(self):
+        upstream_cache.set_response(ZAKEN_ROOT, "zaak", ZAAK["url"], ZAAK)
+        upstream_cache.set_response(CATALOGI_ROOT, "zaaktype", ZAAKTYPE["url"], {})
+        # expired entries are not counted
+        caches["upstream"].delete(upstream_cache.get_cache_key(ZAAKTYPE["url"]))
+
+        usage = upstream_cache.get_usage()
+
+        self.assertEqual(
+            usage,
+            [upstream_cache.Usage(api_root=ZAKEN_ROOT, resource="zaak", entries=1)],
+        )
+
+    def test_invalidate_selectively(self):
+        upstream_cache.set_response(ZAKEN_ROOT, "zaak", ZAAK["url"], ZAAK)
+        upstream_cache.set_response(CATALOGI_ROOT, "zaaktype", ZAAKTYPE["url"], {})
+
+        removed = upstream_cache.invalidate(resources=["zaaktype"])
+
+        self.assertEqual(removed, 1)
+        self.assertIsNone(upstream_cache.get_response(ZAAKTYPE["url"]))
+        self.assertEqual(upstream_cache.get_response(ZAAK["url"]), ZAAK)
+
+        removed = upstream_cache.invalidate(prefix=ZAAK["url"])
+
+        self.assertEqual(removed, 1)
+        self.assertIsNone(upstream_cache.get_response(ZAAK["url"]))
+
+
+@override_settings(UPSTREAM_CACHE_TIMEOUTS={"zaak": 60})
+class NLXClientCacheTests(TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.service = Service.objects.create(
+            label="Zaken API", api_root=ZAKEN_ROOT, api_type=APITypes.zrc
+        )
+        self.addCleanup(schema_fetcher.cache.clear)
+        self.addCleanup(caches["upstream"].clear)
+        self.addCleanup(identity_map.clear)
+
+    def test_retrieve_cached(self):
+        client = self.service.build_client()
+
+        with requests_mock.Mocker() as m:
+            mock_service_oas_get(m, ZAKEN_ROOT, "zrc")
+            m.get(ZAAK["url"], json=ZAAK)
+
+            first = client.retrieve("zaak", url=ZAAK["url"])
+            second = client.retrieve("zaak", url=ZAAK["url"])
+            upstream_cache.invalidate(prefix=ZAKEN_ROOT)
+            client.retrieve("zaak", url=ZAAK["url"])
+
+        self.assertEqual(first, ZAAK)
+        self.assertEqual(second, ZAAK)
+        zaak_requests = [req for req in m.request_history if req.url == ZAAK["url"]]
+        self.assertEqual(len(zaak_requests), 2)
+
+
+@override_settings(UPSTREAM_CACHE_TIMEOUTS={"zaak": 60, "zaaktype": 3600})
+class UpstreamCacheCommandTests(TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.addCleanup(schema_fetcher.cache.clear)
+        self.addCleanup(caches["upstream"].clear)
+        self.addCleanup(identity_map.clear)
+
+    def test_list(self):
+        upstream_cache.set_response(ZAKEN_ROOT, "zaak", ZAAK["url"], ZAAK)
+        stdout = StringIO()
+
+        call_command("upstream_cache", "list", stdout=stdout)
+
+        self.assertIn(f"1  zaak  {ZAKEN_ROOT}", stdout.getvalue())
+
+    def test_invalidate_requires_selection(self):
+        with self.assertRaises(CommandError):
+            call_command("upstream_cache", "invalidate", stdout=StringIO())
+
+    def test_invalidate_resource(self):
+        upstream_cache.set_response(ZAKEN_ROOT, "zaak", ZAAK["url"], ZAAK)
+        upstream_cache.set_response(CATALOGI_ROOT, "zaaktype", ZAAKTYPE["url"], {})
+
+        call_command(
+            "upstream_cache", "invalidate", "--resource", "zaak", stdout=StringIO()
+        )
+
+        self.assertIsNone(upstream_cache.get_response(ZAAK["url"]))
+        self.assertEqual(upstream_cache.get_response(ZAAKTYPE["url"]), {})
+
+    def test_warm(self):
+        with StandInUpstreams(documents=2, document_types=1) as upstreams:
+            for api_type in ("zrc", "ztc", "drc"):
+                Service.objects.create(
+                    label=api_type,
+                    api_root=upstreams.get_api_root(api_type),
+                    api_type=api_type,
+                )
+
+            call_command(
+                "upstream_cache", "warm", upstreams.zaak_url, stdout=StringIO()
+            )
+
+        resources = {usage.resource for usage in upstream_cache.get_usage()}
+        self.assertEqual(resources, {"zaak", "zaaktype"})
+
+    def test_warm_missing_file(self):
+        with self.assertRaisesMessage(CommandError, "Could not read /nonexistent"):
+            call_command(
+                "upstream_cache", "warm", "--file", "/nonexistent", stdout=StringIO()
+            )
+
+    def test_warm_continues_after_failure(self):
+        stdout, stderr = StringIO(), StringIO()
+        with StandInUpstreams(documents=1, document_types=1) as upstreams:
+            for api_type in ("zrc", "ztc", "drc"):
+                Service.objects.create(
+                    label=api_type,
+                    api_root=upstreams.get_api_root(api_type),
+                    api_type=api_type,
+                )
+
+            with self.assertRaisesMessage(CommandError, "1 of 2 zaken"):
+                call_command(
+                    "upstream_cache",
+                    "warm",
+                    "https://unknown.example.com/zaken/1",
+                    upstreams.zaak_url,
+                    stdout=stdout,
+                    stderr=stderr,
+                )
+
+        self.assertIn("https://unknown.example.com/zaken/1: failed", stderr.getvalue())
+        self.assertIn(f"{upstreams.zaak_url}: 1 document(s)", stdout.getvalue())
+
+
+@override_settings(UPSTREAM_CACHE_TIMEOUTS={"zaak": 60})
+class ServiceAdminTests(TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.service = Service.objects.create(
+            label="Zaken API", api_root=ZAKEN_ROOT, api_type=APITypes.zrc
+        )
+        user = UserFactory.create(is_staff=True, is_superuser=True)
+        self.client.force_login(user)
+        self.addCleanup(caches["upstream"].clear)
+
+    def test_invalidate_action(self):
+        upstream_cache.set_response(ZAKEN_ROOT, "zaak", ZAAK["url"], ZAAK)
+
+        response = self.client.post(
+            reverse("admin:zgw_consumers_service_changelist"),
+            {
+                "action": "invalidate_upstream_cache",
+                "_selected_action": [self.service.pk],
+            },
+            follow=True,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Removed 1 cached response.")
+        self.assertIsNone(upstream_cache.get_response(ZAAK["url"]))
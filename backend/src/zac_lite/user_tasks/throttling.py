@@ -0,0 +1,62 @@
+"""
+Throttle the unauthenticated task-data requests.
+
+Every task-data request results in several calls to Camunda and the ZGW APIs, so
+requests exceeding the rates are rejected before any of those calls are made.
+
+The request history is kept in the ``throttling`` cache (Redis) and shared by all
+processes. The throttles are sliding windows: every request is counted for exactly
+the duration of the rate.
+"""
+import hashlib
+
+from django.core.cache import caches
+
+from rest_framework.throttling import SimpleRateThrottle
+
+from zac_lite.utils.metrics import THROTTLED_REQUESTS
+
+CACHE_ALIAS = "throttling"
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    @property
+    def cache(self):
+        return caches[CACHE_ALIAS]
+
+    def throttle_failure(self) -> bool:
+        THROTTLED_REQUESTS.labels(scope=self.scope).inc()
+        return super().throttle_failure()
+
+
+class TaskDataClientThrottle(SlidingWindowThrottle):
+    """
+    Limit the requests per client IP address.
+    """
+
+    scope = "task-data-client"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class TaskDataTaskThrottle(SlidingWindowThrottle):
+    """
+    Limit the requests per task link, regardless of the client.
+
+    The requests are counted before the token is validated, so the token is part of
+    the key: requests with invalid tokens cannot lock out the users of the valid
+    link.
+    """
+
+    scope = "task-data-task"
+
+    def get_cache_key(self, request, view):
+        link = f"{view.kwargs['tidb64']}/{view.kwargs['token']}"
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": hashlib.sha256(link.encode()).hexdigest(),
+        }
@@ -1,12 +1,49 @@
+import hashlib
+import hmac
 from datetime import date
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 from django.conf import settings
-from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.crypto import constant_time_compare
+from django.utils.encoding import force_bytes
 from django.utils.http import base36_to_int, int_to_base36
 
 from django_camunda.camunda_models import Task
 
 
+@lru_cache(maxsize=None)
+def get_hasher(key_salt: str, secret: str) -> "hmac.HMAC":
+    """
+    Return a keyed HMAC object, equivalent to
+    :func:`django.utils.crypto.salted_hmac` without a value.
+
+    The key derivation and setup only depend on the salt and secret, so they're done
+    once. Copy the returned object before updating it.
+    """
+    key = hashlib.sha1(force_bytes(key_salt + secret)).digest()
+    return hmac.new(key, digestmod=hashlib.sha1)
+
+
+@lru_cache(maxsize=None)
+def get_key_id(key_salt: str, secret: str) -> str:
+    """
+    Return the short, public identifier of the secret embedded in the tokens.
+    """
+    return hashlib.sha1(force_bytes(f"{key_salt}:key-id:{secret}")).hexdigest()[:4]
+
+
+@lru_cache(maxsize=8)
+def get_key_ring(key_salt: str, secrets: Tuple[str, ...]) -> Dict[str, str]:
+    """
+    Map the key IDs to the secrets, keeping the order of the secrets.
+    """
+    key_ring = {}
+    for secret in secrets:
+        key_ring.setdefault(get_key_id(key_salt, secret), secret)
+    return key_ring
+
+
 class ExecuteTaskTokenGenerator:
     """
     Strategy object used to generate and check tokens for the task execute mechanism.
@@ -17,7 +54,24 @@ class ExecuteTaskTokenGenerator:
     """
 
     key_salt = "zac_lite.user_tasks.tokens.ExecuteTaskTokenGenerator"
-    secret = settings.SECRET_KEY
+
+    def __init__(self, secret: str = None, secret_fallbacks: List[str] = None):
+        self._secret = secret
+        self._secret_fallbacks = secret_fallbacks
+
+    @property
+    def secret(self) -> str:
+        return self._secret or settings.SECRET_KEY
+
+    @property
+    def secret_fallbacks(self) -> List[str]:
+        if self._secret_fallbacks is None:
+            return settings.SECRET_KEY_FALLBACKS
+        return self._secret_fallbacks
+
+    @property
+    def key_ring(self) -> Dict[str, str]:
+        return get_key_ring(self.key_salt, (self.secret, *self.secret_fallbacks))
 
     def make_token(self, task: Task) -> str:
         """
@@ -32,10 +86,19 @@ class ExecuteTaskTokenGenerator:
         if not (task and token):
             return False
 
-        # parse the token
-        try:
-            ts_b36, _ = token.split("-")
-        except ValueError:
+        # parse the token - tokens without key ID were made before the key ring
+        # existed, with any of the secrets
+        bits = token.split("-")
+        if len(bits) == 3:
+            ts_b36, key_id, _ = bits
+            secret = self.key_ring.get(key_id)
+            secrets = [secret] if secret is not None else []
+            legacy = False
+        elif len(bits) == 2:
+            ts_b36, _ = bits
+            secrets = list(self.key_ring.values())
+            legacy = True
+        else:
             return False
 
         try:
@@ -43,9 +106,16 @@ class ExecuteTaskTokenGenerator:
         except ValueError:
             return False
 
-        # Check that the timestamp/uid has not been tampered with
-        valid_token = self._make_token_with_timestamp(task, ts)
-        if not constant_time_compare(valid_token, token):
+        # Check that the timestamp/uid has not been tampered with. Tokens made with a
+        # previous secret remain valid until they expire.
+        hash_value = self._make_hash_value(task, ts)
+        for secret in secrets:
+            valid_token = self._make_token_with_timestamp(
+                task, ts, secret=secret, hash_value=hash_value, legacy=legacy
+            )
+            if constant_time_compare(valid_token, token):
+                break
+        else:
             return False
 
         # Check the timestamp is within limit. Timestamps are rounded to
@@ -60,18 +130,34 @@ class ExecuteTaskTokenGenerator:
 
         return True
 
-    def _make_token_with_timestamp(self, task: Task, timestamp: int) -> str:
+    def _make_token_with_timestamp(
+        self,
+        task: Task,
+        timestamp: int,
+        secret: str = None,
+        hash_value: str = None,
+        legacy: bool = False,
+    ) -> str:
+        """
+        Make the token ``<timestamp>-<key ID>-<hash>``, or ``<timestamp>-<hash>`` for
+        ``legacy`` tokens.
+        """
+        secret = secret or self.secret
         # timestamp is number of days since 2001-1-1.  Converted to
         # base 36, this gives us a 3 digit string until about 2121
         ts_b36 = int_to_base36(timestamp)
-        hash_string = salted_hmac(
-            self.key_salt,
-            self._make_hash_value(task, timestamp),
-            secret=self.secret,
-        ).hexdigest()[
+        if hash_value is None:
+            hash_value = self._make_hash_value(task, timestamp)
+        # equivalent to salted_hmac(self.key_salt, hash_value, secret=secret)
+        hasher = get_hasher(self.key_salt, secret).copy()
+        hasher.update(hash_value.encode())
+        hash_string = hasher.hexdigest()[
             ::2
         ]  # Limit to 20 characters to shorten the URL.
-        return "%s-%s" % (ts_b36, hash_string)
+        if legacy:
+            return "%s-%s" % (ts_b36, hash_string)
+        key_id = get_key_id(self.key_salt, secret)
+        return "%s-%s-%s" % (ts_b36, key_id, hash_string)
 
     def _make_hash_value(self, task: Task, timestamp: int) -> str:
         """
@@ -96,8 +182,9 @@ class ExecuteTaskTokenGenerator:
             "suspended",
             "form_key",
         )
-        bits = (str(getattr(task, attribute) or "") for attribute in attributes)
-        return "".join(bits) + str(timestamp)
+        bits = [str(getattr(task, attribute) or "") for attribute in attributes]
+        bits.append(str(timestamp))
+        return "".join(bits)
 
     def _num_days(self, dt):
         return (dt - date(2001, 1, 1)).days
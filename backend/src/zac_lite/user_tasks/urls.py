@@ -1,6 +1,6 @@
 from django.urls import path
 
-from .views import GetTaskConfigurationView, UserLinkCreateView
+from .views import GetTaskConfigurationView, TaskDataStreamView, UserLinkCreateView
 
 urlpatterns = [
     path("user-link", UserLinkCreateView.as_view(), name="user-link-create"),
@@ -9,4 +9,9 @@ urlpatterns = [
         GetTaskConfigurationView.as_view(),
         name="task-data-detail",
     ),
+    path(
+        "task-data/<str:tidb64>/<str:token>/stream",
+        TaskDataStreamView.as_view(),
+        name="task-data-stream",
+    ),
 ]
@@ -1,3 +1,8 @@
+import logging
+from typing import Any, Dict, Iterator, Tuple
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.utils.encoding import force_str
 from django.utils.http import urlsafe_base64_decode
 from django.utils.translation import gettext_lazy as _
@@ -6,17 +11,30 @@ from django_camunda.api import get_task
 from django_camunda.camunda_models import Task
 from drf_spectacular.utils import extend_schema
 from rest_framework import exceptions, status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from zac_lite.accounts.authentication import CachedTokenAuthentication
+from zac_lite.api.renderers import EventStreamRenderer, NDJSONRenderer
 from zac_lite.api.serializers import ErrorSerializer
+from zac_lite.utils.deadline import deadline
+from zac_lite.utils.identity_map import request_scope
+from zac_lite.utils.tracing import trace
 
-from .context import get_context
+from .context import get_context, registry, stream_context
 from .data import UserTaskData, UserTaskLink
 from .permissions import TokenIsValid
-from .serializers import UserLinkSerializer, UserTaskConfigurationSerializer
+from .serializers import (
+    PART_SERIALIZERS,
+    TaskDataEventSerializer,
+    TaskSerializer,
+    UserLinkSerializer,
+    UserTaskConfigurationSerializer,
+)
+from .throttling import TaskDataClientThrottle, TaskDataTaskThrottle
+
+logger = logging.getLogger(__name__)
 
 
 class UserLinkCreateView(APIView):
@@ -29,7 +47,7 @@ class UserLinkCreateView(APIView):
     """
 
     schema_summary = _("Create task user-link")
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     serializer_class = UserLinkSerializer
 
     def post(self, request: Request) -> Response:
@@ -52,18 +70,41 @@ class GetTaskConfigurationView(APIView):
     The `tidb64` URL parameter is the base64 encoded task ID. The `token` URL parameter
     is used to validate access to the Camunda user task. Both parameter should be
     extracted from the frontend URL.
+
+    Requests are rate limited per client and per task. Exceeding a rate limit
+    results in an HTTP 429 response, with a `Retry-After` header. If the upstream
+    services do not respond in time, an HTTP 504 response is returned.
     """
 
     schema_summary = _("Retrieve user task data")
     authentication_classes = ()
     permission_classes = (TokenIsValid,)
+    throttle_classes = (TaskDataClientThrottle, TaskDataTaskThrottle)
     serializer_class = UserTaskConfigurationSerializer
 
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Trace the upstream calls and expose their timings in the response, retrieve
+        every upstream resource at most once and finish within the deadline.
+        """
+        with trace(request.path) as request_trace, request_scope(), deadline(
+            settings.TASK_DATA_DEADLINE
+        ):
+            response = super().dispatch(request, *args, **kwargs)
+        # the headers of a streamed response are sent before the upstream calls of
+        # the stream are made, so its timings would be incomplete
+        if not response.streaming:
+            response["Server-Timing"] = request_trace.as_server_timing()
+        request_trace.log()
+        return response
+
     @extend_schema(
         responses={
             200: UserTaskConfigurationSerializer,
             403: ErrorSerializer,
             404: ErrorSerializer,
+            429: ErrorSerializer,
+            504: ErrorSerializer,
         }
     )
     def get(self, request: Request, tidb64: str, token: str):
@@ -85,3 +126,76 @@ class GetTaskConfigurationView(APIView):
         # May raise a permission denied
         self.check_object_permissions(self.request, task)
         return task
+
+
+class TaskDataStreamView(GetTaskConfigurationView):
+    """
+    Stream the user task data as it is retrieved.
+
+    The task summary is sent immediately, the task context in parts as they are
+    retrieved from the upstream APIs, so the UI can render progressively for zaken
+    with many documents. The events are sent as newline delimited JSON or, with the
+    `Accept: text/event-stream` header, as server-sent events.
+
+    Requests are rate limited like the non-streaming task data. The response has no
+    `Server-Timing` header, the upstream calls made for the task context are logged
+    when the stream ends.
+    """
+
+    schema_summary = _("Stream user task data")
+    renderer_classes = (NDJSONRenderer, EventStreamRenderer)
+
+    @extend_schema(
+        responses={
+            200: TaskDataEventSerializer,
+            403: ErrorSerializer,
+            404: ErrorSerializer,
+            429: ErrorSerializer,
+            504: ErrorSerializer,
+        }
+    )
+    def get(self, request: Request, tidb64: str, token: str):
+        task = self.get_object()
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            (
+                renderer.render_event(event, data)
+                for event, data in self.get_events(task)
+            ),
+            content_type=renderer.media_type,
+        )
+        response["Cache-Control"] = "no-cache"
+        # disable the response buffering of nginx
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def get_events(self, task: Task) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        serializer_context = {"request": self.request, "view": self}
+        yield "task", {
+            "form": task.form_key,
+            "task": TaskSerializer(instance=task, context=serializer_context).data,
+        }
+
+        try:
+            # the context is built after the dispatch, outside its trace and request
+            # scope
+            with trace(f"{self.request.path} stream") as stream_trace:
+                with request_scope(), deadline(settings.TASK_DATA_DEADLINE):
+                    context_handler = registry.get(task.form_key)
+                    for part, data in stream_context(task):
+                        if part == "context" and context_handler is not None:
+                            data = context_handler.serialize(data, serializer_context)
+                        elif data is not None:
+                            data = PART_SERIALIZERS[part](
+                                instance=data, context=serializer_context
+                            ).data
+                        yield part, data
+        except Exception:
+            # the response status is sent already, report the error in the stream
+            logger.exception("Streaming the context of task %s failed", task.id)
+            yield "error", {"detail": _("The task context could not be retrieved.")}
+            return
+        finally:
+            stream_trace.log()
+
+        yield "end", {}
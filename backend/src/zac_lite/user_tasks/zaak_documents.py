@@ -1,15 +1,26 @@
+from concurrent.futures import Future, as_completed
 from dataclasses import dataclass
-from typing import Any, Dict, Iterator, List
+from typing import Any, Dict, Generator, List, Optional, Tuple
 
-from django_camunda.api import get_task_variable
 from django_camunda.camunda_models import Task
 from zgw_consumers.api_models.base import factory
-from zgw_consumers.api_models.catalogi import InformatieObjectType, ZaakType
-from zgw_consumers.api_models.documenten import Document
-from zgw_consumers.api_models.zaken import Zaak
-from zgw_consumers.concurrent import parallel
 from zgw_consumers.models import Service
 
+from zac_lite.utils.concurrent import parallel
+
+from .api_models import Document, InformatieObjectType, Zaak, ZaakType, get_fields
+from .catalogi import get_document_type
+
+ZIO_FIELDS = ("url", "informatieobject")
+
+# inclusions requested from Zaken API versions supporting ``expand``
+ZAAK_EXPAND = (
+    "zaaktype",
+    "zaaktype.informatieobjecttypen",
+    "zaakinformatieobjecten",
+    "zaakinformatieobjecten.informatieobject",
+)
+
 
 @dataclass
 class ZaakDocumentsContext:
@@ -19,83 +30,189 @@ class ZaakDocumentsContext:
     toelichtingen: str
 
 
-def get_zaak_documents_context(task: Task) -> ZaakDocumentsContext:
+def get_zaak_documents_context(
+    task: Task, variables: Dict[str, Any]
+) -> ZaakDocumentsContext:
     """
     Fetch the required information from the upstream API's to build the context.
     """
+    parts = stream_zaak_documents_context(task, variables)
+    while True:
+        try:
+            next(parts)
+        except StopIteration as stop:
+            return stop.value
+
+
+def stream_zaak_documents_context(
+    task: Task, variables: Dict[str, Any]
+) -> Generator[Tuple[str, Any], None, ZaakDocumentsContext]:
+    """
+    Build the context, yielding the parts as soon as they are retrieved.
 
-    # get the task/process variables
+    The ``zaak`` part (the zaak with its zaaktype and the toelichtingen) is yielded
+    first, followed by the ``document`` and ``documentType`` parts in order of
+    completion. Returns the complete context.
+    """
+    zaak_url = variables["zaakUrl"]
+    toelichtingen = variables["toelichtingen"]
+
+    # retrieve the Zaak & related objects
+    zaak_data, zios = get_zaak_and_zios(zaak_url)
+    zaak = factory(Zaak, zaak_data)
+    zaaktype_data = get_expanded(zaak_data, "zaaktype")
+
+    # and extract the relations from the zaak/zio responses:
+    # * get the zaaktype
+    # * get the documents
+    # * get the informatieobjecttypen
+    # Anything already included through ``expand`` is not fetched again.
+    catalogi_client = None
+    if (
+        zaaktype_data is None
+        or get_expanded(zaaktype_data, "informatieobjecttypen") is None
+    ):
+        catalogi_client = Service.get_client(zaak.zaaktype)
+        # ensure that the schema is cached on the instance
+        catalogi_client.schema
     with parallel() as executor:
-        zaak_url_future = executor.submit(get_task_variable, task.id, "zaakUrl")
-        toelichtingen_future = executor.submit(
-            get_task_variable, task.id, "toelichtingen"
+        if zaaktype_data is None:
+            zaaktype_future = executor.submit(
+                catalogi_client.retrieve,
+                "zaaktype",
+                url=zaak.zaaktype,
+                fields=get_fields(ZaakType),
+            )
+        document_futures = submit_zaak_documents(executor, zios)
+
+        if zaaktype_data is None:
+            zaaktype_data = zaaktype_future.result()
+        zaak.zaaktype = factory(ZaakType, zaaktype_data)
+        yield "zaak", {"zaak": zaak, "toelichtingen": toelichtingen}
+
+        document_type_futures = submit_document_types(
+            executor, catalogi_client, zaaktype_data
         )
+        parts = {
+            **{future: "document" for future in document_futures},
+            **{future: "documentType" for future in document_type_futures},
+        }
+        for future in as_completed(parts):
+            yield parts[future], future.result()
+
+    return ZaakDocumentsContext(
+        zaak=zaak,
+        documents=[future.result() for future in document_futures],
+        document_types=[future.result() for future in document_type_futures],
+        toelichtingen=toelichtingen,
+    )
 
-        zaak_url = zaak_url_future.result()
-        toelichtingen = toelichtingen_future.result()
 
-    # next - retrieve the Zaak & related objects
+def get_zaak_and_zios(zaak_url: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
     zaken_client = Service.get_client(zaak_url)
     assert zaken_client is not None, f"Could not determine client for URL {zaak_url}"
     # ensure the schema is cached on the client before entering threads
     zaken_client.schema
+    if zaken_client.supports_query_param("zaak_read", "expand"):
+        return get_expanded_zaak(zaken_client, zaak_url)
+
     with parallel() as executor:
-        zaak_future = executor.submit(zaken_client.retrieve, "zaak", url=zaak_url)
-        zios_future = executor.submit(
-            zaken_client.list, "zaakinformatieobject", query_params={"zaak": zaak_url}
+        zaak_future = executor.submit(
+            zaken_client.retrieve, "zaak", url=zaak_url, fields=get_fields(Zaak)
         )
+        zios_future = executor.submit(get_zios, zaken_client, zaak_url)
+        return zaak_future.result(), zios_future.result()
 
-        zaak = factory(Zaak, zaak_future.result())
-        zios = zios_future.result()
 
-    # and extract the relations from the zaak/zio responses:
-    # * get the zaaktype
-    # * get the documents
-    catalogi_client = Service.get_client(zaak.zaaktype)
-    # ensure that the schema is cached on the instance
-    catalogi_client.schema
-    with parallel() as executor:
-        zaaktype_future = executor.submit(
-            catalogi_client.retrieve, "zaaktype", url=zaak.zaaktype
-        )
-        documents = get_zaak_documents(executor, zios)
+def get_cache_tags(context: ZaakDocumentsContext) -> List[str]:
+    """
+    Return the URLs of the resources the context was built from.
 
-        zaak.zaaktype = factory(ZaakType, zaaktype_future.result())
+    Changes to the zaakinformatieobjecten are notified with the zaak as main object,
+    so the zaak URL covers the documents being (un)related.
+    """
+    return [
+        context.zaak.url,
+        context.zaak.zaaktype.url,
+        *[document.url for document in context.documents],
+        *[document_type.url for document_type in context.document_types],
+    ]
 
-    # finally, fetch the informatieobjecttypen
-    iot_urls = zaak.zaaktype.informatieobjecttypen
-    with parallel() as executor:
-        iots: Iterator[dict] = executor.map(
-            lambda url: catalogi_client.retrieve("informatieobjecttype", url=url),
-            iot_urls,
-        )
-    document_types = factory(InformatieObjectType, list(iots))
 
-    return ZaakDocumentsContext(
-        zaak=zaak,
-        documents=list(documents),
-        document_types=document_types,
-        toelichtingen=toelichtingen,
+def get_expanded(data: Dict[str, Any], field: str) -> Optional[Any]:
+    """
+    Extract the inclusion of a related resource from an ``expand`` response.
+    """
+    return (data.get("_expand") or {}).get(field)
+
+
+def get_zios(zaken_client, zaak_url: str) -> List[Dict[str, Any]]:
+    return zaken_client.list(
+        "zaakinformatieobject", query_params={"zaak": zaak_url}, fields=ZIO_FIELDS
+    )
+
+
+def get_expanded_zaak(
+    zaken_client, zaak_url: str
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Retrieve the zaak with the zaaktype, zaakinformatieobjecten and their
+    (informatie)objecten included in a single call.
+
+    The upstream API decides which inclusions it honours - the zaakinformatieobjecten
+    are fetched separately if they were not included.
+    """
+    zaak_data = zaken_client.retrieve(
+        "zaak",
+        url=zaak_url,
+        request_kwargs={"params": {"expand": ",".join(ZAAK_EXPAND)}},
     )
+    zios = get_expanded(zaak_data, "zaakinformatieobjecten")
+    if zios is None:
+        zios = get_zios(zaken_client, zaak_url)
+    return zaak_data, zios
+
 
+def submit_zaak_documents(
+    executor, zios: List[Dict[str, Any]]
+) -> List["Future[Document]"]:
+    """
+    Submit the retrieval of the documents, returning a future per zio.
 
-def get_zaak_documents(executor, zios: List[Dict[str, Any]]) -> Iterator[Document]:
+    Zaakinformatieobjecten relating the same document share the future, so every
+    document is retrieved once.
+    """
     document_clients = []
-    io_and_clients = []
+    io_and_clients: Dict[str, tuple] = {}
     for zio in zios:
         io = zio["informatieobject"]
+        if io in io_and_clients:
+            continue
+
+        expanded_io = get_expanded(zio, "informatieobject")
+        if expanded_io is not None:
+            io_and_clients[io] = (expanded_io, None)
+            continue
+
         for client in document_clients:
             if io.startswith(client.base_url):
-                io_and_clients.append((io, client))
+                io_and_clients[io] = (io, client)
                 break
         else:
             client = Service.get_client(io)
-            io_and_clients.append((io, client))
+            io_and_clients[io] = (io, client)
             document_clients.append(client)
 
     def _retrieve_document(io_and_client: tuple) -> Document:
-        url, client = io_and_client
-        doc_data = client.retrieve("enkelvoudiginformatieobject", url=url)
+        io, client = io_and_client
+        if client is None:  # already included through expand
+            return factory(Document, io)
+        doc_data = client.retrieve(
+            "enkelvoudiginformatieobject",
+            url=io,
+            fields=get_fields(Document),
+            hedge=True,
+        )
         return factory(Document, doc_data)
 
     # make sure that all the API specs are fetched _before_ entering threads
@@ -103,4 +220,34 @@ def get_zaak_documents(executor, zios: List[Dict[str, Any]]) -> Iterator[Documen
     with parallel() as _nested_executor:
         _nested_executor.map(lambda client: client.schema, document_clients)
 
-    return executor.map(_retrieve_document, io_and_clients)
+    futures = {
+        io: executor.submit(_retrieve_document, io_and_client)
+        for io, io_and_client in io_and_clients.items()
+    }
+    return [futures[zio["informatieobject"]] for zio in zios]
+
+
+def submit_document_types(
+    executor, catalogi_client, zaaktype_data: Dict[str, Any]
+) -> List["Future[InformatieObjectType]"]:
+    expanded_iots = {
+        iot["url"]: iot
+        for iot in (get_expanded(zaaktype_data, "informatieobjecttypen") or [])
+    }
+    # the expansion may be partial
+    missing = set(zaaktype_data["informatieobjecttypen"]) - set(expanded_iots)
+    if missing and catalogi_client is None:
+        catalogi_client = Service.get_client(zaaktype_data["url"])
+        # ensure that the schema is cached on the instance before entering threads
+        catalogi_client.schema
+
+    def _retrieve_document_type(url: str) -> InformatieObjectType:
+        iot_data = expanded_iots.get(url) or get_document_type(
+            catalogi_client, zaaktype_data.get("catalogus"), url
+        )
+        return factory(InformatieObjectType, iot_data)
+
+    return [
+        executor.submit(_retrieve_document_type, url)
+        for url in zaaktype_data["informatieobjecttypen"]
+    ]
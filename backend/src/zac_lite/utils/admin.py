@@ -0,0 +1,55 @@
+from django.contrib import admin, messages
+from django.utils.translation import gettext_lazy as _, ngettext
+
+from zgw_consumers.admin import ServiceAdmin
+from zgw_consumers.models import Service
+
+from zac_lite import upstream_cache
+
+admin.site.unregister(Service)
+
+
+@admin.register(Service)
+class _ServiceAdmin(ServiceAdmin):
+    actions = ["show_upstream_cache_usage", "invalidate_upstream_cache"]
+
+    def show_upstream_cache_usage(self, request, queryset):
+        api_roots = [service.api_root for service in queryset]
+        usage = [
+            usage
+            for usage in upstream_cache.get_usage()
+            if any(usage.api_root.startswith(api_root) for api_root in api_roots)
+        ]
+        if not usage:
+            self.message_user(request, _("No cached responses."))
+        for item in usage:
+            self.message_user(
+                request,
+                ngettext(
+                    "{api_root}: {entries} cached {resource}",
+                    "{api_root}: {entries} cached {resource} responses",
+                    item.entries,
+                ).format(
+                    api_root=item.api_root,
+                    entries=item.entries,
+                    resource=item.resource,
+                ),
+            )
+
+    show_upstream_cache_usage.short_description = _("Show cached responses")
+
+    def invalidate_upstream_cache(self, request, queryset):
+        removed = sum(
+            upstream_cache.invalidate(prefix=service.api_root) for service in queryset
+        )
+        self.message_user(
+            request,
+            ngettext(
+                "Removed {count} cached response.",
+                "Removed {count} cached responses.",
+                removed,
+            ).format(count=removed),
+            messages.SUCCESS,
+        )
+
+    invalidate_upstream_cache.short_description = _("Invalidate cached responses")
@@ -5,4 +5,6 @@ class UtilsConfig(AppConfig):
     name = "zac_lite.utils"
 
     def ready(self):
-        from . import checks  # noqa
+        from . import checks, solo  # noqa
+
+        solo.install()
@@ -0,0 +1,156 @@
+"""
+Keep indexes of cache entries, safe for concurrent processes.
+
+An index is a set of string members stored in a cache. Every member expires on its
+own, and the index expires with its last member.
+
+With django-redis, an index is a sorted set with the expiry time of the members as
+score. Members are added atomically, so concurrent processes do not lose each
+other's members, and the expired members are pruned on every addition. Other cache
+backends are assumed to be local to the process, like the ``LocMemCache`` in
+development: the index is stored as a dict, updated under a process lock.
+"""
+import logging
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple
+
+from django.core.cache import caches
+
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1]: the index, ARGV: member, expiry timestamp, now, timeout in seconds
+ADD_SCRIPT = """
+redis.call("ZADD", KEYS[1], ARGV[2], ARGV[1])
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", ARGV[3])
+if redis.call("TTL", KEYS[1]) < tonumber(ARGV[4]) then
+    redis.call("EXPIRE", KEYS[1], ARGV[4])
+end
+"""
+
+_lock = threading.Lock()
+
+
+class RedisIndex:
+    def __init__(self, cache):
+        self.cache = cache
+        self.client = cache.client.get_client(write=True)
+
+    def handle_error(self) -> None:
+        """
+        Like the cache, ignore the Redis errors if configured.
+        """
+        if not getattr(self.cache, "_ignore_exceptions", False):
+            raise
+        logger.warning("Could not access the cache index", exc_info=True)
+
+    def add(self, entries: Iterable[Tuple[str, str]], timeout: float) -> None:
+        """
+        Add the ``(index key, member)`` entries, expiring after ``timeout`` seconds.
+        """
+        now = time.time()
+        script = self.client.register_script(ADD_SCRIPT)
+        pipe = self.client.pipeline(transaction=False)
+        for key, member in entries:
+            script(
+                keys=[self.cache.make_key(key)],
+                args=[member, now + timeout, now, math.ceil(timeout)],
+                client=pipe,
+            )
+        try:
+            pipe.execute()
+        except RedisError:
+            self.handle_error()
+
+    def members(self, key: str) -> List[str]:
+        try:
+            members = self.client.zrangebyscore(
+                self.cache.make_key(key), f"({time.time()}", "+inf"
+            )
+        except RedisError:
+            self.handle_error()
+            return []
+        return [member.decode() for member in members]
+
+    def remove(self, key: str, members: Iterable[str]) -> None:
+        members = list(members)
+        if not members:
+            return
+        try:
+            self.client.zrem(self.cache.make_key(key), *members)
+        except RedisError:
+            self.handle_error()
+
+    def pop(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Remove the indexes, returning their members.
+        """
+        keys = list(keys)
+        now = time.time()
+        pipe = self.client.pipeline(transaction=True)
+        for key in keys:
+            pipe.zrangebyscore(self.cache.make_key(key), f"({now}", "+inf")
+            pipe.delete(self.cache.make_key(key))
+        try:
+            results = pipe.execute()
+        except RedisError:
+            self.handle_error()
+            return {}
+        return {
+            key: [member.decode() for member in members]
+            for key, members in zip(keys, results[::2])
+        }
+
+
+class LocalIndex:
+    def __init__(self, cache):
+        self.cache = cache
+
+    def add(self, entries: Iterable[Tuple[str, str]], timeout: float) -> None:
+        now = time.time()
+        with _lock:
+            for key, member in entries:
+                index = {
+                    member: expires
+                    for member, expires in (self.cache.get(key) or {}).items()
+                    if expires > now
+                }
+                index[member] = now + timeout
+                self.cache.set(key, index, timeout=max(index.values()) - now)
+
+    def members(self, key: str) -> List[str]:
+        now = time.time()
+        index = self.cache.get(key) or {}
+        return [member for member, expires in index.items() if expires > now]
+
+    def remove(self, key: str, members: Iterable[str]) -> None:
+        with _lock:
+            index = self.cache.get(key)
+            if not index:
+                return
+            for member in members:
+                index.pop(member, None)
+            if index:
+                self.cache.set(key, index, timeout=max(index.values()) - time.time())
+            else:
+                self.cache.delete(key)
+
+    def pop(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        keys = list(keys)
+        with _lock:
+            members = {key: self.members(key) for key in keys}
+            self.cache.delete_many(keys)
+        return members
+
+
+def get_index(alias: str):
+    """
+    Return the index for the cache.
+    """
+    cache = caches[alias]
+    if hasattr(getattr(cache, "client", None), "get_client"):
+        return RedisIndex(cache)
+    return LocalIndex(cache)
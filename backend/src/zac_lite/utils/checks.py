@@ -1,4 +1,8 @@
+import hashlib
+import json
 import os
+import tempfile
+from typing import Dict, List, Optional, Tuple
 
 from django.conf import settings
 from django.core.checks import Error, Warning, register
@@ -45,34 +49,114 @@ def check_modelform_exclude(app_configs, **kwargs):
     return errors
 
 
-@register
-def check_missing_init_files(app_configs, **kwargs):
+# directories that never contain Python packages, not worth walking through
+NON_PYTHON_DIRS = {
+    "__pycache__",
+    "fixtures",
+    "js",
+    "jstests",
+    "locale",
+    "media",
+    "node_modules",
+    "scss",
+    "static",
+    "templates",
+}
+
+
+def get_cache_path(root: str) -> str:
     """
-    Check that all packages have __init__.py files.
+    Return the path of the file caching the result of the scan of the project.
 
-    If they don't, the code will still run, but tests aren't picked up by the
-    test runner, for example.
+    The file outlives the process, so consecutive ``manage.py`` commands share it.
     """
-    errors = []
+    digest = hashlib.sha256(root.encode()).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"zac_lite-init-files-{digest}.json")
 
-    for dirpath, dirnames, filenames in os.walk(settings.DJANGO_PROJECT_DIR):
-        dirname = os.path.split(dirpath)[1]
-        if dirname == "__pycache__":
-            continue
+
+def read_cache(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r") as infile:
+            return json.load(infile)
+    except (OSError, ValueError):
+        return None
+
+
+def write_cache(path: str, data: dict) -> None:
+    # write to a temporary file first, so concurrent processes never read half a file
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w") as outfile:
+            json.dump(data, outfile)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def find_missing_init_files(root: str) -> Tuple[Dict[str, float], List[str]]:
+    """
+    Find the directories with Python files but without ``__init__.py`` file.
+
+    Return the modification time of every directory walked through, and the
+    directories missing the ``__init__.py`` file.
+    """
+    mtimes, missing = {}, []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [
+            dirname
+            for dirname in dirnames
+            if dirname not in NON_PYTHON_DIRS and not dirname.startswith(".")
+        ]
+        mtimes[dirpath] = os.stat(dirpath).st_mtime
 
         if "__init__.py" in filenames:
             continue
+        if any(filename.endswith(".py") for filename in filenames):
+            missing.append(dirpath)
+    return mtimes, missing
 
-        extensions = [os.path.splitext(fn)[1] for fn in filenames]
-        if ".py" not in extensions:
-            continue
 
-        errors.append(
-            Warning(
-                "Directory %s does not contain an `__init__.py` file",
-                hint="Consider adding this module to make sure tests are picked up",
-                id="utils.W001",
-            )
-        )
+def is_unchanged(mtimes: Dict[str, float]) -> bool:
+    """
+    Check that no directory changed since the modification times were recorded.
 
-    return errors
+    Adding, removing or renaming a file or directory updates the modification time
+    of its parent directory, so only the recorded directories need a look.
+    """
+    try:
+        return all(os.stat(path).st_mtime == mtime for path, mtime in mtimes.items())
+    except OSError:  # removed
+        return False
+
+
+@register
+def check_missing_init_files(app_configs, **kwargs):
+    """
+    Check that all packages have __init__.py files.
+
+    If they don't, the code will still run, but tests aren't picked up by the
+    test runner, for example.
+
+    The result is cached in a file until a directory in the project changes, so the
+    project tree is not walked through on every start-up.
+    """
+    if not settings.CHECK_MISSING_INIT_FILES:
+        return []
+
+    root = settings.DJANGO_PROJECT_DIR
+    cache_path = get_cache_path(root)
+    cached = read_cache(cache_path)
+    if cached and cached.get("root") == root and is_unchanged(cached["mtimes"]):
+        missing = cached["missing"]
+    else:
+        mtimes, missing = find_missing_init_files(root)
+        write_cache(cache_path, {"root": root, "mtimes": mtimes, "missing": missing})
+
+    return [
+        Warning(
+            "Directory %s does not contain an `__init__.py` file" % dirpath,
+            hint="Consider adding this module to make sure tests are picked up",
+            id="utils.W001",
+        )
+        for dirpath in missing
+    ]
@@ -0,0 +1,79 @@
+"""
+Run the submitted callables in the execution context of the submitting thread.
+
+Context variables, like the request trace and deadline, are not inherited by the
+worker threads of a :class:`concurrent.futures.ThreadPoolExecutor`.
+"""
+import contextvars
+import functools
+
+from django.conf import settings
+
+from zgw_consumers.concurrent import parallel as _parallel
+
+from . import deadline
+from .metrics import THREAD_POOL_ACTIVE, THREAD_POOL_QUEUED
+
+
+def track(fn):
+    """
+    Track the submitted callable in the thread pool gauges.
+    """
+    THREAD_POOL_QUEUED.inc()
+
+    @functools.wraps(fn)
+    def wrapped(*args, **kwargs):
+        THREAD_POOL_QUEUED.dec()
+        with THREAD_POOL_ACTIVE.track_inprogress():
+            return fn(*args, **kwargs)
+
+    return wrapped
+
+
+def before_deadline(fn):
+    """
+    Skip the submitted callable if the deadline passed while it was queued.
+    """
+
+    @functools.wraps(fn)
+    def wrapped(*args, **kwargs):
+        deadline.check()
+        return fn(*args, **kwargs)
+
+    return wrapped
+
+
+class parallel(_parallel):
+    def __init__(self, **kwargs):
+        kwargs.setdefault("max_workers", settings.PARALLEL_MAX_WORKERS)
+        super().__init__(**kwargs)
+        self.futures = []
+
+    def submit(*args, **kwargs):
+        if len(args) >= 2:
+            self, fn, *args = args
+        else:
+            self, *args = args
+            fn = kwargs.pop("fn")
+
+        context = contextvars.copy_context()
+        future = super(parallel, self).submit(
+            track(context.run), before_deadline(fn), *args, **kwargs
+        )
+        self.futures.append(future)
+        return future
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1):
+        # submit every call separately, as a context can only be entered by one
+        # thread at a time
+        futures = [self.submit(fn, *args) for args in zip(*iterables)]
+        return (future.result(timeout=timeout) for future in futures)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # on errors, like an exceeded deadline, free the workers for other requests
+        if exc_type is not None:
+            for future in self.futures:
+                # cancelled callables never start, so never leave the queue
+                if future.cancel():
+                    THREAD_POOL_QUEUED.dec()
+        return super().__exit__(exc_type, exc_val, exc_tb)
@@ -0,0 +1,75 @@
+"""
+Limit the time spent on the upstream calls of a request.
+
+Within a :func:`deadline`, the upstream clients derive the timeout of every call
+from the remaining time, see :func:`get_timeout`. Once the deadline has passed,
+:class:`DeadlineExceeded` is raised instead of starting new work. The deadline is
+propagated to the worker threads of :class:`zac_lite.utils.concurrent.parallel`.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import exceptions, status
+
+from .metrics import DEADLINES_EXCEEDED
+
+# the time.monotonic() deadline of the current request
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+
+class DeadlineExceeded(exceptions.APIException):
+    status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    default_detail = _("The upstream services did not respond in time.")
+    default_code = "deadline_exceeded"
+
+
+@contextmanager
+def deadline(seconds: Optional[float]):
+    """
+    Finish the upstream calls within ``seconds``, or within an enclosing deadline.
+    """
+    current = _deadline.get()
+    new = time.monotonic() + seconds if seconds else None
+    if current is not None and (new is None or current < new):
+        new = current
+    token = _deadline.set(new)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """
+    Return the number of seconds left, or ``None`` outside a deadline.
+    """
+    current = _deadline.get()
+    return None if current is None else current - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check() -> None:
+    """
+    Raise :class:`DeadlineExceeded` if the deadline has passed.
+    """
+    if expired():
+        DEADLINES_EXCEEDED.inc()
+        raise DeadlineExceeded()
+
+
+def get_timeout() -> Optional[float]:
+    """
+    Return the timeout for an upstream call, the time left before the deadline.
+    """
+    check()
+    return remaining()
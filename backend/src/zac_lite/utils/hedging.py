@@ -0,0 +1,155 @@
+"""
+Hedge slow upstream calls.
+
+A call taking longer than the observed 95th percentile of its service is duplicated,
+and the first answer wins. The latencies are observed per service over the last
+``WINDOW`` calls; until ``MIN_SAMPLES`` calls are observed, nothing is hedged.
+
+Hedging adds load to the upstream services, so the duplicates are limited by a
+budget shared by the process: every call adds ``settings.HEDGE_BUDGET`` to the
+budget, every duplicate takes one, up to ``MAX_TOKENS`` duplicates in a burst.
+
+The attempts run in a thread pool of the process, so the losing attempt does not
+delay the response. The pool runs the attempts in the execution context of the
+caller, so the request trace and deadline apply.
+"""
+import contextvars
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from typing import Callable, Deque, Dict, Optional, TypeVar
+
+from django.conf import settings
+
+from zgw_consumers.concurrent import wrap_fn
+
+from .concurrent import track
+from .metrics import HEDGED_REQUESTS
+
+T = TypeVar("T")
+
+PERCENTILE = 0.95
+WINDOW = 200
+MIN_SAMPLES = 20
+# the threshold is computed again after this many observations
+RECOMPUTE_EVERY = 10
+MAX_TOKENS = 10
+
+
+class Latencies:
+    def __init__(self):
+        self._samples: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=WINDOW)
+        )
+        self._observed: Dict[str, int] = defaultdict(int)
+        self._thresholds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, service: str, duration: float) -> None:
+        with self._lock:
+            samples = self._samples[service]
+            samples.append(duration)
+            self._observed[service] += 1
+            if len(samples) >= MIN_SAMPLES and (
+                service not in self._thresholds
+                or self._observed[service] % RECOMPUTE_EVERY == 0
+            ):
+                ordered = sorted(samples)
+                index = math.ceil(PERCENTILE * len(ordered)) - 1
+                self._thresholds[service] = ordered[index]
+
+    def get_threshold(self, service: str) -> Optional[float]:
+        """
+        Return the duration after which a call is hedged, in seconds.
+        """
+        return self._thresholds.get(service)
+
+
+class Budget:
+    def __init__(self):
+        self._tokens = float(MAX_TOKENS)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(MAX_TOKENS, self._tokens + settings.HEDGE_BUDGET)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+_latencies = Latencies()
+_budget = Budget()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.HEDGE_MAX_WORKERS, thread_name_prefix="hedge"
+                )
+    return _executor
+
+
+def timed(latencies: Latencies, service: str, fn: Callable[[], T]) -> T:
+    start = time.monotonic()
+    result = fn()
+    latencies.observe(service, time.monotonic() - start)
+    return result
+
+
+def submit(latencies: Latencies, service: str, fn: Callable[[], T]) -> "Future[T]":
+    context = contextvars.copy_context()
+    return get_executor().submit(
+        track(wrap_fn(context.run)), timed, latencies, service, fn
+    )
+
+
+def call(service: str, fn: Callable[[], T]) -> T:
+    """
+    Call ``fn``, and call it again if it is slower than usual for the service.
+    """
+    if not settings.HEDGE_REQUESTS:
+        return fn()
+
+    # a losing attempt may finish after clear()
+    latencies, budget = _latencies, _budget
+    budget.deposit()
+    threshold = latencies.get_threshold(service)
+    if threshold is None:
+        return timed(latencies, service, fn)
+
+    primary = submit(latencies, service, fn)
+    done, _ = wait([primary], timeout=threshold)
+    if done:
+        return primary.result()
+
+    if not budget.withdraw():
+        HEDGED_REQUESTS.labels(service=service, result="no_budget").inc()
+        return primary.result()
+
+    hedge = submit(latencies, service, fn)
+    for future in as_completed([primary, hedge]):
+        # the first successful answer wins
+        if future.exception() is None:
+            HEDGED_REQUESTS.labels(
+                service=service, result="won" if future is hedge else "lost"
+            ).inc()
+            return future.result()
+    return primary.result()
+
+
+def clear() -> None:
+    global _latencies, _budget
+    _latencies = Latencies()
+    _budget = Budget()
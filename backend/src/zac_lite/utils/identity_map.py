@@ -0,0 +1,130 @@
+"""
+Fetch every upstream resource at most once per request.
+
+Within a :func:`request_scope`, the results of :func:`fetch` are kept per key, so
+a resource referenced multiple times is only fetched once. The scope is propagated
+to the worker threads of :class:`zac_lite.utils.concurrent.parallel`.
+
+Across requests, concurrent fetches of the same key share a single upstream call
+and its result is memoized for ``settings.UPSTREAM_MEMO_TIMEOUT`` seconds. Failed
+fetches are not memoized: the requests waiting for a failed fetch of another
+request fetch the key themselves, so they never get the errors of another request,
+e.g. its :class:`zac_lite.utils.deadline.DeadlineExceeded`. Waiting is bounded by
+the deadline of the waiting request.
+
+The results are shared, so they must be treated as read-only.
+"""
+import contextvars
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Optional, Tuple, TypeVar
+
+from django.conf import settings
+
+from . import deadline
+
+T = TypeVar("T")
+
+# prune the expired memo entries once the memo holds this many
+MEMO_PRUNE_SIZE = 1000
+
+_identity_map: contextvars.ContextVar[
+    Optional[Dict[str, Future]]
+] = contextvars.ContextVar("identity_map", default=None)
+
+# key -> (expiry timestamp, future)
+_memo: Dict[str, Tuple[float, Future]] = {}
+_lock = threading.Lock()
+
+
+@contextmanager
+def request_scope():
+    token = _identity_map.set({})
+    try:
+        yield
+    finally:
+        _identity_map.reset(token)
+
+
+def _get_memoized(key: str, now: float) -> Optional[Future]:
+    expires, future = _memo.get(key, (0, None))
+    return future if expires > now else None
+
+
+def _memoize(key: str, future: Future, now: float) -> None:
+    if len(_memo) >= MEMO_PRUNE_SIZE:
+        for expired in [key for key, (expires, _) in _memo.items() if expires <= now]:
+            del _memo[expired]
+    _memo[key] = (now + settings.UPSTREAM_MEMO_TIMEOUT, future)
+
+
+def fetch(key: str, fetch_func: Callable[[], T]) -> T:
+    """
+    Return the result of ``fetch_func``, or of the previous fetch with the same key.
+    """
+    identity_map = _identity_map.get()
+    if identity_map is None and not settings.UPSTREAM_MEMO_TIMEOUT:
+        return fetch_func()
+
+    while True:
+        now = time.monotonic()
+        with _lock:
+            future = identity_map.get(key) if identity_map is not None else None
+            # shared with another request
+            shared = False
+            if future is None and settings.UPSTREAM_MEMO_TIMEOUT:
+                future = _get_memoized(key, now)
+                shared = future is not None
+
+            owner = future is None
+            if owner:
+                future = Future()
+                if settings.UPSTREAM_MEMO_TIMEOUT:
+                    _memoize(key, future, now)
+            if identity_map is not None:
+                identity_map[key] = future
+
+        if owner:
+            break
+
+        try:
+            return future.result(timeout=deadline.remaining())
+        except Exception:
+            if not future.done():  # the deadline of this request passed
+                deadline.check()
+                raise
+            if not shared:
+                raise
+        # the fetch of the other request failed, fetch the key for this request
+        with _lock:
+            if identity_map is not None and identity_map.get(key) is future:
+                del identity_map[key]
+
+    try:
+        result = fetch_func()
+    except BaseException as exc:
+        with _lock:
+            if _memo.get(key, (0, None))[1] is future:
+                del _memo[key]
+            if identity_map is not None:
+                identity_map.pop(key, None)
+        future.set_exception(exc)
+        raise
+    future.set_result(result)
+    return result
+
+
+def forget(keys: Iterable[str]) -> None:
+    """
+    Remove the memoized results of the keys, in this process.
+    """
+    with _lock:
+        for key in keys:
+            _memo.pop(key, None)
+
+
+def clear() -> None:
+    with _lock:
+        _memo.clear()
@@ -0,0 +1,130 @@
+"""
+Encode and decode JSON with the backend configured in ``settings.JSON_BACKEND``.
+
+``orjson`` and ``ujson`` are optional dependencies, several times faster than the
+standard library ``json`` for the large upstream responses and task contexts. If the
+configured backend is not installed, the standard library is used.
+
+The output is equivalent to the output of the DRF JSON renderer: values the backend
+does not support natively, including dates and times, are encoded with
+:class:`rest_framework.utils.encoders.JSONEncoder`.
+"""
+import json
+import logging
+from functools import lru_cache, partial
+from importlib.util import find_spec
+from typing import Any, List, Union
+
+from django.conf import settings
+
+from rest_framework.utils.encoders import JSONEncoder
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("orjson", "ujson", "json")
+
+
+class Backend:
+    """
+    The standard library ``json``.
+    """
+
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(
+            obj,
+            cls=JSONEncoder,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+class OrjsonBackend(Backend):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self.loads = orjson.loads
+        # encode the dates and times like DRF, instead of in full precision
+        self._dumps = partial(
+            orjson.dumps,
+            default=JSONEncoder().default,
+            option=(
+                orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS
+            ),
+        )
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(obj)
+
+
+class UjsonBackend(Backend):
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self.loads = ujson.loads
+        self._dumps = partial(
+            ujson.dumps,
+            default=JSONEncoder().default,
+            ensure_ascii=False,
+            escape_forward_slashes=False,
+        )
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(obj).encode("utf-8")
+
+
+BACKEND_CLASSES = {
+    backend_class.name: backend_class
+    for backend_class in (OrjsonBackend, UjsonBackend, Backend)
+}
+
+
+@lru_cache(maxsize=None)
+def load_backend(name: str) -> Backend:
+    if name not in BACKEND_CLASSES:
+        raise ValueError(f"Unknown JSON backend '{name}', choose from {BACKENDS}")
+    try:
+        return BACKEND_CLASSES[name]()
+    except ImportError:
+        logger.warning("JSON backend '%s' is not installed, using 'json'", name)
+        return Backend()
+
+
+def get_backend(name: str = "") -> Backend:
+    return load_backend(name or settings.JSON_BACKEND)
+
+
+def get_available_backends() -> List[Backend]:
+    """
+    Return the installed backends.
+    """
+    return [load_backend(name) for name in BACKENDS if find_spec(name) is not None]
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    return get_backend().loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    return get_backend().dumps(obj)
+
+
+def decode_response(response, *args, **kwargs) -> None:
+    """
+    Response hook for :mod:`requests`, decoding ``response.json()`` with the backend.
+    """
+    backend = get_backend()
+    if backend.name != Backend.name:
+        # zds_client and django_camunda both call response.json()
+        response.json = lambda **kwargs: backend.loads(response.content)
@@ -0,0 +1,41 @@
+import os
+
+from django.core.management import BaseCommand
+
+from ...startup import profile_checks, profile_imports
+
+
+class Command(BaseCommand):
+    help = "Report the time spent on importing modules and running the system checks"
+    # the checks are run and timed by the command itself
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Number of packages and checks to report",
+        )
+        parser.add_argument(
+            "--deploy",
+            action="store_true",
+            help="Include the deployment checks",
+        )
+
+    def handle(self, **options):
+        limit = options["limit"]
+        settings_module = os.environ["DJANGO_SETTINGS_MODULE"]
+
+        duration, imports = profile_imports(settings_module)
+        self.stdout.write(f"django.setup() with {settings_module}: {duration:.3f}s")
+        self.stdout.write(f"Import time per package ({sum(imports.values()):.3f}s):")
+        ranked = sorted(imports.items(), key=lambda item: item[1], reverse=True)
+        for package, seconds in ranked[:limit]:
+            self.stdout.write(f"  {seconds * 1000:9.1f}ms  {package}")
+
+        checks = profile_checks(include_deployment_checks=options["deploy"])
+        total = sum(seconds for _, seconds in checks)
+        self.stdout.write(f"System checks ({total:.3f}s):")
+        for name, seconds in checks[:limit]:
+            self.stdout.write(f"  {seconds * 1000:9.1f}ms  {name}")
@@ -0,0 +1,99 @@
+"""
+Prometheus metrics of the application.
+
+With multiple (uWSGI) worker processes, set the ``PROMETHEUS_MULTIPROC_DIR``
+environment variable to a writable, empty directory before the workers start. The
+samples of all workers are then aggregated when the metrics are scraped. The WSGI
+module removes the live gauge samples of a worker when it exits, so a replaced
+worker's queued and active tasks are not reported forever.
+"""
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+UPSTREAM_LATENCY = Histogram(
+    "zac_lite_upstream_request_duration_seconds",
+    "Duration of the calls to upstream services.",
+    ["service"],
+)
+
+ENDPOINT_LATENCY = Histogram(
+    "zac_lite_endpoint_duration_seconds",
+    "Duration of the requests handled, per URL name.",
+    ["endpoint", "method", "status"],
+)
+
+CACHE_REQUESTS = Counter(
+    "zac_lite_cache_requests_total",
+    "Cache lookups, by outcome.",
+    ["cache", "result"],
+)
+
+THROTTLED_REQUESTS = Counter(
+    "zac_lite_throttled_requests_total",
+    "Requests rejected because a rate limit was exceeded, per throttle scope.",
+    ["scope"],
+)
+
+NOTIFICATIONS_RECEIVED = Counter(
+    "zac_lite_notifications_received_total",
+    "Notifications received from the Notificaties API, per channel.",
+    ["kanaal"],
+)
+
+HEDGED_REQUESTS = Counter(
+    "zac_lite_hedged_requests_total",
+    "Slow upstream calls that were duplicated, per service and by outcome: the "
+    "duplicate won or lost, or was not sent for lack of budget.",
+    ["service", "result"],
+)
+
+DEADLINES_EXCEEDED = Counter(
+    "zac_lite_deadlines_exceeded_total",
+    "Upstream calls not started or aborted because the request deadline passed.",
+)
+
+THREAD_POOL_QUEUED = Gauge(
+    "zac_lite_thread_pool_queued_tasks",
+    "Tasks submitted to the thread pools that are waiting for a worker.",
+    multiprocess_mode="livesum",
+)
+
+THREAD_POOL_ACTIVE = Gauge(
+    "zac_lite_thread_pool_active_tasks",
+    "Tasks being executed by the thread pool workers.",
+    multiprocess_mode="livesum",
+)
+
+
+def get_registry() -> CollectorRegistry:
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def mark_process_dead() -> None:
+    """
+    Remove the live gauge samples of the current process, when it exits.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def export() -> bytes:
+    """
+    Render the current samples in the Prometheus text format.
+    """
+    return generate_latest(get_registry())
@@ -0,0 +1,26 @@
+import time
+
+from .metrics import ENDPOINT_LATENCY
+
+
+class EndpointMetricsMiddleware:
+    """
+    Observe the duration of every request resolved to a named URL pattern.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        resolver_match = request.resolver_match
+        if resolver_match is not None and resolver_match.url_name:
+            ENDPOINT_LATENCY.labels(
+                endpoint=resolver_match.url_name,
+                method=request.method,
+                status=response.status_code,
+            ).observe(duration)
+        return response
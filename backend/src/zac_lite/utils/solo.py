@@ -0,0 +1,111 @@
+"""
+Cache the django-solo configuration singletons in the process.
+
+``get_solo`` of the models in ``settings.SOLO_LOCAL_CACHE_MODELS`` reads the
+singleton from the database once, and then from memory. Saving or deleting a
+singleton sets a new version stamp in the ``default`` cache. Every process checks
+the stamp at most once per ``settings.SOLO_LOCAL_CACHE_TIMEOUT`` seconds and reads
+the singleton again if it changed. The process that saved a singleton reads it again
+immediately. The version stamp may be lost, e.g. if the cache is not reachable or
+not shared by the processes, so the singleton is also read again once it is
+``MAX_AGE_FACTOR`` timeouts old.
+
+Every call returns a new instance, so changing the returned instance does not change
+the cached singleton.
+"""
+import copy
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, NamedTuple, Optional, Type
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+
+from solo.models import SingletonModel
+
+CACHE_ALIAS = "default"
+
+MAX_AGE_FACTOR = 6
+
+
+class Entry(NamedTuple):
+    # time.monotonic() after which the version stamp is checked again
+    check_after: float
+    # time.monotonic() after which the singleton is read again
+    expires: float
+    version: Optional[str]
+    db: str
+    values: List[Any]
+
+
+_entries: Dict[Type[SingletonModel], Entry] = {}
+_lock = threading.Lock()
+
+
+def get_version_key(model: Type[SingletonModel]) -> str:
+    return f"solo-version:{model._meta.label_lower}"
+
+
+def get_solo(model: Type[SingletonModel], _get_solo) -> SingletonModel:
+    timeout = settings.SOLO_LOCAL_CACHE_TIMEOUT
+    if not timeout:
+        return _get_solo()
+
+    now = time.monotonic()
+    entry = _entries.get(model)
+    if entry is None or entry.check_after <= now or entry.expires <= now:
+        # read the stamp first, so a concurrent save is picked up on the next check
+        version = caches[CACHE_ALIAS].get(get_version_key(model))
+        if entry is None or entry.version != version or entry.expires <= now:
+            instance = _get_solo()
+            fields = model._meta.concrete_fields
+            entry = Entry(
+                check_after=now + timeout,
+                expires=now + timeout * MAX_AGE_FACTOR,
+                version=version,
+                db=instance._state.db,
+                values=[getattr(instance, field.attname) for field in fields],
+            )
+        else:
+            entry = entry._replace(check_after=now + timeout)
+        with _lock:
+            _entries[model] = entry
+
+    field_names = [field.attname for field in model._meta.concrete_fields]
+    return model.from_db(entry.db, field_names, copy.deepcopy(entry.values))
+
+
+def bump_version(sender: Type[SingletonModel], **kwargs) -> None:
+    with _lock:
+        _entries.pop(sender, None)
+    caches[CACHE_ALIAS].set(get_version_key(sender), uuid.uuid4().hex, timeout=None)
+
+
+def install() -> None:
+    """
+    Route ``get_solo`` of the configured models through the local cache.
+    """
+    for label in settings.SOLO_LOCAL_CACHE_MODELS:
+        try:
+            model = apps.get_model(label)
+        except LookupError:  # the app is not installed, e.g. in the API containers
+            continue
+
+        if getattr(model.get_solo, "locally_cached", False):
+            continue
+
+        def cached_get_solo(cls, _get_solo=model.get_solo):
+            return get_solo(cls, _get_solo)
+
+        cached_get_solo.locally_cached = True
+        model.get_solo = classmethod(cached_get_solo)
+        post_save.connect(bump_version, sender=model, dispatch_uid=label)
+        post_delete.connect(bump_version, sender=model, dispatch_uid=label)
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
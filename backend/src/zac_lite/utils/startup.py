@@ -0,0 +1,63 @@
+"""
+Profile the start-up of the application: module imports and system checks.
+"""
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from django.core.checks.registry import registry
+
+SETUP_SCRIPT = "import django; django.setup()"
+
+
+def parse_importtime(output: str) -> Dict[str, float]:
+    """
+    Sum the self time of the imported modules (in seconds) per top-level package.
+
+    ``output`` is the stderr of a Python interpreter started with ``-X importtime``.
+    """
+    totals = defaultdict(float)
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = line[len("import time:") :].split("|", 2)
+        if not self_us.strip().isdigit():  # header
+            continue
+        package = name.strip().split(".")[0]
+        totals[package] += int(self_us) / 1e6
+    return dict(totals)
+
+
+def profile_imports(settings_module: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Set up Django in a new interpreter, so no module is imported yet.
+
+    Return the wall time of the set-up and the import time per top-level package.
+    """
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SETUP_SCRIPT],
+        env=env,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    duration = time.perf_counter() - start
+    return duration, parse_importtime(result.stderr)
+
+
+def profile_checks(include_deployment_checks=False) -> List[Tuple[str, float]]:
+    """
+    Run every registered system check and return their durations, in seconds.
+    """
+    durations = []
+    for check in registry.get_checks(include_deployment_checks):
+        start = time.perf_counter()
+        check(app_configs=None)
+        name = f"{check.__module__}.{check.__qualname__}"
+        durations.append((name, time.perf_counter() - start))
+    return sorted(durations, key=lambda item: item[1], reverse=True)
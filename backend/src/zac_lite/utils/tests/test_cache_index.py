@@ -0,0 +1,74 @@
+import time
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import caches
+from django.test import SimpleTestCase
+
+from redis.exceptions import ConnectionError
+
+from .. import cache_index
+
+
+class LocalIndexTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.addCleanup(caches["default"].clear)
+        self.index = cache_index.get_index("default")
+
+    def test_local_cache(self):
+        self.assertIsInstance(self.index, cache_index.LocalIndex)
+
+    def test_members_expire(self):
+        self.index.add([("index", "short")], 10)
+        self.index.add([("index", "long"), ("other", "long")], 60)
+
+        self.assertEqual(set(self.index.members("index")), {"short", "long"})
+        with patch.object(cache_index.time, "time", return_value=time.time() + 30):
+            self.assertEqual(self.index.members("index"), ["long"])
+
+    def test_remove(self):
+        self.index.add([("index", "first"), ("index", "second")], 60)
+
+        self.index.remove("index", ["first", "unknown"])
+
+        self.assertEqual(self.index.members("index"), ["second"])
+
+    def test_pop(self):
+        self.index.add([("index", "first"), ("other", "second")], 60)
+
+        members = self.index.pop(["index", "unknown"])
+
+        self.assertEqual(members, {"index": ["first"], "unknown": []})
+        self.assertEqual(self.index.members("index"), [])
+        self.assertEqual(self.index.members("other"), ["second"])
+
+
+class RedisIndexTests(SimpleTestCase):
+    def get_index(self, ignore_exceptions: bool) -> cache_index.RedisIndex:
+        client = MagicMock()
+        client.zrangebyscore.side_effect = ConnectionError()
+        client.zrem.side_effect = ConnectionError()
+        client.pipeline.return_value.execute.side_effect = ConnectionError()
+        cache = MagicMock(_ignore_exceptions=ignore_exceptions)
+        cache.client.get_client.return_value = client
+        return cache_index.RedisIndex(cache)
+
+    def test_errors_ignored(self):
+        index = self.get_index(ignore_exceptions=True)
+
+        with patch.object(cache_index.logger, "warning") as m_warning:
+            index.add([("index", "member")], 60)
+            self.assertEqual(index.members("index"), [])
+            index.remove("index", ["member"])
+            self.assertEqual(index.pop(["index"]), {})
+
+        self.assertEqual(m_warning.call_count, 4)
+
+    def test_errors_raised(self):
+        index = self.get_index(ignore_exceptions=False)
+
+        with self.assertRaises(ConnectionError):
+            index.members("index")
+        with self.assertRaises(ConnectionError):
+            index.pop(["index"])
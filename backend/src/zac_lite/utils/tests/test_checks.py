@@ -0,0 +1,82 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from ..checks import check_missing_init_files, get_cache_path
+
+
+def touch(*bits):
+    path = os.path.join(*bits)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "w").close()
+
+
+class MissingInitFilesCheckTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.root = tmpdir.name
+        self.addCleanup(self.remove_cache)
+
+        touch(self.root, "__init__.py")
+        touch(self.root, "app", "__init__.py")
+        touch(self.root, "app", "models.py")
+
+        override = override_settings(DJANGO_PROJECT_DIR=self.root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def remove_cache(self):
+        try:
+            os.remove(get_cache_path(self.root))
+        except FileNotFoundError:
+            pass
+
+    def test_missing_init_file(self):
+        touch(self.root, "app", "tests", "test_models.py")
+
+        warnings = check_missing_init_files(None)
+
+        self.assertEqual(len(warnings), 1)
+        self.assertEqual(warnings[0].id, "utils.W001")
+        self.assertIn(os.path.join(self.root, "app", "tests"), warnings[0].msg)
+
+    def test_non_python_dirs_skipped(self):
+        touch(self.root, "js", "build.py")
+        touch(self.root, "node_modules", "some-package", "setup.py")
+
+        warnings = check_missing_init_files(None)
+
+        self.assertEqual(warnings, [])
+
+    def test_result_cached(self):
+        check_missing_init_files(None)
+
+        with patch("zac_lite.utils.checks.os.walk") as mock_walk:
+            warnings = check_missing_init_files(None)
+
+        self.assertEqual(warnings, [])
+        mock_walk.assert_not_called()
+        # the cache is a file, shared by consecutive management commands
+        self.assertTrue(os.path.exists(get_cache_path(self.root)))
+
+    def test_corrupt_cache_ignored(self):
+        touch(self.root, "app", "tests", "test_models.py")
+        with open(get_cache_path(self.root), "w") as outfile:
+            outfile.write("{")
+
+        self.assertEqual(len(check_missing_init_files(None)), 1)
+
+    def test_cache_invalidated_by_changes(self):
+        # backdate the directory, so the change is noticed on file systems with a
+        # coarse modification time resolution
+        os.utime(os.path.join(self.root, "app"), (0, 0))
+        self.assertEqual(check_missing_init_files(None), [])
+
+        touch(self.root, "app", "tests", "test_models.py")
+
+        self.assertEqual(len(check_missing_init_files(None)), 1)
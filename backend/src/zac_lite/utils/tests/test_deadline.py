@@ -0,0 +1,79 @@
+import threading
+import time
+from unittest.mock import patch
+
+from django.test import TestCase
+
+import requests
+import requests_mock
+from django_camunda.api import get_task_variable
+from django_camunda.utils import serialize_variable
+
+from ..concurrent import parallel
+from ..deadline import DeadlineExceeded, check, deadline, get_timeout, remaining
+
+CAMUNDA_BASE = "https://camunda.example.com/engine-rest"
+VARIABLE_URL = f"{CAMUNDA_BASE}/task/1/variables/zaakUrl?deserializeValues=false"
+
+
+class DeadlineTests(TestCase):
+    def test_no_deadline(self):
+        self.assertIsNone(remaining())
+        self.assertIsNone(get_timeout())
+
+    def test_remaining(self):
+        with deadline(5):
+            self.assertTrue(4 < get_timeout() <= 5)
+
+        self.assertIsNone(remaining())
+
+    def test_nested(self):
+        with deadline(5):
+            # an inner deadline can shorten, but not extend the budget
+            with deadline(10):
+                self.assertTrue(remaining() <= 5)
+            with deadline(1):
+                self.assertTrue(remaining() <= 1)
+
+    def test_exceeded(self):
+        with deadline(5):
+            with patch("time.monotonic", return_value=time.monotonic() + 6):
+                with self.assertRaises(DeadlineExceeded):
+                    check()
+
+    def test_propagated_to_workers(self):
+        with deadline(5), parallel() as executor:
+            timeout = executor.submit(remaining).result()
+
+        self.assertTrue(0 < timeout <= 5)
+
+    def test_queued_work_skipped(self):
+        release = threading.Event()
+        calls = []
+
+        with self.assertRaises(DeadlineExceeded):
+            with deadline(0.05), parallel(max_workers=1) as executor:
+                executor.submit(release.wait, 0.1)
+                future = executor.submit(calls.append, "called")
+                future.result()
+
+        self.assertEqual(calls, [])
+
+    def test_upstream_timeout(self):
+        with requests_mock.Mocker() as m, deadline(5):
+            m.get(VARIABLE_URL, json=serialize_variable(""))
+
+            get_task_variable("1", "zaakUrl")
+
+        self.assertTrue(0 < m.last_request.timeout <= 5)
+
+    def test_upstream_timeout_exceeded(self):
+        def timeout(request, context):
+            time.sleep(0.1)
+            raise requests.ReadTimeout()
+
+        with requests_mock.Mocker() as m, deadline(0.05):
+            m.get(VARIABLE_URL, json=timeout)
+
+            with self.assertRaises(DeadlineExceeded):
+                get_task_variable("1", "zaakUrl")
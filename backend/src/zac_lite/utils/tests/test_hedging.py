@@ -0,0 +1,128 @@
+import threading
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from .. import hedging
+from ..deadline import deadline, remaining
+
+
+@override_settings(HEDGE_REQUESTS=True, HEDGE_BUDGET=0.05)
+class HedgingTests(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.addCleanup(hedging.clear)
+
+    def warm_up(self, duration: float = 0.01) -> None:
+        for _ in range(hedging.MIN_SAMPLES):
+            hedging._latencies.observe("drc", duration)
+
+    def test_percentile(self):
+        for i in range(1, 101):
+            hedging._latencies.observe("drc", i / 1000)
+
+        self.assertEqual(hedging._latencies.get_threshold("drc"), 0.095)
+        self.assertIsNone(hedging._latencies.get_threshold("ztc"))
+
+    @override_settings(HEDGE_REQUESTS=False)
+    def test_disabled(self):
+        self.warm_up()
+
+        with patch.object(hedging, "submit") as m_submit:
+            self.assertEqual(hedging.call("drc", lambda: "result"), "result")
+
+        m_submit.assert_not_called()
+
+    def test_warming_up(self):
+        with patch.object(hedging, "submit") as m_submit:
+            for _ in range(hedging.MIN_SAMPLES - 1):
+                hedging.call("drc", lambda: "result")
+
+        m_submit.assert_not_called()
+        self.assertIsNone(hedging._latencies.get_threshold("drc"))
+
+        hedging.call("drc", lambda: "result")
+
+        self.assertIsNotNone(hedging._latencies.get_threshold("drc"))
+
+    def test_fast_call_not_hedged(self):
+        self.warm_up(duration=5)
+        calls = []
+
+        result = hedging.call("drc", lambda: calls.append("called") or "result")
+
+        self.assertEqual(result, "result")
+        self.assertEqual(calls, ["called"])
+
+    def test_slow_call_hedged(self):
+        self.warm_up()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append("called")
+            if len(calls) == 1:  # the primary call hangs
+                release.wait(5)
+                return "primary"
+            return "hedge"
+
+        try:
+            result = hedging.call("drc", fetch)
+        finally:
+            release.set()
+
+        self.assertEqual(result, "hedge")
+        self.assertEqual(len(calls), 2)
+
+    def test_failed_hedge(self):
+        self.warm_up()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append("called")
+            if len(calls) == 2:
+                release.set()
+                raise ConnectionError()
+            release.wait(5)
+            return "primary"
+
+        self.assertEqual(hedging.call("drc", fetch), "primary")
+
+    def test_no_budget(self):
+        self.warm_up()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append("called")
+            release.wait(0.05)
+            return "result"
+
+        with patch.object(hedging.Budget, "withdraw", return_value=False):
+            self.assertEqual(hedging.call("drc", fetch), "result")
+
+        self.assertEqual(calls, ["called"])
+
+    def test_budget(self):
+        budget = hedging.Budget()
+        for _ in range(hedging.MAX_TOKENS):
+            self.assertTrue(budget.withdraw())
+
+        self.assertFalse(budget.withdraw())
+
+        # every 20 calls allow one duplicate
+        for _ in range(20):
+            budget.deposit()
+
+        self.assertTrue(budget.withdraw())
+        self.assertFalse(budget.withdraw())
+
+    def test_deadline_propagated(self):
+        self.warm_up()
+
+        with deadline(5):
+            timeout = hedging.call("drc", remaining)
+
+        self.assertTrue(0 < timeout <= 5)
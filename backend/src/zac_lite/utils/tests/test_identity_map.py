@@ -0,0 +1,130 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import SimpleTestCase, override_settings
+
+from .. import identity_map
+from ..deadline import DeadlineExceeded, check, deadline
+
+
+class Counter:
+    def __init__(self, release: threading.Event = None):
+        self.calls = 0
+        self.release = release
+
+    def __call__(self):
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(timeout=5)
+        return {"calls": self.calls}
+
+
+class IdentityMapTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.addCleanup(identity_map.clear)
+
+    @override_settings(UPSTREAM_MEMO_TIMEOUT=0)
+    def test_fetched_once_per_request(self):
+        fetch = Counter()
+
+        with identity_map.request_scope():
+            first = identity_map.fetch("zaak", fetch)
+            second = identity_map.fetch("zaak", fetch)
+        with identity_map.request_scope():
+            identity_map.fetch("zaak", fetch)
+        identity_map.fetch("zaak", fetch)
+
+        self.assertIs(first, second)
+        self.assertEqual(fetch.calls, 3)
+
+    @override_settings(UPSTREAM_MEMO_TIMEOUT=60)
+    def test_concurrent_fetches_shared(self):
+        release = threading.Event()
+        fetch = Counter(release)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(identity_map.fetch, "zaak", fetch) for _ in range(2)
+            ]
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(fetch.calls, 1)
+        self.assertIs(results[0], results[1])
+
+    @override_settings(UPSTREAM_MEMO_TIMEOUT=60)
+    def test_failures_not_memoized(self):
+        def fail():
+            raise ConnectionError("upstream down")
+
+        with self.assertRaises(ConnectionError):
+            identity_map.fetch("zaak", fail)
+
+        fetch = Counter()
+        self.assertEqual(identity_map.fetch("zaak", fetch), {"calls": 1})
+
+    @override_settings(UPSTREAM_MEMO_TIMEOUT=60)
+    def test_forget(self):
+        fetch = Counter()
+        identity_map.fetch("zaak", fetch)
+
+        identity_map.forget(["zaak"])
+        identity_map.fetch("zaak", fetch)
+
+        self.assertEqual(fetch.calls, 2)
+
+    @override_settings(UPSTREAM_MEMO_TIMEOUT=60)
+    def test_failure_of_other_request_not_shared(self):
+        started = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append("called")
+            if len(calls) == 1:
+                started.set()
+                time.sleep(0.2)
+                check()
+            return {"calls": len(calls)}
+
+        def request(seconds: float):
+            with identity_map.request_scope(), deadline(seconds):
+                return identity_map.fetch("zaak", fetch)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            short = executor.submit(request, 0.1)
+            started.wait(timeout=5)
+            long = executor.submit(request, 9)
+
+            with self.assertRaises(DeadlineExceeded):
+                short.result()
+            self.assertEqual(long.result(), {"calls": 2})
+
+    @override_settings(UPSTREAM_MEMO_TIMEOUT=60)
+    def test_waiting_bounded_by_deadline(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        started = threading.Event()
+
+        def fetch():
+            started.set()
+            release.wait(timeout=5)
+            return {}
+
+        def request(seconds: float):
+            with identity_map.request_scope(), deadline(seconds):
+                return identity_map.fetch("zaak", fetch)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            slow = executor.submit(request, 9)
+            started.wait(timeout=5)
+            start = time.monotonic()
+
+            with self.assertRaises(DeadlineExceeded):
+                request(0.05)
+
+            self.assertLess(time.monotonic() - start, 1)
+            release.set()
+            slow.result()
@@ -0,0 +1,169 @@
+import io
+import json as stdlib_json
+import sys
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+import requests_mock
+from django_camunda.models import CamundaConfig
+from rest_framework.renderers import JSONRenderer
+from zds_client.oas import schema_fetcher
+from zgw_consumers.constants import APITypes
+from zgw_consumers.models import Service
+from zgw_consumers.test import generate_oas_component, mock_service_oas_get
+
+from zac_lite.api.parsers import CamelCaseJSONParser
+from zac_lite.api.renderers import CamelCaseJSONRenderer
+from zac_lite.client import CamundaClient
+from zac_lite.utils import identity_map
+
+from .. import json
+
+DATA = {
+    "created": datetime(2021, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc),
+    "date": date(2021, 1, 1),
+    "size": Decimal("1.5"),
+    "uuid": uuid.UUID(int=1),
+    "label": _("Documents"),
+    "separator": "line\u2028separator",
+    "documents": [{"document_type": "https://example.com/1", "size": None}],
+}
+
+
+class FakeBackend(json.Backend):
+    """
+    Decode everything to the same object, to check the backend is used.
+    """
+
+    name = "fake"
+
+    def loads(self, data):
+        return {"decodedBy": self.name}
+
+
+class BackendTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+
+        json.load_backend.cache_clear()
+        self.addCleanup(json.load_backend.cache_clear)
+
+    def test_dumps_like_drf(self):
+        expected = stdlib_json.loads(JSONRenderer().render(DATA))
+
+        for backend in json.get_available_backends():
+            with self.subTest(backend=backend.name):
+                self.assertEqual(stdlib_json.loads(backend.dumps(DATA)), expected)
+
+    def test_loads(self):
+        content = '{"title": "Café", "size": 1, "tags": [null, true]}'.encode()
+
+        for backend in json.get_available_backends():
+            with self.subTest(backend=backend.name):
+                self.assertEqual(
+                    backend.loads(content),
+                    {"title": "Café", "size": 1, "tags": [None, True]},
+                )
+
+    @override_settings(JSON_BACKEND="orjson")
+    def test_missing_backend(self):
+        with patch.dict(sys.modules, {"orjson": None}):
+            with patch.object(json.logger, "warning") as m_warning:
+                backend = json.get_backend()
+
+        self.assertEqual(backend.name, "json")
+        m_warning.assert_called_once()
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            json.get_backend("simplejson")
+
+
+class APITests(SimpleTestCase):
+    def test_render(self):
+        expected = JSONRenderer().render({"documentType": "https://example.com/1"})
+
+        for backend in json.get_available_backends():
+            with self.subTest(backend=backend.name):
+                renderer = CamelCaseJSONRenderer()
+                renderer.backend = backend.name
+
+                content = renderer.render({"document_type": "https://example.com/1"})
+
+                self.assertEqual(content, expected)
+
+    def test_render_line_separators(self):
+        expected = JSONRenderer().render({"separator": "line\u2028separator"})
+
+        for backend in json.get_available_backends():
+            with self.subTest(backend=backend.name):
+                renderer = CamelCaseJSONRenderer()
+                renderer.backend = backend.name
+
+                content = renderer.render({"separator": "line\u2028separator"})
+
+                self.assertEqual(content, expected)
+
+    def test_parse(self):
+        for backend in json.get_available_backends():
+            with self.subTest(backend=backend.name):
+                parser = CamelCaseJSONParser()
+                parser.backend = backend.name
+
+                data = parser.parse(io.BytesIO(b'{"taskId": "1"}'))
+
+                self.assertEqual(data, {"task_id": "1"})
+
+    @patch.object(json, "get_backend", return_value=FakeBackend())
+    def test_parse_with_backend(self, m):
+        data = CamelCaseJSONParser().parse(io.BytesIO(b'{"taskId": "1"}'))
+
+        self.assertEqual(data, {"decoded_by": "fake"})
+
+
+@patch.object(json, "get_backend", return_value=FakeBackend())
+class UpstreamTests(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.addCleanup(schema_fetcher.cache.clear)
+        self.addCleanup(identity_map.clear)
+
+    def test_camunda(self, m_backend):
+        config = CamundaConfig(
+            root_url="https://camunda.example.com/", rest_api_path="engine-rest/"
+        )
+        client = CamundaClient(config=config)
+
+        with requests_mock.Mocker() as m:
+            m.get("https://camunda.example.com/engine-rest/task/1", json={"id": "1"})
+
+            data = client.get("task/1")
+
+        self.assertEqual(data, {"decoded_by": "fake"})
+
+    @override_settings(UPSTREAM_CACHE_TIMEOUTS={})
+    def test_zgw_apis(self, m_backend):
+        service = Service.objects.create(
+            label="Zaken API",
+            api_type=APITypes.zrc,
+            api_root="https://zaken.example.com/api/v1/",
+        )
+        zaak = generate_oas_component(
+            "zrc", "schemas/Zaak", url="https://zaken.example.com/api/v1/zaken/1"
+        )
+        client = service.build_client()
+
+        with requests_mock.Mocker() as m:
+            mock_service_oas_get(m, service.api_root, "zrc")
+            m.get(zaak["url"], json=zaak)
+
+            data = client.retrieve("zaak", url=zaak["url"])
+
+        self.assertEqual(data, {"decodedBy": "fake"})
@@ -0,0 +1,79 @@
+import os
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from prometheus_client import REGISTRY
+
+from .. import metrics
+from ..concurrent import parallel
+from ..tracing import span
+
+
+class MetricsTests(SimpleTestCase):
+    def test_metrics_endpoint(self):
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"zac_lite_upstream_request_duration_seconds", response.content)
+
+    def test_metrics_endpoint_restricted(self):
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="203.0.113.7")
+
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(METRICS_ALLOWED_NETWORKS=["10.0.0.0/8"])
+    def test_metrics_endpoint_allowed_network(self):
+        allowed = self.client.get(reverse("metrics"), REMOTE_ADDR="10.1.2.3")
+        forwarded = self.client.get(reverse("metrics"), HTTP_X_FORWARDED_FOR="10.1.2.3")
+
+        self.assertEqual(allowed.status_code, 200)
+        self.assertEqual(forwarded.status_code, 404)
+
+    def test_upstream_latency_observed(self):
+        labels = {"service": "test-api"}
+        before = REGISTRY.get_sample_value(
+            "zac_lite_upstream_request_duration_seconds_count", labels
+        )
+
+        with span("test-api", "foo_read"):
+            pass
+
+        after = REGISTRY.get_sample_value(
+            "zac_lite_upstream_request_duration_seconds_count", labels
+        )
+        self.assertEqual(after, (before or 0) + 1)
+
+    def test_endpoint_latency_observed(self):
+        labels = {"endpoint": "metrics", "method": "GET", "status": "200"}
+        before = REGISTRY.get_sample_value(
+            "zac_lite_endpoint_duration_seconds_count", labels
+        )
+
+        self.client.get(reverse("metrics"))
+
+        after = REGISTRY.get_sample_value(
+            "zac_lite_endpoint_duration_seconds_count", labels
+        )
+        self.assertEqual(after, (before or 0) + 1)
+
+    def test_thread_pool_gauges_reset(self):
+        with parallel() as executor:
+            results = list(executor.map(lambda x: x * 2, range(5)))
+
+        self.assertEqual(results, [0, 2, 4, 6, 8])
+        self.assertEqual(
+            REGISTRY.get_sample_value("zac_lite_thread_pool_queued_tasks"), 0
+        )
+        self.assertEqual(
+            REGISTRY.get_sample_value("zac_lite_thread_pool_active_tasks"), 0
+        )
+
+    def test_mark_process_dead(self):
+        with patch.object(metrics.multiprocess, "mark_process_dead") as m_mark:
+            metrics.mark_process_dead()
+            with patch.dict(os.environ, {"PROMETHEUS_MULTIPROC_DIR": "/tmp/metrics"}):
+                metrics.mark_process_dead()
+
+        m_mark.assert_called_once_with(os.getpid())
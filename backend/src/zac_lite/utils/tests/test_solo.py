@@ -0,0 +1,103 @@
+import time
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from django_auth_adfs_db.models import ADFSConfig
+from django_camunda.models import CamundaConfig
+
+from .. import solo
+
+
+@override_settings(SOLO_LOCAL_CACHE_TIMEOUT=60)
+class SoloLocalCacheTests(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        CamundaConfig.objects.create(root_url="https://camunda.example.com/")
+        self.addCleanup(solo.clear)
+        self.addCleanup(caches["default"].clear)
+
+    def change_elsewhere(self, root_url: str) -> None:
+        """
+        Change the configuration like another process would.
+        """
+        CamundaConfig.objects.update(root_url=root_url)
+        caches["default"].set(solo.get_version_key(CamundaConfig), "other process")
+
+    def test_installed(self):
+        self.assertTrue(CamundaConfig.get_solo.locally_cached)
+        self.assertTrue(ADFSConfig.get_solo.locally_cached)
+
+    def test_read_once(self):
+        CamundaConfig.get_solo()
+
+        with self.assertNumQueries(0), patch.object(solo, "caches") as m_caches:
+            config = CamundaConfig.get_solo()
+
+        self.assertEqual(config.root_url, "https://camunda.example.com/")
+        m_caches.__getitem__.assert_not_called()
+
+    def test_new_instance(self):
+        config = CamundaConfig.get_solo()
+        config.root_url = "https://changed.example.com/"
+
+        self.assertIsNot(CamundaConfig.get_solo(), config)
+        self.assertEqual(
+            CamundaConfig.get_solo().root_url, "https://camunda.example.com/"
+        )
+
+    def test_saved(self):
+        config = CamundaConfig.get_solo()
+        config.root_url = "https://bpmn.example.com/"
+        config.save()
+
+        self.assertEqual(CamundaConfig.get_solo().root_url, "https://bpmn.example.com/")
+
+    def test_changed_by_other_process(self):
+        CamundaConfig.get_solo()
+        self.change_elsewhere("https://bpmn.example.com/")
+
+        # the version stamp is only checked after the timeout
+        self.assertEqual(
+            CamundaConfig.get_solo().root_url, "https://camunda.example.com/"
+        )
+        with patch.object(solo.time, "monotonic", return_value=time.monotonic() + 61):
+            self.assertEqual(
+                CamundaConfig.get_solo().root_url, "https://bpmn.example.com/"
+            )
+
+    def test_unchanged_after_timeout(self):
+        CamundaConfig.get_solo()
+
+        with patch.object(
+            solo.time, "monotonic", return_value=time.monotonic() + 61
+        ), self.assertNumQueries(0):
+            CamundaConfig.get_solo()
+
+    def test_read_again_after_max_age(self):
+        CamundaConfig.get_solo()
+        # the version stamp was not updated, e.g. the cache was not reachable
+        CamundaConfig.objects.update(root_url="https://bpmn.example.com/")
+        max_age = 60 * solo.MAX_AGE_FACTOR
+
+        with patch.object(
+            solo.time, "monotonic", return_value=time.monotonic() + max_age - 1
+        ):
+            self.assertEqual(
+                CamundaConfig.get_solo().root_url, "https://camunda.example.com/"
+            )
+        with patch.object(
+            solo.time, "monotonic", return_value=time.monotonic() + max_age + 1
+        ):
+            self.assertEqual(
+                CamundaConfig.get_solo().root_url, "https://bpmn.example.com/"
+            )
+
+    @override_settings(SOLO_LOCAL_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        CamundaConfig.get_solo()
+
+        with self.assertNumQueries(1):
+            CamundaConfig.get_solo()
@@ -0,0 +1,29 @@
+from django.test import SimpleTestCase, override_settings
+
+from ..checks import check_missing_init_files
+from ..startup import parse_importtime, profile_checks
+
+IMPORTTIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       150 |        150 |     _io
+import time:      1000 |       1500 |   django.utils.version
+import time:       500 |       2000 | django
+import time:      2500 |       2500 | yaml
+"""
+
+
+class StartupProfileTests(SimpleTestCase):
+    def test_parse_importtime(self):
+        totals = parse_importtime(IMPORTTIME_OUTPUT)
+
+        self.assertEqual(totals, {"_io": 0.00015, "django": 0.0015, "yaml": 0.0025})
+
+    def test_profile_checks(self):
+        durations = profile_checks()
+
+        names = [name for name, _ in durations]
+        self.assertIn("zac_lite.utils.checks.check_missing_init_files", names)
+        self.assertEqual(durations, sorted(durations, key=lambda d: -d[1]))
+
+    @override_settings(CHECK_MISSING_INIT_FILES=False)
+    def test_skip_missing_init_files_check(self):
+        self.assertEqual(check_missing_init_files(None), [])
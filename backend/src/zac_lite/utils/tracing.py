@@ -0,0 +1,122 @@
+"""
+Collect timing spans of the upstream calls made while handling a request.
+
+A :class:`Trace` is bound to the current execution context with :func:`trace`. The
+API clients record a :class:`Span` for every call they make through :func:`span`.
+Spans recorded outside of a trace are discarded.
+
+Use :class:`zac_lite.utils.concurrent.parallel` to propagate the trace to worker
+threads.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .metrics import UPSTREAM_LATENCY
+
+logger = logging.getLogger("performance")
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("trace", default=None)
+
+
+@dataclass
+class Span:
+    service: str
+    operation: str
+    status: Optional[int] = None
+    bytes: int = 0
+    duration: float = 0.0  # in milliseconds
+    start: float = field(default_factory=time.perf_counter, repr=False)
+
+    def finish(self) -> None:
+        """
+        Record the span in the metrics and the current trace, if any.
+        """
+        self.duration = (time.perf_counter() - self.start) * 1000
+        UPSTREAM_LATENCY.labels(service=self.service).observe(self.duration / 1000)
+        current_trace = get_current_trace()
+        if current_trace is not None:
+            current_trace.add(self)
+
+    def __str__(self):
+        return (
+            f"{self.service} | {self.operation} | {self.status} | "
+            f"{self.bytes}B | {self.duration:.1f}ms"
+        )
+
+
+class Trace:
+    def __init__(self, name: str):
+        self.name = name
+        self.spans: List[Span] = []
+        self.duration = 0.0  # in milliseconds
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def get_service_totals(self) -> Dict[str, Tuple[int, float]]:
+        """
+        Return the number of calls and their summed duration per service.
+        """
+        totals = defaultdict(lambda: (0, 0.0))
+        for span in self.spans:
+            count, duration = totals[span.service]
+            totals[span.service] = (count + 1, duration + span.duration)
+        return dict(totals)
+
+    def as_server_timing(self) -> str:
+        """
+        Format the trace as ``Server-Timing`` header value.
+
+        Calls are made concurrently, so the summed duration of a service can exceed
+        the total duration.
+        """
+        metrics = [
+            f'{service};dur={duration:.1f};desc="{count} call(s)"'
+            for service, (count, duration) in self.get_service_totals().items()
+        ]
+        metrics.append(f"total;dur={self.duration:.1f}")
+        return ", ".join(metrics)
+
+    def log(self) -> None:
+        for span in self.spans:
+            logger.info("%s | %s", self.name, span)
+        logger.info("%s | total | %.1fms", self.name, self.duration)
+
+
+def get_current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def trace(name: str) -> Iterator[Trace]:
+    current_trace = Trace(name)
+    token = _current_trace.set(current_trace)
+    start = time.perf_counter()
+    try:
+        yield current_trace
+    finally:
+        current_trace.duration = (time.perf_counter() - start) * 1000
+        _current_trace.reset(token)
+
+
+@contextmanager
+def span(service: str, operation: str) -> Iterator[Span]:
+    """
+    Time the wrapped upstream call.
+
+    The caller is responsible for setting the status and size of the response on
+    the yielded span.
+    """
+    current_span = Span(service=service, operation=operation)
+    try:
+        yield current_span
+    finally:
+        current_span.finish()
@@ -1,8 +1,16 @@
+import ipaddress
+from functools import lru_cache
+from typing import Tuple
+
 from django import http
+from django.conf import settings
 from django.template import TemplateDoesNotExist, loader
 from django.views.decorators.csrf import requires_csrf_token
+from django.views.decorators.http import require_GET
 from django.views.defaults import ERROR_500_TEMPLATE_NAME
 
+from .metrics import CONTENT_TYPE_LATEST, export
+
 
 @requires_csrf_token
 def server_error(request, template_name=ERROR_500_TEMPLATE_NAME):
@@ -23,3 +31,30 @@ def server_error(request, template_name=ERROR_500_TEMPLATE_NAME):
         )
     context = {"request": request}
     return http.HttpResponseServerError(template.render(context))
+
+
+@lru_cache()
+def get_networks(networks: Tuple[str, ...]) -> list:
+    return [ipaddress.ip_network(network, strict=False) for network in networks]
+
+
+def is_allowed_ip(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    networks = get_networks(tuple(settings.METRICS_ALLOWED_NETWORKS))
+    return any(ip in network for network in networks)
+
+
+@require_GET
+def metrics(request):
+    """
+    Expose the Prometheus metrics for scraping.
+
+    Only the addresses in ``settings.METRICS_ALLOWED_NETWORKS`` may scrape. The
+    ``X-Forwarded-For`` header can be forged, so the peer address is checked.
+    """
+    if not is_allowed_ip(request.META.get("REMOTE_ADDR", "")):
+        raise http.Http404()
+    return http.HttpResponse(export(), content_type=CONTENT_TYPE_LATEST)
@@ -6,6 +6,7 @@ It exposes the WSGI callable as a module-level variable named ``application``.
 For more information on this file, see
 https://docs.djangoproject.com/en/2.2/howto/deployment/wsgi/
 """
+import atexit
 import os
 
 from django.core.wsgi import get_wsgi_application
@@ -15,3 +16,9 @@ from zac_lite.setup import setup_env
 setup_env()
 
 application = get_wsgi_application()
+
+# the environment is loaded, so the metrics pick up PROMETHEUS_MULTIPROC_DIR
+from zac_lite.utils.metrics import mark_process_dead  # noqa isort:skip
+
+# uWSGI runs the exit functions when a worker is reloaded or stopped
+atexit.register(mark_process_dead)